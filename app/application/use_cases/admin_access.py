@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from app.domain.entities import AdminUser, Worker
+from app.domain.entities import AdminUser, WorkerPage
 from app.domain.repositories import AdminRepository, WorkerRepository
 
 
@@ -31,9 +31,19 @@ class AdminAccessService:
     async def list_admins(self) -> list[AdminUser]:
         return list(await self.admins.list_all())
 
-    async def list_registered_workers(self) -> list[Worker]:
-        workers = list(await self.workers.list_all())
-        return [worker for worker in workers if worker.chat_id and worker.chat_id.strip()]
+    async def list_admin_candidates_page(
+        self, after: int | None = None, before: int | None = None, limit: int = 10
+    ) -> WorkerPage:
+        """Registered workers who are not admins yet."""
+        admin_ids = {admin.chat_id for admin in await self.admins.list_all()}
+        admin_ids.update(self.super_admin_ids)
+        return await self.workers.list_page(
+            after=after,
+            before=before,
+            limit=limit,
+            registered=True,
+            exclude_chat_ids=sorted(admin_ids),
+        )
 
     async def add_admin(self, chat_id: str) -> bool:
         admin = AdminUser(
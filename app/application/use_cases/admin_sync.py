@@ -1,8 +1,7 @@
-﻿from datetime import datetime
+﻿import asyncio
+from datetime import datetime
 
-import re
-
-from app.domain.entities import Worker, Pair, Survey
+from app.domain.entities import Worker, Pair, Survey, SurveyQuestion
 from app.domain.repositories import (
     WorkerRepository,
     PairRepository,
@@ -31,24 +30,21 @@ class AdminSyncService:
         self.answers = answers
         self.shifts = shifts
 
-    async def sync_workers(self) -> int:
-        def read_metric(row: list[str], index: int) -> int:
-            if index >= len(row):
-                return 0
-            raw = row[index].strip().replace(" ", "")
-            if not raw:
-                return 0
-            if raw.isdigit():
-                return int(raw)
-            match = re.search(r"\d+", raw)
-            return int(match.group(0)) if match else 0
+    async def _worker_ids_by_name(self) -> dict[str, int]:
+        worker_ids: dict[str, int] = {}
+        workers = await self.workers.list_all(include_inactive=True)
+        for worker in sorted(workers, key=lambda item: item.id or 0):
+            if worker.full_name and worker.id is not None:
+                worker_ids.setdefault(normalize_text(worker.full_name), worker.id)
+        return worker_ids
 
+    async def sync_workers(self) -> int:
         existing = {
             normalize_text(w.full_name): w
             for w in await self.workers.list_all(include_inactive=True)
             if w.full_name
         }
-        rows = self.gateway.read_workers()
+        rows = await asyncio.to_thread(self.gateway.read_workers)
         created = 0
         seen: set[str] = set()
 
@@ -62,14 +58,6 @@ class AdminSyncService:
             chat_id = row[2].strip() if len(row) > 2 else ""
             speciality = row[3].strip() if len(row) > 3 else ""
             phone = row[4].strip() if len(row) > 4 else ""
-            shifts_week = read_metric(row, 5)
-            shifts_month = read_metric(row, 6)
-            given_week = read_metric(row, 7)
-            given_month = read_metric(row, 8)
-            replacement_week = read_metric(row, 9)
-            replacement_month = read_metric(row, 10)
-            manual_week = read_metric(row, 11)
-            manual_month = read_metric(row, 12)
 
             worker = existing.get(key)
             if worker:
@@ -81,14 +69,6 @@ class AdminSyncService:
                     chat_id=chat_id or None,
                     speciality=speciality or None,
                     phone=phone or None,
-                    shifts_week=shifts_week,
-                    shifts_month=shifts_month,
-                    given_week=given_week,
-                    given_month=given_month,
-                    replacement_week=replacement_week,
-                    replacement_month=replacement_month,
-                    manual_week=manual_week,
-                    manual_month=manual_month,
                     is_active=True,
                 )
                 continue
@@ -100,14 +80,6 @@ class AdminSyncService:
                 chat_id=chat_id,
                 speciality=speciality,
                 phone=phone,
-                shifts_week=shifts_week,
-                shifts_month=shifts_month,
-                given_week=given_week,
-                given_month=given_month,
-                replacement_week=replacement_week,
-                replacement_month=replacement_month,
-                manual_week=manual_week,
-                manual_month=manual_month,
             )
             await self.workers.add(new_worker)
             created += 1
@@ -123,51 +95,57 @@ class AdminSyncService:
     async def sync_pairs(self, today_str: str | None = None) -> int:
         if not today_str:
             today_str = datetime.now().strftime("%d.%m.%Y")
-        rows = self.gateway.read_pairs()
+        rows = await asyncio.to_thread(self.gateway.read_pairs)
+        worker_ids = await self._worker_ids_by_name()
         created = 0
         for row in rows:
             if len(row) < 5 or row[4].strip() != today_str:
                 continue
             pair = Pair(
+                id=None,
                 subject=row[0].strip(),
                 object=row[1].strip(),
                 survey=row[2].strip(),
                 weekday=row[3].strip(),
                 date=row[4].strip(),
+                subject_id=worker_ids.get(normalize_text(row[0])),
+                object_id=worker_ids.get(normalize_text(row[1])),
             )
             await self.pairs.add(pair)
             created += 1
         return created
 
     async def sync_surveys(self) -> int:
-        rows = self.gateway.read_surveys()
-        await self.surveys.clear_all()
-        created = 0
+        rows = await asyncio.to_thread(self.gateway.read_surveys)
+        surveys = []
         for row in rows:
             id_value = row[0].strip() if row else ""
-            if not id_value.isdigit():
+            if not id_value.isdigit() or len(row) < 2:
                 continue
-            survey = Survey(
-                id=int(id_value),
-                speciality=row[1].strip(),
-                question1=row[2].strip(),
-                question1_type=row[3].strip(),
-                question2=row[4].strip(),
-                question2_type=row[5].strip(),
-                question3=row[6].strip(),
-                question3_type=row[7].strip(),
-                question4=row[8].strip(),
-                question4_type=row[9].strip(),
-                question5=row[10].strip(),
-                question5_type=row[11].strip(),
-            )
-            await self.surveys.add(survey)
-            created += 1
-        return created
+            # id, speciality, then (question, type) pairs until the first empty question.
+            questions = []
+            for offset in range(2, len(row), 2):
+                question_text = row[offset].strip()
+                if not question_text:
+                    break
+                q_type = row[offset + 1].strip() if offset + 1 < len(row) else ""
+                questions.append(
+                    SurveyQuestion(
+                        position=len(questions) + 1,
+                        text=question_text,
+                        type=q_type or "int",
+                    )
+                )
+            surveys.append(Survey(id=int(id_value), speciality=row[1].strip(), questions=questions))
+        await self.surveys.replace_all(surveys)
+        return len(surveys)
 
     async def sync_shifts(self) -> int:
-        rows = self.gateway.read_shifts()
-        schedule: list[tuple[str, str, str, str | None, str | None, str | None]] = []
+        rows = await asyncio.to_thread(self.gateway.read_shifts)
+        worker_ids = await self._worker_ids_by_name()
+        schedule: list[
+            tuple[str, str, str, str | None, str | None, str | None, int | None, int | None]
+        ] = []
         for row in rows:
             if len(row) < 7:
                 continue
@@ -195,6 +173,8 @@ class AdminSyncService:
                     assistant_planned or None,
                     speciality or None,
                     cabinet or None,
+                    worker_ids.get(normalize_text(doctor_name)),
+                    worker_ids.get(normalize_text(assistant_planned)) if assistant_planned else None,
                 )
             )
         if schedule:
@@ -209,30 +189,28 @@ class AdminSyncService:
 
     async def export_answers(self) -> None:
         answers = await self.answers.list_all()
-        headers = [
-            "object",
-            "subject",
-            "survey",
-            "survey_date",
-            "completed_at",
-            "question1",
-            "answer1",
-            "question2",
-            "answer2",
-            "question3",
-            "answer3",
-            "question4",
-            "answer4",
-            "question5",
-            "answer5",
-        ]
+
+        # Keep the historical five question columns; longer surveys widen the sheet.
+        width = max([5, *(item.question_no for ans in answers for item in ans.items)])
+        headers = ["object", "subject", "survey", "survey_date", "completed_at"]
+        for question_no in range(1, width + 1):
+            headers += [f"question{question_no}", f"answer{question_no}"]
 
         def serialize():
             for ans in answers:
-                row = [getattr(ans, f, "") for f in headers]
+                items = {item.question_no: item for item in ans.items}
+                row = [ans.object, ans.subject, ans.survey, ans.survey_date, ans.completed_at]
+                for question_no in range(1, width + 1):
+                    item = items.get(question_no)
+                    if item is None:
+                        row += [None, None]
+                    else:
+                        # The wording the question was asked with, not the current survey's.
+                        row.append(item.question_text)
+                        row.append(item.int_score if item.int_score is not None else item.text_value)
                 yield ["" if cell is None else str(cell) for cell in row]
 
-        self.gateway.export_answers(headers, serialize())
+        await asyncio.to_thread(self.gateway.export_answers, headers, list(serialize()))
 
     async def export_shifts(self, date_str: str | None = None) -> None:
         if not date_str:
@@ -268,4 +246,4 @@ class AdminSyncService:
                 ]
                 yield ["" if v is None else str(v) for v in row]
 
-        self.gateway.export_shifts(headers, serialize())
+        await asyncio.to_thread(self.gateway.export_shifts, headers, list(serialize()))
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.config import ArchiveSettings
+from app.domain.repositories import ArchiveRepository
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+logger = setup_logger("archive", "archive.log")
+
+# The monthly report reads half a year of answers from the hot table.
+MIN_ANSWERS_DAYS = 190
+
+
+class ArchiveService:
+    def __init__(
+        self,
+        archive: ArchiveRepository,
+        settings: ArchiveSettings,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        if settings.answers_days < MIN_ANSWERS_DAYS:
+            raise ValueError(
+                f"ANSWERS_RETENTION_DAYS must be at least {MIN_ANSWERS_DAYS}, "
+                f"got {settings.answers_days}"
+            )
+        self.archive = archive
+        self.settings = settings
+        self.clock = clock
+
+    async def _drain(self, move: Callable, before: str) -> int:
+        total = 0
+        while True:
+            moved = await move(before, self.settings.batch_size)
+            total += moved
+            if moved < self.settings.batch_size:
+                return total
+
+    async def run(self) -> tuple[int, int]:
+        """Moves answers and instrument moves past their retention to the archive."""
+        today = self.clock().date()
+        answers_before = (today - timedelta(days=self.settings.answers_days)).strftime("%d.%m.%Y")
+        moves_before = (today - timedelta(days=self.settings.moves_days)).strftime("%d.%m.%Y")
+        answers = await self._drain(self.archive.archive_answers, answers_before)
+        moves = await self._drain(self.archive.archive_moves, moves_before)
+        metrics.incr("archive.answers", answers)
+        metrics.incr("archive.moves", moves)
+        logger.info(
+            "Archived %s answers before %s and %s instrument moves before %s",
+            answers,
+            answers_before,
+            moves,
+            moves_before,
+        )
+        return answers, moves
@@ -1,9 +1,19 @@
-from app.domain.entities import Cabinet, Instrument
+import asyncio
+import hashlib
+from collections import defaultdict
+
+from app.domain.entities import Cabinet, Instrument, InstrumentImport
 from app.domain.repositories import (
     CabinetRepository,
     InstrumentRepository,
     InstrumentMoveRepository,
 )
+from app.infrastructure.sheets.gateway import SheetsGateway
+from app.logger import setup_logger
+from app.text_utils import normalize_text
+
+
+logger = setup_logger("instrument_admin", "admin_panel.log")
 
 
 class InstrumentAdminService:
@@ -12,10 +22,12 @@ class InstrumentAdminService:
         cabinets: CabinetRepository,
         instruments: InstrumentRepository,
         moves: InstrumentMoveRepository,
+        gateway: SheetsGateway | None = None,
     ):
         self.cabinets = cabinets
         self.instruments = instruments
         self.moves = moves
+        self.gateway = gateway
 
     async def list_cabinets(self, include_archived: bool = False):
         return list(await self.cabinets.list_all(include_archived=include_archived))
@@ -67,3 +79,129 @@ class InstrumentAdminService:
 
     async def get_move(self, move_id: int):
         return await self.moves.get_by_id(move_id)
+
+    async def plan_import(self) -> InstrumentImport:
+        """Diffs the instruments sheet (cabinet, instrument, instrument_id) against the DB.
+
+        Rows with an id rename or restore that instrument. Rows without one
+        match an unclaimed instrument of the same name, preferably in the
+        same cabinet, or create it there. Active instruments no row matched
+        are archived. Existing instruments are never moved between cabinets:
+        that only happens through transfers.
+        """
+        plan = InstrumentImport()
+        rows = await asyncio.to_thread(self.gateway.read_instruments)
+        cabinets: dict[str, Cabinet] = {}
+        for cabinet in sorted(
+            await self.cabinets.list_all(include_archived=True), key=lambda item: item.id
+        ):
+            cabinets.setdefault(normalize_text(cabinet.name), cabinet)
+        instruments = list(await self.instruments.list_all(include_archived=True))
+        by_id = {instrument.id: instrument for instrument in instruments}
+
+        entries: list[tuple[int, str, str, str]] = []
+        for number, row in enumerate(rows, start=2):
+            cells = [cell.strip() for cell in row[:3]] + [""] * (3 - len(row[:3]))
+            cabinet_name, name, raw_id = cells
+            if name:
+                entries.append((number, cabinet_name, name, raw_id))
+        if not entries:
+            plan.problems.append("лист пуст — нечего импортировать")
+            return plan
+
+        matched: set[int] = set()
+        unmatched_rows = []
+        for number, cabinet_name, name, raw_id in entries:
+            if not raw_id:
+                unmatched_rows.append((number, cabinet_name, name))
+                continue
+            instrument = by_id.get(int(raw_id)) if raw_id.isdigit() else None
+            if instrument is None:
+                plan.problems.append(f"строка {number}: нет инструмента с id {raw_id}")
+                continue
+            if instrument.id in matched:
+                plan.problems.append(f"строка {number}: id {raw_id} встречается повторно")
+                continue
+            matched.add(instrument.id)
+            if name != instrument.name:
+                plan.renamed.append((instrument, name))
+            if not instrument.is_active:
+                plan.restored.append(instrument)
+
+        by_cabinet_name: dict[tuple[int, str], list[Instrument]] = defaultdict(list)
+        by_name: dict[str, list[Instrument]] = defaultdict(list)
+        for instrument in sorted(instruments, key=lambda item: (not item.is_active, item.id)):
+            if instrument.id not in matched:
+                key = normalize_text(instrument.name)
+                by_cabinet_name[(instrument.cabinet_id, key)].append(instrument)
+                by_name[key].append(instrument)
+
+        def claim(candidates: list[Instrument]) -> Instrument | None:
+            while candidates:
+                instrument = candidates.pop(0)
+                if instrument.id not in matched:
+                    matched.add(instrument.id)
+                    return instrument
+            return None
+
+        for number, cabinet_name, name in unmatched_rows:
+            key = normalize_text(name)
+            cabinet = cabinets.get(normalize_text(cabinet_name))
+            instrument = None
+            if cabinet is not None:
+                instrument = claim(by_cabinet_name.get((cabinet.id, key), []))
+            instrument = instrument or claim(by_name.get(key, []))
+            if instrument is not None:
+                if not instrument.is_active:
+                    plan.restored.append(instrument)
+                continue
+            if not cabinet_name:
+                plan.problems.append(f"строка {number}: не указан кабинет для «{name}»")
+                continue
+            if cabinet is None:
+                cabinet = Cabinet(id=None, name=cabinet_name)
+                cabinets[normalize_text(cabinet_name)] = cabinet
+                plan.new_cabinets.append(cabinet_name)
+            elif not cabinet.is_active and cabinet not in plan.restored_cabinets:
+                plan.restored_cabinets.append(cabinet)
+            plan.created.append((cabinet.name, name))
+
+        plan.archived = [
+            instrument
+            for instrument in instruments
+            if instrument.is_active and instrument.id not in matched
+        ]
+        return plan
+
+    @staticmethod
+    def import_digest(plan: InstrumentImport) -> str:
+        """Short fingerprint of a plan, so a confirmed dry run is applied only as shown."""
+        payload = repr(
+            (
+                plan.new_cabinets,
+                [cabinet.id for cabinet in plan.restored_cabinets],
+                plan.created,
+                [(instrument.id, name) for instrument, name in plan.renamed],
+                [instrument.id for instrument in plan.restored],
+                [instrument.id for instrument in plan.archived],
+            )
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+    async def apply_import(self, digest: str) -> tuple[InstrumentImport, bool]:
+        """Re-plans the import and applies it if it still matches ``digest``."""
+        plan = await self.plan_import()
+        if self.import_digest(plan) != digest or not plan.changes:
+            return plan, False
+        await self.instruments.apply_import(plan)
+        logger.info(
+            "Instrument import: %s cabinets created, %s restored; instruments %s created, "
+            "%s renamed, %s restored, %s archived",
+            len(plan.new_cabinets),
+            len(plan.restored_cabinets),
+            len(plan.created),
+            len(plan.renamed),
+            len(plan.restored),
+            len(plan.archived),
+        )
+        return plan, True
@@ -1,5 +1,7 @@
+from dataclasses import dataclass
 from datetime import datetime
 
+from app.application.use_cases.inventory import InventoryService
 from app.domain.entities import InstrumentMove
 from app.domain.repositories import (
     CabinetRepository,
@@ -9,6 +11,30 @@ from app.domain.repositories import (
 from app.text_utils import normalize_text
 
 
+TRANSFER_FAILURES = {
+    "same_cabinet": "инструмент уже в этом кабинете",
+    "instrument_not_found": "инструмент не найден",
+    "instrument_moved": "инструмент уже перенёс кто-то другой",
+    "cabinet_not_found": "кабинет назначения не найден",
+    "no_sterilization": "кабинет «Стерилизационная» не найден",
+    "sterilization_only": "перенос возможен только в «Стерилизационную»",
+    "wrong_return": "из стерилизационной инструмент возвращается в кабинет, откуда его принесли",
+}
+
+
+@dataclass(frozen=True)
+class TransferResult:
+    reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.reason is None
+
+    @property
+    def message(self) -> str:
+        return TRANSFER_FAILURES.get(self.reason, self.reason or "")
+
+
 class InstrumentTransferService:
     STERILIZATION_CABINET_NAME = "Стерилизационная"
 
@@ -17,10 +43,12 @@ class InstrumentTransferService:
         cabinets: CabinetRepository,
         instruments: InstrumentRepository,
         moves: InstrumentMoveRepository,
+        inventory: InventoryService | None = None,
     ):
         self.cabinets = cabinets
         self.instruments = instruments
         self.moves = moves
+        self.inventory = inventory
 
     async def list_cabinets(self):
         return list(await self.cabinets.list_all())
@@ -56,33 +84,28 @@ class InstrumentTransferService:
         before_photo_id: str,
         after_photo_id: str,
         moved_by_chat_id: str,
-    ) -> bool:
+    ) -> TransferResult:
+        """Validates and saves the move in one transaction with the instrument row locked."""
         if from_cabinet_id == to_cabinet_id:
-            return False
-
-        instrument = await self.instruments.get_by_id(instrument_id)
-        if not instrument or instrument.cabinet_id != from_cabinet_id:
-            return False
-
-        target = await self.cabinets.get_by_id(to_cabinet_id)
-        if not target:
-            return False
-
-        sterilization = await self.get_sterilization_cabinet()
-        if not sterilization:
-            return False
-        if from_cabinet_id == sterilization.id:
-            last_move = await self.moves.get_last_for_instrument(instrument_id)
-            if last_move and last_move.to_cabinet_id == sterilization.id:
-                if last_move.from_cabinet_id != to_cabinet_id:
-                    return False
-        else:
-            if to_cabinet_id != sterilization.id:
-                return False
-
-        updated = await self.instruments.update_cabinet(instrument_id, to_cabinet_id)
-        if not updated:
-            return False
+            return TransferResult("same_cabinet")
+
+        def check(instrument, target, last_move, sterilization) -> str | None:
+            if not sterilization:
+                return "no_sterilization"
+            if instrument.cabinet_id != from_cabinet_id:
+                return "instrument_moved"
+            if not target:
+                return "cabinet_not_found"
+            if from_cabinet_id == sterilization.id:
+                if (
+                    last_move
+                    and last_move.to_cabinet_id == sterilization.id
+                    and last_move.from_cabinet_id != to_cabinet_id
+                ):
+                    return "wrong_return"
+            elif to_cabinet_id != sterilization.id:
+                return "sterilization_only"
+            return None
 
         moved_at = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
         move = InstrumentMove(
@@ -95,5 +118,9 @@ class InstrumentTransferService:
             moved_by_chat_id=moved_by_chat_id,
             moved_at=moved_at,
         )
-        await self.moves.add(move)
-        return True
+        result = TransferResult(
+            await self.instruments.transfer(move, check, self.STERILIZATION_CABINET_NAME)
+        )
+        if result.ok and self.inventory:
+            self.inventory.invalidate()
+        return result
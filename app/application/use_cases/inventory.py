@@ -0,0 +1,91 @@
+import asyncio
+import time
+from itertools import groupby
+
+from app.catalog import CABINETS, INSTRUMENTS, WORKERS, CatalogVersions, catalog_versions
+from app.domain.entities import InventoryItem
+from app.domain.repositories import InstrumentRepository
+from app.infrastructure.sheets.gateway import SheetsGateway
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+logger = setup_logger("inventory", "inventory.log")
+
+INVENTORY_HEADERS = ["cabinet", "instrument", "instrument_id", "last_moved_at", "moved_by"]
+
+
+class InventoryService:
+    """Where every instrument is now, read in one query and cached.
+
+    The snapshot is dropped by ``invalidate`` after each transfer and
+    rebuilt when the cabinets, instruments or workers catalogs change or
+    after ``ttl`` seconds for writes made by other replicas.
+    """
+
+    def __init__(
+        self,
+        instruments: InstrumentRepository,
+        gateway: SheetsGateway,
+        versions: CatalogVersions = catalog_versions,
+        ttl: float = 60.0,
+    ):
+        self.instruments = instruments
+        self.gateway = gateway
+        self.versions = versions
+        self.ttl = ttl
+        self._items: list[InventoryItem] | None = None
+        self._built_versions: tuple[int, ...] | None = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _current_versions(self) -> tuple[int, ...]:
+        return tuple(self.versions.get(name) for name in (CABINETS, INSTRUMENTS, WORKERS))
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._items is not None
+            and self._built_versions == self._current_versions()
+            and time.monotonic() - self._built_at < self.ttl
+        )
+
+    def invalidate(self) -> None:
+        self._items = None
+
+    async def snapshot(self) -> list[InventoryItem]:
+        """Active instruments ordered by cabinet, then name."""
+        if self._is_fresh():
+            metrics.incr("inventory.hit")
+            return self._items
+        async with self._lock:
+            if not self._is_fresh():
+                versions = self._current_versions()
+                self._items = list(await self.instruments.list_inventory())
+                self._built_versions = versions
+                self._built_at = time.monotonic()
+                metrics.incr("inventory.rebuild")
+            return self._items
+
+    async def by_cabinet(self) -> list[tuple[str, list[InventoryItem]]]:
+        items = await self.snapshot()
+        return [
+            (name or "Без кабинета", list(group))
+            for name, group in groupby(items, key=lambda item: item.cabinet_name)
+        ]
+
+    async def export(self) -> int:
+        """Overwrites the inventory sheet with the snapshot in one write."""
+        items = await self.snapshot()
+        rows = [
+            [
+                item.cabinet_name or "",
+                item.instrument_name or "",
+                str(item.instrument_id),
+                item.last_moved_at or "",
+                item.moved_by or "",
+            ]
+            for item in items
+        ]
+        await asyncio.to_thread(self.gateway.export_inventory, INVENTORY_HEADERS, rows)
+        logger.info("Inventory exported: %s instruments", len(rows))
+        return len(rows)
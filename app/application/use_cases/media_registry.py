@@ -0,0 +1,93 @@
+import asyncio
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+
+from app.domain.repositories import MediaRepository
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+# Bad Request texts that blame the file itself rather than the chat.
+MEDIA_ERROR_MARKERS = ("file", "photo", "http url", "image")
+
+
+def is_media_error(exc: TelegramBadRequest) -> bool:
+    message = (exc.message or "").lower()
+    return any(marker in message for marker in MEDIA_ERROR_MARKERS)
+
+
+class MediaRegistry:
+    """Tracks which file_ids Telegram accepts so stale photos cost one failure."""
+
+    def __init__(self, media: MediaRepository, recheck_days: int = 7, concurrency: int = 3):
+        self.media = media
+        self.recheck_days = recheck_days
+        self.concurrency = concurrency
+        self.logger = setup_logger("media", "media.log")
+        self._valid: dict[str, bool] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def _statuses(self) -> dict[str, bool]:
+        if self._valid is None:
+            async with self._load_lock:
+                if self._valid is None:
+                    self._valid = {item.file_id: item.is_valid for item in await self.media.list_all()}
+        return self._valid
+
+    async def is_known_invalid(self, file_id: str) -> bool:
+        return (await self._statuses()).get(file_id) is False
+
+    async def mark(
+        self, file_id: str, is_valid: bool, error: str | None = None, refresh: bool = False
+    ) -> None:
+        statuses = await self._statuses()
+        if is_valid and not refresh and statuses.get(file_id) is True:
+            return
+        statuses[file_id] = is_valid
+        await self.media.mark(file_id, is_valid, error)
+
+    async def send_photo(self, bot: Bot, chat_id: int, file_id: str | None, caption: str) -> None:
+        """Sends the photo with a caption, or just the text if the photo is unusable."""
+        if file_id and not await self.is_known_invalid(file_id):
+            try:
+                await bot.send_photo(chat_id=chat_id, photo=file_id, caption=caption)
+            except TelegramBadRequest as exc:
+                if not is_media_error(exc):
+                    raise
+                metrics.incr("media.photo_invalid")
+                self.logger.warning("file_id rejected by Telegram: %s (%s)", file_id, exc.message)
+                await self.mark(file_id, False, exc.message)
+            else:
+                metrics.incr("media.photo_sent")
+                await self.mark(file_id, True)
+                return
+        metrics.incr("media.text_fallback")
+        await bot.send_message(chat_id, text=caption)
+
+    async def prevalidate(self, bot: Bot) -> tuple[int, int]:
+        file_ids = await self.media.list_unchecked_worker_file_ids(self.recheck_days)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(file_id: str) -> bool:
+            async with semaphore:
+                try:
+                    await bot.get_file(file_id)
+                except TelegramBadRequest as exc:
+                    await self.mark(file_id, False, exc.message, refresh=True)
+                    return False
+                await self.mark(file_id, True, refresh=True)
+                return True
+
+        results = await asyncio.gather(*(check(file_id) for file_id in file_ids), return_exceptions=True)
+        valid = sum(1 for result in results if result is True)
+        invalid = sum(1 for result in results if result is False)
+        failed = len(results) - valid - invalid
+        self.logger.info(
+            "Prevalidated %s file_ids: %s valid, %s invalid, %s errors",
+            len(file_ids),
+            valid,
+            invalid,
+            failed,
+        )
+        return valid, invalid
@@ -0,0 +1,174 @@
+import asyncio
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+
+from app.config import PhotoSettings
+from app.domain.entities import InstrumentMove, PhotoEvidence
+from app.domain.repositories import PhotoEvidenceRepository
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+logger = setup_logger("photo_evidence", "photo_evidence.log")
+
+PHOTO_KINDS = ("before", "after")
+
+
+def photo_pipeline_available() -> bool:
+    """The pipeline needs Pillow, which is an optional dependency."""
+    return importlib.util.find_spec("PIL") is not None
+
+
+def hash_photo(data: bytes, thumbnail_path: str, thumbnail_size: int) -> int:
+    """Difference hash of the photo as a signed 64-bit int; writes a JPEG thumbnail.
+
+    Runs in a worker process, so it only takes and returns plain values.
+    """
+    from PIL import Image
+
+    with Image.open(BytesIO(data)) as image:
+        image = image.convert("RGB")
+        pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+        value = 0
+        for row in range(8):
+            for col in range(8):
+                left = pixels[row * 9 + col]
+                right = pixels[row * 9 + col + 1]
+                value = (value << 1) | (left > right)
+        image.thumbnail((thumbnail_size, thumbnail_size))
+        image.save(thumbnail_path, "JPEG", quality=80)
+    # photo_evidence.phash is a BIGINT: keep the 64 bits, two's complement.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+@dataclass
+class _Photo:
+    move: InstrumentMove
+    kind: str
+    file_id: str
+    file_unique_id: str | None = None
+    phash: int | None = None
+    thumbnail_path: str | None = None
+    error: str | None = None
+
+
+class PhotoEvidencePipeline:
+    """Hashes and thumbnails transfer photos and flags reused "after" photos.
+
+    Runs as a scheduled sweep over moves without evidence rows, so the
+    transfer handler never waits on it. Downloads are bounded by
+    ``download_workers``, hashing runs in a process pool, and the results
+    are stored in move order so an "after" photo is compared against every
+    photo recorded before it.
+    """
+
+    def __init__(self, evidence: PhotoEvidenceRepository, settings: PhotoSettings, batch_size: int = 100):
+        self.evidence = evidence
+        self.settings = settings
+        self.batch_size = batch_size
+        self._pool: ProcessPoolExecutor | None = None
+        self._run_lock = asyncio.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.settings.hash_processes)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, bot: Bot) -> int:
+        """Processes pending moves until none are left; returns how many were processed."""
+        if self._run_lock.locked():
+            return 0
+        async with self._run_lock:
+            storage_dir = Path(self.settings.storage_dir)
+            await asyncio.to_thread(storage_dir.mkdir, parents=True, exist_ok=True)
+            total = 0
+            while True:
+                moves = await self.evidence.list_pending_moves(self.batch_size)
+                if not moves:
+                    break
+                await self._process(bot, moves, storage_dir)
+                total += len(moves)
+                if len(moves) < self.batch_size:
+                    break
+            if total:
+                logger.info("Processed photos of %s instrument moves", total)
+            return total
+
+    async def _process(self, bot: Bot, moves: list[InstrumentMove], storage_dir: Path) -> None:
+        photos = [
+            _Photo(move, kind, file_id)
+            for move in moves
+            for kind, file_id in zip(PHOTO_KINDS, (move.before_photo_id, move.after_photo_id))
+            if file_id
+        ]
+        semaphore = asyncio.Semaphore(self.settings.download_workers)
+        await asyncio.gather(*(self._prepare(bot, photo, storage_dir, semaphore) for photo in photos))
+        for photo in photos:
+            await self._store(photo)
+
+    async def _prepare(
+        self, bot: Bot, photo: _Photo, storage_dir: Path, semaphore: asyncio.Semaphore
+    ) -> None:
+        try:
+            async with semaphore:
+                file = await bot.get_file(photo.file_id)
+                buffer = BytesIO()
+                await bot.download_file(file.file_path, buffer)
+            metrics.incr("photo_evidence.downloaded")
+            photo.file_unique_id = file.file_unique_id
+            thumbnail_path = storage_dir / f"{photo.move.id}_{photo.kind}.jpg"
+            photo.phash = await asyncio.get_running_loop().run_in_executor(
+                self._executor(),
+                hash_photo,
+                buffer.getvalue(),
+                str(thumbnail_path),
+                self.settings.thumbnail_size,
+            )
+            photo.thumbnail_path = str(thumbnail_path)
+        except TelegramAPIError as exc:
+            metrics.incr("photo_evidence.download_failed")
+            photo.error = exc.message or str(exc)
+        except Exception as exc:
+            metrics.incr("photo_evidence.hash_failed")
+            logger.exception("Failed to hash %s photo of move %s", photo.kind, photo.move.id)
+            photo.error = str(exc) or type(exc).__name__
+
+    async def _store(self, photo: _Photo) -> None:
+        duplicate_of = None
+        if photo.kind == "after" and photo.error is None:
+            duplicate_of = await self.evidence.find_duplicate(
+                photo.move.id, photo.file_unique_id, photo.phash, self.settings.max_distance
+            )
+            if duplicate_of is not None:
+                metrics.incr("photo_evidence.duplicates")
+                logger.warning(
+                    "Move %s: after photo of instrument %s matches a photo of move %s (by %s)",
+                    photo.move.id,
+                    photo.move.instrument_id,
+                    duplicate_of,
+                    photo.move.moved_by_chat_id,
+                )
+        await self.evidence.save(
+            PhotoEvidence(
+                move_id=photo.move.id,
+                kind=photo.kind,
+                file_id=photo.file_id,
+                file_unique_id=photo.file_unique_id,
+                phash=photo.phash,
+                thumbnail_path=photo.thumbnail_path,
+                duplicate_of_move_id=duplicate_of,
+                error=photo.error,
+            )
+        )
+        metrics.incr("photo_evidence.stored")
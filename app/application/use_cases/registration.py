@@ -1,3 +1,5 @@
+import asyncio
+
 from app.domain.entities import Worker
 from app.domain.repositories import WorkerRepository
 from app.infrastructure.sheets.gateway import SheetsGateway
@@ -21,8 +23,10 @@ class RegistrationService:
             try:
                 worker = await self.workers.get_by_id(worker_id)
                 if worker:
-                    self.sheets.upsert_worker_registration(
-                        worker.full_name, chat_id=chat_id
+                    await asyncio.to_thread(
+                        self.sheets.upsert_worker_registration,
+                        worker.full_name,
+                        chat_id=chat_id,
                     )
             except Exception:
                 logger.exception("Failed to sync worker chat_id to Google Sheets")
@@ -34,8 +38,10 @@ class RegistrationService:
             try:
                 worker = await self.workers.get_by_id(worker_id)
                 if worker:
-                    self.sheets.upsert_worker_registration(
-                        worker.full_name, file_id=file_id
+                    await asyncio.to_thread(
+                        self.sheets.upsert_worker_registration,
+                        worker.full_name,
+                        file_id=file_id,
                     )
             except Exception:
                 logger.exception("Failed to sync worker file_id to Google Sheets")
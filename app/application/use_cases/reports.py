@@ -31,30 +31,36 @@ class ReportsService:
         self.logger.info("Starting monthly reports generation")
         now = datetime.now(ZoneInfo("Europe/Moscow"))
 
+        month_since = (now - timedelta(days=30)).strftime("%d.%m.%Y")
+        half_year_since = (now - timedelta(days=180)).strftime("%d.%m.%Y")
+
         workers = list(await self.workers.list_all())
-        answers = list(await self.answers.list_all())
+        summaries = list(await self.answers.summarize_scores(month_since, half_year_since))
+        open_rows = list(await self.answers.list_open_answers(month_since))
         shifts = list(await self.shifts.list_all())
 
-        surveys_by_name = await self._collect_survey_cache(answers)
-        answers_by_object = self._group_answers_by_object(answers)
+        surveys_by_id = await self._collect_survey_cache(summaries, open_rows)
+        summaries_by_object = self._group_by_object(summaries, lambda row: row.object)
+        open_by_object = self._group_by_object(open_rows, lambda row: row[0])
         shifts_by_assistant = self._group_shifts_last_month(shifts, now)
 
         sent_count = 0
         skipped_count = 0
 
         for worker in workers:
-            worker_answers = answers_by_object.get(worker.full_name, [])
+            worker_summaries = summaries_by_object.get(worker.full_name, [])
+            worker_open = open_by_object.get(worker.full_name, [])
             worker_shifts = shifts_by_assistant.get(worker.id)
 
-            if not worker_answers and not worker_shifts:
+            if not worker_summaries and not worker_open and not worker_shifts:
                 skipped_count += 1
                 self.logger.debug(
                     "Skip report: no data for %s", worker.full_name
                 )
                 continue
 
-            results, open_answers = self._calculate_scores_for_worker(
-                worker_answers, surveys_by_name, now
+            results, open_answers = self._build_results_for_worker(
+                worker_summaries, worker_open, surveys_by_id
             )
 
             try:
@@ -84,17 +90,18 @@ class ReportsService:
         )
 
     # --- helpers ---
-    async def _collect_survey_cache(self, all_answers):
-        survey_names = set(ans.survey for ans in all_answers)
-        surveys_by_name = {}
-        for name in survey_names:
-            surveys_by_name[name] = await self.surveys.get_by_name(name)
-        return surveys_by_name
-
-    def _group_answers_by_object(self, all_answers):
+    async def _collect_survey_cache(self, summaries, open_rows):
+        survey_ids = {row.survey_id for row in summaries} | {row[1] for row in open_rows}
+        surveys_by_id = {}
+        for survey_id in survey_ids:
+            if survey_id is not None:
+                surveys_by_id[survey_id] = await self.surveys.get_by_id(survey_id)
+        return surveys_by_id
+
+    def _group_by_object(self, rows, key):
         grouped = defaultdict(list)
-        for ans in all_answers:
-            grouped[ans.object].append(ans)
+        for row in rows:
+            grouped[key(row)].append(row)
         return grouped
 
     def _group_shifts_last_month(self, all_shifts, now: datetime):
@@ -109,54 +116,46 @@ class ReportsService:
             result[shift.assistant_id][shift.doctor_name] += 1
         return result
 
-    def _calculate_scores_for_worker(self, answers, surveys_by_name, now: datetime):
-        one_month_ago = now - timedelta(days=30)
-        six_months_ago = now - timedelta(days=180)
-
+    def _build_results_for_worker(self, summaries, open_rows, surveys_by_id):
         results = {
-            "Month": defaultdict(lambda: defaultdict(list)),
-            "Half-year": defaultdict(lambda: defaultdict(list)),
-            "All time": defaultdict(lambda: defaultdict(list)),
+            "Month": defaultdict(dict),
+            "Half-year": defaultdict(dict),
+            "All time": defaultdict(dict),
         }
 
         open_answers = defaultdict(list)
 
-        for ans in answers:
-            survey = surveys_by_name.get(ans.survey)
-            if not survey:
+        for row in summaries:
+            survey = surveys_by_id.get(row.survey_id)
+            question = self._question(survey, row.question_no)
+            if not question or question.type != "int":
                 continue
-
-            survey_date = self._parse_russian_date(ans.survey_date)
-            if not survey_date:
+            question_text = question.text.split("\n")[0]
+            periods = (
+                ("Month", row.month_avg, row.month_count),
+                ("Half-year", row.half_year_avg, row.half_year_count),
+                ("All time", row.all_time_avg, row.all_time_count),
+            )
+            for period_name, avg, count in periods:
+                if count:
+                    results[period_name][survey.speciality][question_text] = (avg, count)
+
+        for _, survey_id, question_no, text_value in open_rows:
+            survey = surveys_by_id.get(survey_id)
+            question = self._question(survey, question_no)
+            if not question or question.type != "str":
                 continue
-
-            for i in range(1, 5 + 1):
-                question_text = getattr(survey, f"question{i}", f"Question {i}").split("\n")[0]
-                q_type = getattr(survey, f"question{i}_type")
-
-                raw_answer = getattr(ans, f"answer{i}")
-                if q_type == "int":
-                    try:
-                        score = int(raw_answer)
-                        if not (1 <= score <= 5):
-                            continue
-                    except (ValueError, TypeError):
-                        continue
-
-                    if survey_date >= one_month_ago:
-                        results["Month"][survey.speciality][question_text].append(score)
-                    if survey_date >= six_months_ago:
-                        results["Half-year"][survey.speciality][question_text].append(score)
-                    results["All time"][survey.speciality][question_text].append(score)
-
-                elif q_type == "str" and survey_date >= one_month_ago:
-                    if raw_answer and str(raw_answer).strip():
-                        open_answers[survey.speciality].append(
-                            (question_text, str(raw_answer).strip())
-                        )
+            open_answers[survey.speciality].append(
+                (question.text.split("\n")[0], text_value.strip())
+            )
 
         return results, open_answers
 
+    def _question(self, survey, question_no: int):
+        if not survey:
+            return None
+        return next((q for q in survey.questions if q.position == question_no), None)
+
     def _format_report_text(self, results, open_answers, shifts_info=None):
         messages = []
         period_values_seen = set()
@@ -164,9 +163,9 @@ class ReportsService:
         for period_name, surveys in results.items():
             serialized = str(
                 sorted(
-                    (survey, question, sorted(scores))
+                    (survey, question, stats)
                     for survey, questions in surveys.items()
-                    for question, scores in questions.items()
+                    for question, stats in questions.items()
                 )
             )
 
@@ -183,9 +182,8 @@ class ReportsService:
 
             for survey_title, questions in surveys.items():
                 text += f"— Survey: {survey_title}\n"
-                for question, scores in questions.items():
-                    avg = round(sum(scores) / len(scores), 2)
-                    text += f"• {question}\n {avg} / 5 ({len(scores)} answers)\n\n"
+                for question, (avg, count) in questions.items():
+                    text += f"• {question}\n {round(avg, 2)} / 5 ({count} answers)\n\n"
 
             if period_name == "Month" and open_answers:
                 text += "— Open answers:\n"
@@ -1,17 +1,23 @@
-﻿from collections import defaultdict
+﻿import asyncio
 from datetime import datetime
 
 from aiogram import Bot, Dispatcher
+from aiogram.exceptions import TelegramRetryAfter
 
-from app.domain.entities import Pair
+from app.domain.entities import PairDispatch
 from app.application.use_cases.survey_flow import SurveyFlowService
 from app.handlers.survey_handlers import start_pair_survey
 from app.logger import setup_logger
 
 
+DISPATCH_CONCURRENCY = 10
+SEND_ATTEMPTS = 3
+
+
 class SurveyScheduler:
-    def __init__(self, survey_flow: SurveyFlowService):
+    def __init__(self, survey_flow: SurveyFlowService, concurrency: int = DISPATCH_CONCURRENCY):
         self.survey_flow = survey_flow
+        self.concurrency = concurrency
         self.logger = setup_logger("surveys", "surveys.log")
 
     async def send_surveys(self, bot: Bot, dp: Dispatcher) -> None:
@@ -19,40 +25,37 @@ class SurveyScheduler:
         await self.survey_flow.reset_incomplete()
 
         today = datetime.now().strftime("%d.%m.%Y")
-        pairs = await self.survey_flow.get_ready_pairs_for_today(today)
-
-        by_user: dict[str, list[Pair]] = defaultdict(list)
-        for p in pairs:
-            by_user[p.subject].append(p)
-
-        for subject, user_pairs in by_user.items():
-            try:
-                worker = await self.survey_flow.get_worker(subject)
-            except Exception as exc:
-                self.logger.error("get_worker_by_fullname: %s. subject: %s.", exc, subject)
-                continue
-
-            if not worker or not worker.chat_id:
-                self.logger.warning("Не найден chat_id для %s", subject)
-                continue
-
-            if any(p.status == "in_progress" for p in user_pairs):
-                self.logger.warning("У %s уже есть незавершённый опрос", subject)
-                continue
-
-            pair = user_pairs[0]
-
-            try:
-                await self.survey_flow.mark_pair_status(pair.id, "in_progress")
-                file_id = await self.survey_flow.get_worker_file_id(pair.object)
-                await start_pair_survey(
-                    bot,
-                    int(worker.chat_id),
-                    pair,
-                    self.survey_flow,
-                    dp=dp,
-                    file_id=file_id,
-                )
-                self.logger.info("Отправлен опрос для %s от %s, id: %s", pair.subject, pair.date, pair.id)
-            except Exception as exc:
-                self.logger.error("Failed to start pair survey: %s. id: %s", exc, pair.id)
+        plan = await self.survey_flow.claim_dispatch_plan(today)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(dispatch: PairDispatch) -> bool:
+            pair = dispatch.pair
+            async with semaphore:
+                for attempt in range(1, SEND_ATTEMPTS + 1):
+                    try:
+                        await start_pair_survey(
+                            bot,
+                            int(dispatch.subject_chat_id),
+                            pair,
+                            self.survey_flow,
+                            dp=dp,
+                            file_id=dispatch.object_file_id,
+                            survey_id=dispatch.survey_id,
+                        )
+                        break
+                    except TelegramRetryAfter as exc:
+                        if attempt < SEND_ATTEMPTS:
+                            await asyncio.sleep(exc.retry_after)
+                            continue
+                        error = exc
+                    except Exception as exc:
+                        error = exc
+                    # Claimed as in_progress up front: hand it back so it is not lost for the day.
+                    self.logger.error("Failed to start pair survey: %s. id: %s", error, pair.id)
+                    await self.survey_flow.mark_pair_status(pair.id, "ready")
+                    return False
+            self.logger.info("Отправлен опрос для %s от %s, id: %s", pair.subject, pair.date, pair.id)
+            return True
+
+        results = await asyncio.gather(*(send(dispatch) for dispatch in plan))
+        self.logger.info("Рассылка завершена: отправлено %s из %s", sum(results), len(plan))
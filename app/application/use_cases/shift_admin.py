@@ -1,55 +1,100 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timedelta
 
+from app.application.use_cases.shift_board import ShiftBoard
+from app.domain.entities import Shift, WorkerPage
 from app.domain.repositories import WorkerRepository, ShiftRepository
-from app.text_utils import normalize_text
+
+
+# Template code -> (shift types, number of days starting today).
+SLOT_TEMPLATES: dict[str, tuple[tuple[str, ...], int]] = {
+    "week-morning": (("morning",), 7),
+    "week-evening": (("evening",), 7),
+    "week-both": (("morning", "evening"), 7),
+}
 
 
 class ShiftAdminService:
-    def __init__(self, workers: WorkerRepository, shifts: ShiftRepository):
+    def __init__(self, workers: WorkerRepository, shifts: ShiftRepository, board: ShiftBoard):
         self.workers = workers
         self.shifts = shifts
+        self.board = board
 
     @staticmethod
     def _today_str() -> str:
         return datetime.now().strftime("%d.%m.%Y")
 
     async def list_today_shifts(self):
-        date_str = self._today_str()
-        shifts = list(await self.shifts.list_by_date(date_str))
-        order = {"morning": 0, "evening": 1}
-        shifts.sort(
-            key=lambda s: (
-                order.get(s.type, 2),
-                normalize_text(s.doctor_name),
-                s.id or 0,
-            )
-        )
-        return shifts
+        return (await self.board.day(self._today_str())).all()
 
-    async def list_workers(self):
-        return list(await self.workers.list_all())
+    async def list_workers_page(
+        self, after: int | None = None, before: int | None = None, limit: int = 10
+    ) -> WorkerPage:
+        return await self.workers.list_page(after=after, before=before, limit=limit)
 
     async def get_worker(self, worker_id: int):
         return await self.workers.get_by_id(worker_id)
 
     async def get_shift(self, shift_id: int):
-        return await self.shifts.get_by_id(shift_id)
+        return (await self.board.day(self._today_str())).get(shift_id)
 
-    async def create_shift_today(self, doctor_name: str, shift_type: str) -> bool:
+    async def create_shift_today(
+        self, doctor_name: str, shift_type: str, doctor_id: int | None = None
+    ) -> bool:
         date_str = self._today_str()
-        existing = [
-            s
-            for s in await self.list_today_shifts()
-            if s.doctor_name == doctor_name and s.type == shift_type
-        ]
-        if existing:
+        if (await self.board.day(date_str)).doctor_shifts(shift_type, doctor_name):
+            return False
+        shift_id = await self.shifts.add_slot(doctor_name, date_str, shift_type, doctor_id)
+        if shift_id is None:
             return False
-        return await self.shifts.add_slot(doctor_name, date_str, shift_type)
+        shift = Shift(
+            id=shift_id,
+            assistant_id=None,
+            doctor_name=doctor_name,
+            date=date_str,
+            type=shift_type,
+            doctor_id=doctor_id,
+        )
+        await self.board.apply(date_str, lambda board: board.add(shift))
+        return True
+
+    async def create_slots_from_template(
+        self, doctor_name: str, template: str, doctor_id: int | None = None
+    ) -> tuple[int, int]:
+        """Creates a template's free slots in one insert; returns (created, requested)."""
+        shift_types, days = SLOT_TEMPLATES[template]
+        today = datetime.now().date()
+        records = [
+            (doctor_name, (today + timedelta(days=offset)).strftime("%d.%m.%Y"), shift_type, doctor_id)
+            for offset in range(days)
+            for shift_type in shift_types
+        ]
+        created = await self.shifts.add_slots(records)
+        by_date: dict[str, list[Shift]] = defaultdict(list)
+        for shift_id, date_str, shift_type in created:
+            by_date[date_str].append(
+                Shift(
+                    id=shift_id,
+                    assistant_id=None,
+                    doctor_name=doctor_name,
+                    date=date_str,
+                    type=shift_type,
+                    doctor_id=doctor_id,
+                )
+            )
+        for date_str, added in by_date.items():
+            def add_all(board, added=added):
+                for shift in added:
+                    board.add(shift)
+
+            await self.board.apply(date_str, add_all, rows=len(added))
+        return len(created), len(records)
 
     async def delete_shift_today(self, shift_id: int) -> bool:
-        shift = await self.shifts.get_by_id(shift_id)
-        if not shift:
-            return False
-        if shift.date != self._today_str():
+        date_str = self._today_str()
+        if (await self.board.day(date_str)).get(shift_id) is None:
             return False
-        return await self.shifts.delete_by_id(shift_id)
+        deleted = await self.shifts.delete_by_id(shift_id)
+        if deleted:
+            await self.board.apply(date_str, lambda board: board.delete(shift_id))
+        return deleted
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from bisect import insort
+from collections import defaultdict
+from dataclasses import replace
+from typing import Callable, Iterable
+
+from app.domain.entities import Shift
+from app.domain.repositories import ShiftRepository
+from app.metrics import metrics
+from app.text_utils import normalize_text
+
+
+SHIFT_TYPE_ORDER = {"morning": 0, "evening": 1}
+
+
+class DayBoard:
+    """Shifts of one day, indexed the way the shift screens read them."""
+
+    def __init__(self, version: int, shifts: Iterable[Shift]):
+        self.version = version
+        self._shifts: dict[int, Shift] = {}
+        self._by_doctor: dict[tuple[str, str], list[int]] = defaultdict(list)
+        self._free: dict[str, list[tuple[str, int]]] = defaultdict(list)
+        self._by_assistant: dict[tuple[str, int], int] = {}
+        for shift in shifts:
+            if shift.id is not None:
+                self._index(shift)
+
+    def _index(self, shift: Shift) -> None:
+        doctor = normalize_text(shift.doctor_name)
+        self._shifts[shift.id] = shift
+        insort(self._by_doctor[(shift.type, doctor)], shift.id)
+        if shift.assistant_id is None:
+            insort(self._free[shift.type], (doctor, shift.id))
+        else:
+            self._by_assistant[(shift.type, shift.assistant_id)] = shift.id
+
+    def _unindex(self, shift: Shift) -> None:
+        doctor = normalize_text(shift.doctor_name)
+        del self._shifts[shift.id]
+        self._by_doctor[(shift.type, doctor)].remove(shift.id)
+        if shift.assistant_id is None:
+            self._free[shift.type].remove((doctor, shift.id))
+        else:
+            self._by_assistant.pop((shift.type, shift.assistant_id), None)
+
+    def get(self, shift_id: int) -> Shift | None:
+        return self._shifts.get(shift_id)
+
+    def doctor_shifts(self, shift_type: str, doctor_name: str) -> list[Shift]:
+        ids = self._by_doctor.get((shift_type, normalize_text(doctor_name)), ())
+        return [self._shifts[shift_id] for shift_id in ids]
+
+    def free(self, shift_type: str) -> list[Shift]:
+        """Unclaimed shifts ordered by doctor name."""
+        return [self._shifts[shift_id] for _, shift_id in self._free.get(shift_type, ())]
+
+    def assistant_shift(self, shift_type: str, assistant_id: int) -> Shift | None:
+        shift_id = self._by_assistant.get((shift_type, assistant_id))
+        return self._shifts.get(shift_id) if shift_id is not None else None
+
+    def all(self) -> list[Shift]:
+        return sorted(
+            self._shifts.values(),
+            key=lambda s: (SHIFT_TYPE_ORDER.get(s.type, 2), normalize_text(s.doctor_name), s.id),
+        )
+
+    def claim(self, shift_id: int, assistant_id: int, assistant_name: str) -> None:
+        shift = self._shifts.get(shift_id)
+        if shift is None:
+            return
+        self._unindex(shift)
+        self._index(
+            replace(shift, assistant_id=assistant_id, assistant_name=assistant_name, manual=False)
+        )
+
+    def cancel(self, shift_type: str, assistant_id: int) -> None:
+        shift = self.assistant_shift(shift_type, assistant_id)
+        if shift is None:
+            return
+        self._unindex(shift)
+        self._index(replace(shift, assistant_id=None, assistant_name=None))
+
+    def add(self, shift: Shift) -> None:
+        if shift.id in self._shifts:
+            self._unindex(self._shifts[shift.id])
+        self._index(shift)
+
+    def delete(self, shift_id: int) -> None:
+        shift = self._shifts.get(shift_id)
+        if shift is not None:
+            self._unindex(shift)
+
+
+class ShiftBoard:
+    """Per-day DayBoards kept coherent with the database by day versions.
+
+    Every shift write bumps shift_days.version in the database. Boards are
+    re-checked at most every ``check_interval`` seconds with a one-row
+    lookup and reloaded when someone else has written; writes made through
+    this process are applied in place when the version moved by exactly the
+    number of rows they touched.
+    Listeners are told the date whenever a day they may be showing changed.
+    """
+
+    def __init__(self, shifts: ShiftRepository, check_interval: float = 1.0, max_days: int = 8):
+        self.shifts = shifts
+        self.check_interval = check_interval
+        self.max_days = max_days
+        self._days: dict[str, DayBoard] = {}
+        self._checked_at: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._listeners: list[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        self._listeners.append(listener)
+
+    def _changed(self, date: str) -> None:
+        for listener in self._listeners:
+            listener(date)
+
+    async def day(self, date: str) -> DayBoard:
+        board = self._days.get(date)
+        now = time.monotonic()
+        if board is not None:
+            if now - self._checked_at.get(date, 0.0) < self.check_interval:
+                metrics.incr("shift_board.hit")
+                return board
+            if await self.shifts.get_day_version(date) == board.version:
+                self._checked_at[date] = now
+                metrics.incr("shift_board.hit")
+                return board
+
+        async with self._locks[date]:
+            current = self._days.get(date)
+            if current is not None and current is not board:
+                return current
+            version, shifts = await self.shifts.list_day(date)
+            stale = board
+            board = DayBoard(version, shifts)
+            self._days.pop(date, None)
+            self._days[date] = board
+            self._checked_at[date] = time.monotonic()
+            while len(self._days) > self.max_days:
+                oldest = next(iter(self._days))
+                self._days.pop(oldest)
+                self._checked_at.pop(oldest, None)
+            metrics.incr("shift_board.reload")
+            if stale is not None:
+                self._changed(date)
+            return board
+
+    def cached_version(self, date: str) -> int | None:
+        board = self._days.get(date)
+        return board.version if board is not None else None
+
+    def date_of(self, shift_id: int) -> str | None:
+        for date, board in self._days.items():
+            if board.get(shift_id) is not None:
+                return date
+        return None
+
+    async def apply(
+        self, date: str, change: Callable[[DayBoard], None], rows: int = 1
+    ) -> None:
+        """Applies a write this process just committed, or drops a board that raced."""
+        board = self._days.get(date)
+        if board is None:
+            return
+        version = await self.shifts.get_day_version(date)
+        if version == board.version:
+            return
+        if version == board.version + rows:
+            change(board)
+            board.version = version
+            self._checked_at[date] = time.monotonic()
+            metrics.incr("shift_board.applied")
+            self._changed(date)
+            return
+        self.invalidate(date)
+        self._changed(date)
+
+    def invalidate(self, date: str) -> None:
+        self._days.pop(date, None)
+        self._checked_at.pop(date, None)
@@ -1,9 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Callable
 
+from app.application.use_cases.shift_board import ShiftBoard
+from app.domain.entities import Shift, WorkerPage
 from app.domain.repositories import WorkerRepository, ShiftRepository
 from app.text_utils import normalize_text
 
 
+PLAN_DAYS = 7
+
+
 def detect_shift_type(hour: int, minute: int = 0) -> str | None:
     current_minutes = hour * 60 + minute
     if 7 * 60 + 30 <= current_minutes < 14 * 60:
@@ -14,9 +20,17 @@ def detect_shift_type(hour: int, minute: int = 0) -> str | None:
 
 
 class ShiftService:
-    def __init__(self, workers: WorkerRepository, shifts: ShiftRepository):
+    def __init__(
+        self,
+        workers: WorkerRepository,
+        shifts: ShiftRepository,
+        board: ShiftBoard,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
         self.workers = workers
         self.shifts = shifts
+        self.board = board
+        self.clock = clock
 
     async def get_worker(self, chat_id: int, include_inactive: bool = False):
         return await self.workers.get_by_chat_id(
@@ -26,19 +40,13 @@ class ShiftService:
     async def get_worker_by_id(self, worker_id: int):
         return await self.workers.get_by_id(worker_id)
 
-    async def list_all_doctors(self):
-        return await self.workers.list_all()
+    async def list_doctors_page(
+        self, after: int | None = None, before: int | None = None, limit: int = 10
+    ) -> WorkerPage:
+        return await self.workers.list_page(after=after, before=before, limit=limit)
 
     async def list_doctor_shifts(self, date: str, shift_type: str, doctor_name: str):
-        normalized = normalize_text(doctor_name)
-        shifts = [
-            shift
-            for shift in await self.shifts.list_by_date(date)
-            if shift.type == shift_type
-            and normalize_text(shift.doctor_name) == normalized
-        ]
-        shifts.sort(key=lambda item: item.id or 0)
-        return shifts
+        return (await self.board.day(date)).doctor_shifts(shift_type, doctor_name)
 
     async def get_preferred_free_doctor_slot(
         self,
@@ -54,60 +62,65 @@ class ShiftService:
 
         preferred = normalize_text(assistant_name)
         if preferred:
-            scheduled_slots = [
-                shift
-                for shift in free_slots
-                if normalize_text(shift.scheduled_assistant_name) == preferred
-            ]
-            if scheduled_slots:
-                scheduled_slots.sort(key=lambda item: item.id or 0)
-                return scheduled_slots[0]
-
-        free_slots.sort(key=lambda item: item.id or 0)
+            for shift in free_slots:
+                if normalize_text(shift.scheduled_assistant_name) == preferred:
+                    return shift
         return free_slots[0]
 
+    def plan_dates(self) -> list[str]:
+        """Days open for booking ahead: tomorrow and the following PLAN_DAYS - 1."""
+        today = self.clock().date()
+        return [
+            (today + timedelta(days=offset)).strftime("%d.%m.%Y")
+            for offset in range(1, PLAN_DAYS + 1)
+        ]
+
+    async def count_free_by_day(self, dates: list[str]) -> list[tuple[str, int, int]]:
+        """(date, free morning, free evening) for each date, read from the day boards."""
+        result = []
+        for date in dates:
+            board = await self.board.day(date)
+            result.append((date, len(board.free("morning")), len(board.free("evening"))))
+        return result
+
     async def get_current_shift(self, worker_id: int, date: str, shift_type: str):
-        return await self.shifts.get_for_assistant(worker_id, date, shift_type)
+        return (await self.board.day(date)).assistant_shift(shift_type, worker_id)
 
     async def list_free_shifts(
         self, date: str, shift_type: str, assistant_name: str | None = None
     ):
-        shifts = [
-            shift
-            for shift in await self.shifts.list_by_date(date)
-            if shift.type == shift_type and shift.assistant_id is None
-        ]
+        shifts = (await self.board.day(date)).free(shift_type)
         preferred = normalize_text(assistant_name)
 
         def is_preferred(item) -> bool:
-            return (
-                item.scheduled_assistant_name
+            return bool(
+                preferred
+                and item.scheduled_assistant_name
                 and normalize_text(item.scheduled_assistant_name) == preferred
             )
 
-        shifts.sort(
-            key=lambda item: (
-                0 if preferred and is_preferred(item) else 1,
-                normalize_text(item.doctor_name),
-                item.id or 0,
-            )
-        )
-
         result: list[tuple[int, str]] = []
+        others: list[tuple[int, str]] = []
         for shift in shifts:
-            if shift.id is None:
-                continue
-            label = shift.doctor_name
-            if preferred and is_preferred(shift):
-                label = f"⭐ {label}"
-            result.append((shift.id, label))
-        return result
+            if is_preferred(shift):
+                result.append((shift.id, f"⭐ {shift.doctor_name}"))
+            else:
+                others.append((shift.id, shift.doctor_name))
+        return result + others
 
     async def add_shift_by_id(self, worker_id: int, worker_name: str, shift_id: int) -> bool:
-        return await self.shifts.add_by_id(worker_id, worker_name, shift_id)
+        success = await self.shifts.add_by_id(worker_id, worker_name, shift_id)
+        date = self.board.date_of(shift_id)
+        if success and date:
+            await self.board.apply(date, lambda board: board.claim(shift_id, worker_id, worker_name))
+        return success
 
     async def remove_shift(self, assistant_id: int, date: str, shift_type: str) -> None:
-        await self.shifts.remove_assistant(assistant_id, date, shift_type)
+        removed = await self.shifts.remove_assistant(assistant_id, date, shift_type)
+        if removed:
+            await self.board.apply(
+                date, lambda board: board.cancel(shift_type, assistant_id), rows=removed
+            )
 
     async def add_manual_shift(
         self,
@@ -116,16 +129,34 @@ class ShiftService:
         doctor_name: str,
         shift_type: str,
         date: str,
+        doctor_id: int | None = None,
     ) -> bool:
-        return await self.shifts.add_manual(
-            assistant_id, assistant_name, doctor_name, shift_type, date
+        shift_id = await self.shifts.add_manual(
+            assistant_id, assistant_name, doctor_name, shift_type, date, doctor_id
+        )
+        if shift_id is None:
+            return False
+        shift = Shift(
+            id=shift_id,
+            assistant_id=assistant_id,
+            doctor_name=doctor_name,
+            date=date,
+            type=shift_type,
+            assistant_name=assistant_name,
+            manual=True,
+            doctor_id=doctor_id,
         )
+        await self.board.apply(date, lambda board: board.add(shift))
+        return True
 
-    async def get_shift_by_id(self, shift_id: int):
+    async def get_shift_by_id(self, shift_id: int, date: str | None = None):
+        """Looks on the day's board when the date is known, else in the database."""
+        if date is not None:
+            return (await self.board.day(date)).get(shift_id)
         return await self.shifts.get_by_id(shift_id)
 
     def guess_shift_type_from_now(self) -> tuple[str | None, str]:
-        now = datetime.now()
+        now = self.clock()
         shift_type = detect_shift_type(now.hour, now.minute)
         date_str = now.strftime("%d.%m.%Y")
         return shift_type, date_str
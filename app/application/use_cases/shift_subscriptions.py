@@ -0,0 +1,186 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+
+from app.application.use_cases.shift_management import ShiftService
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+FREE_SHIFTS_TEXT = "Выберите доктора:"
+NO_FREE_SHIFTS_TEXT = "Свободных смен не осталось"
+
+
+@dataclass
+class FreeShiftMessage:
+    message_id: int
+    date: str
+    shift_type: str
+    assistant_name: str
+    shown: list[tuple[int, str]]
+    subscribed_at: float = field(default_factory=time.monotonic)
+
+
+class FreeShiftSubscriptions:
+    """Open "Выберите доктора" keyboards, re-rendered when their day changes.
+
+    Changes are coalesced for ``debounce`` seconds and the edits are paced
+    at ``edits_per_second`` so a burst of claims costs one edit per stale
+    keyboard and stays inside the Bot API limits. While keyboards are open,
+    their days' versions are polled every ``poll_interval`` seconds, so
+    writes made by other replicas reach them even if nobody taps here.
+    """
+
+    def __init__(
+        self,
+        shift_service: ShiftService,
+        build_markup: Callable[[list[tuple[int, str]]], InlineKeyboardMarkup],
+        debounce: float = 1.0,
+        edits_per_second: float = 20.0,
+        max_age: float = 15 * 60,
+        poll_interval: float = 3.0,
+    ):
+        self.shift_service = shift_service
+        self.build_markup = build_markup
+        self.debounce = debounce
+        self.edits_per_second = edits_per_second
+        self.max_age = max_age
+        self.poll_interval = poll_interval
+        self.logger = setup_logger("shift_push", "shift.log")
+        self._bot: Bot | None = None
+        self._messages: dict[int, FreeShiftMessage] = {}
+        self._pending: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+        self._versions: dict[str, int] = {}
+        self._watch_task: asyncio.Task | None = None
+        # The loop only keeps weak references to tasks: hold pending flushes.
+        self._tasks: set[asyncio.Task] = set()
+
+    def subscribe(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        date: str,
+        shift_type: str,
+        assistant_name: str,
+        shown: list[tuple[int, str]],
+    ) -> None:
+        self._bot = bot
+        self._messages[chat_id] = FreeShiftMessage(
+            message_id, date, shift_type, assistant_name, list(shown)
+        )
+        metrics.incr("shift_push.subscribed")
+        version = self.shift_service.board.cached_version(date)
+        if version is not None:
+            # The keyboard was just rendered from this version.
+            self._versions.setdefault(date, version)
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+
+    def unsubscribe(self, chat_id: int) -> None:
+        self._messages.pop(chat_id, None)
+
+    def notify(self, date: str) -> None:
+        """Schedules a re-render of the keyboards open for ``date``."""
+        if self._bot is None or date in self._pending:
+            return
+        if not any(item.date == date for item in self._messages.values()):
+            return
+        self._pending.add(date)
+        task = asyncio.get_running_loop().create_task(self._flush_later(date))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for chat_id, item in list(self._messages.items()):
+            if now - item.subscribed_at > self.max_age:
+                self._messages.pop(chat_id, None)
+
+    async def _watch(self) -> None:
+        """Polls the versions of days with open keyboards until none are left."""
+        while self._messages:
+            await asyncio.sleep(self.poll_interval)
+            self._expire()
+            dates = {item.date for item in self._messages.values()}
+            for date in list(self._versions):
+                if date not in dates:
+                    del self._versions[date]
+            for date in dates:
+                try:
+                    version = (await self.shift_service.board.day(date)).version
+                except Exception:
+                    self.logger.exception("Failed to check shift day %s", date)
+                    continue
+                seen = self._versions.setdefault(date, version)
+                if version != seen:
+                    self._versions[date] = version
+                    metrics.incr("shift_push.polled_changes")
+                    self.notify(date)
+        self._versions.clear()
+
+    async def _flush_later(self, date: str) -> None:
+        await asyncio.sleep(self.debounce)
+        self._pending.discard(date)
+        try:
+            await self.flush(date)
+        except Exception:
+            self.logger.exception("Failed to refresh free-shift keyboards for %s", date)
+
+    async def flush(self, date: str) -> int:
+        async with self._flush_lock:
+            self._expire()
+
+            interval = 1.0 / self.edits_per_second
+            edited = 0
+            for chat_id, item in list(self._messages.items()):
+                if item.date != date:
+                    continue
+                shown = await self.shift_service.list_free_shifts(
+                    item.date, item.shift_type, item.assistant_name
+                )
+                if shown == item.shown:
+                    continue
+                if await self._edit(chat_id, item, shown):
+                    edited += 1
+                    await asyncio.sleep(interval)
+            return edited
+
+    async def _edit(self, chat_id: int, item: FreeShiftMessage, shown: list[tuple[int, str]]) -> bool:
+        for _ in range(2):
+            if self._messages.get(chat_id) is not item:
+                return False
+            try:
+                if bool(shown) != bool(item.shown):
+                    await self._bot.edit_message_text(
+                        text=FREE_SHIFTS_TEXT if shown else NO_FREE_SHIFTS_TEXT,
+                        chat_id=chat_id,
+                        message_id=item.message_id,
+                        reply_markup=self.build_markup(shown),
+                    )
+                else:
+                    await self._bot.edit_message_reply_markup(
+                        chat_id=chat_id,
+                        message_id=item.message_id,
+                        reply_markup=self.build_markup(shown),
+                    )
+            except TelegramRetryAfter as exc:
+                metrics.incr("shift_push.retry_after")
+                await asyncio.sleep(exc.retry_after)
+                continue
+            except TelegramBadRequest as exc:
+                if "not modified" not in (exc.message or "").lower():
+                    # Deleted, too old or otherwise gone: stop tracking it.
+                    metrics.incr("shift_push.dropped")
+                    self._messages.pop(chat_id, None)
+                    return False
+            item.shown = shown
+            metrics.incr("shift_push.edits")
+            return True
+        return False
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from typing import Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+
+from app.application.use_cases.admin_access import AdminAccessService
+from app.config import SterilizationSettings
+from app.domain.entities import OverdueSterilization
+from app.domain.repositories import SterilizationRepository
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+logger = setup_logger("sterilization", "sterilization.log")
+
+
+class SterilizationMonitor:
+    """Reports instruments kept in «Стерилизационная» longer than ``max_hours``.
+
+    Each overdue cycle is claimed before it is reported, so it reaches the
+    admins once even with several replicas running the job.
+    """
+
+    def __init__(
+        self,
+        sterilization: SterilizationRepository,
+        admin_access: AdminAccessService,
+        settings: SterilizationSettings,
+        clock: Callable[[], datetime] = datetime.now,
+        batch_size: int = 40,
+    ):
+        self.sterilization = sterilization
+        self.admin_access = admin_access
+        self.settings = settings
+        self.clock = clock
+        self.batch_size = batch_size
+
+    def format_overdue(self, items: list[OverdueSterilization]) -> str:
+        lines = [f"⏰ Дольше {self.settings.max_hours:g} ч в стерилизационной:"]
+        for item in items:
+            origin = f" (из «{item.origin_cabinet_name}»)" if item.origin_cabinet_name else ""
+            lines.append(f"• {item.instrument_name} — с {item.started_at}{origin}")
+        return "\n".join(lines)
+
+    async def _recipients(self) -> list[str]:
+        chat_ids = set(self.admin_access.list_super_admins())
+        chat_ids.update(admin.chat_id for admin in await self.admin_access.list_admins())
+        return sorted(chat_ids)
+
+    async def check_overdue(self, bot: Bot) -> int:
+        """Sends the overdue instruments to the admins; returns how many were reported."""
+        started_before = (self.clock() - timedelta(hours=self.settings.max_hours)).strftime(
+            "%d.%m.%Y %H:%M:%S"
+        )
+        recipients = None
+        reported = 0
+        while True:
+            items = list(await self.sterilization.claim_overdue(started_before, self.batch_size))
+            if not items:
+                break
+            if recipients is None:
+                recipients = await self._recipients()
+            text = self.format_overdue(items)
+            for chat_id in recipients:
+                try:
+                    await bot.send_message(chat_id, text)
+                except TelegramAPIError as exc:
+                    logger.warning("Failed to send overdue sterilization to %s: %s", chat_id, exc)
+            reported += len(items)
+            if len(items) < self.batch_size:
+                break
+        if reported:
+            metrics.incr("sterilization.overdue", reported)
+            logger.info("Reported %s instruments overdue in sterilization", reported)
+        return reported
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from app.domain.entities import Answer, Pair
+from app.application.use_cases.media_registry import MediaRegistry
+from app.domain.entities import Answer, AnswerItem, Pair, PairDispatch
 from app.domain.repositories import (
     WorkerRepository,
     PairRepository,
@@ -16,11 +17,13 @@ class SurveyFlowService:
         pairs: PairRepository,
         surveys: SurveyRepository,
         answers: AnswerRepository,
+        media: MediaRegistry,
     ):
         self.workers = workers
         self.pairs = pairs
         self.surveys = surveys
         self.answers = answers
+        self.media = media
 
     async def get_ready_pairs_for_today(self, today: str) -> list[Pair]:
         return list(await self.pairs.list_ready_by_date(today))
@@ -34,6 +37,12 @@ class SurveyFlowService:
     async def get_next_ready_pair(self, subject: str) -> Pair | None:
         return await self.pairs.next_ready_for_subject(subject)
 
+    async def claim_dispatch_plan(self, today: str) -> list[PairDispatch]:
+        return list(await self.pairs.claim_first_ready_per_subject(today))
+
+    async def get_next_ready_dispatch(self, subject_id: int) -> PairDispatch | None:
+        return await self.pairs.next_ready_with_workers(subject_id)
+
     async def get_worker(self, full_name: str):
         return await self.workers.get_by_fullname(full_name)
 
@@ -46,26 +55,42 @@ class SurveyFlowService:
     async def get_survey(self, name: str):
         return await self.surveys.get_by_name(name)
 
+    async def get_survey_by_id(self, survey_id: int):
+        return await self.surveys.get_by_id(survey_id)
+
     async def save_answers(self, pair: Pair, survey, answers: list[str]) -> None:
-        now = datetime.now()
-        a1, a2, a3, a4, a5 = answers
+        questions = {question.position: question for question in survey.questions} if survey else {}
+        items = []
+        for question_no, raw in enumerate(answers, start=1):
+            question = questions.get(question_no)
+            question_text = question.text if question else None
+            if question and question.type == "int":
+                try:
+                    items.append(
+                        AnswerItem(
+                            question_no=question_no,
+                            int_score=int(raw),
+                            question_text=question_text,
+                        )
+                    )
+                    continue
+                except (ValueError, TypeError):
+                    pass
+            items.append(
+                AnswerItem(question_no=question_no, text_value=raw, question_text=question_text)
+            )
 
         new_answer = Answer(
+            id=None,
             subject=pair.subject,
             object=pair.object,
+            survey_id=survey.id if survey else None,
             survey=pair.survey,
             survey_date=pair.date,
-            completed_at=str(now),
-            question1=survey.question1,
-            answer1=a1,
-            question2=survey.question2,
-            answer2=a2,
-            question3=survey.question3,
-            answer3=a3,
-            question4=survey.question4,
-            answer4=a4,
-            question5=survey.question5,
-            answer5=a5,
+            completed_at=datetime.now().isoformat(sep=" "),
+            items=items,
+            subject_id=pair.subject_id,
+            object_id=pair.object_id,
         )
 
         await self.answers.save(new_answer)
@@ -1,30 +1,64 @@
-from app.domain.entities import Worker
-from app.domain.repositories import WorkerRepository
+from datetime import datetime, timedelta
+from typing import Callable
+
+from app.domain.entities import ShiftStats, Worker
+from app.domain.repositories import ShiftStatsRepository, WorkerRepository
+from app.logger import setup_logger
+
+
+logger = setup_logger("report", "report.log")
+
+WEEK_DAYS = 7
+MONTH_DAYS = 30
 
 
 class WorkerReportService:
-    def __init__(self, workers: WorkerRepository):
+    def __init__(
+        self,
+        workers: WorkerRepository,
+        stats: ShiftStatsRepository,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
         self.workers = workers
+        self.stats = stats
+        self.clock = clock
+
+    async def roll_up_stats(self) -> int:
+        """Adds the days closed since the last run to shift_stats_daily."""
+        yesterday = (self.clock() - timedelta(days=1)).strftime("%d.%m.%Y")
+        rows = await self.stats.roll_up(yesterday)
+        logger.info("Shift stats rolled up through %s: %s rows", yesterday, rows)
+        return rows
 
     async def build_report_for_chat_id(self, chat_id: int) -> str | None:
         worker = await self.workers.get_by_chat_id(chat_id)
         if not worker:
             return None
-        return self.build_report_for_worker(worker)
+        return await self.build_report_for_worker(worker)
+
+    async def build_report_for_worker(self, worker: Worker) -> str:
+        today = self.clock().date()
+        week, month = await self.stats.get_for_worker(
+            worker.id,
+            week_since=(today - timedelta(days=WEEK_DAYS)).strftime("%d.%m.%Y"),
+            month_since=(today - timedelta(days=MONTH_DAYS)).strftime("%d.%m.%Y"),
+            until=(today - timedelta(days=1)).strftime("%d.%m.%Y"),
+        )
+        return self.format_report(week, month)
 
     @staticmethod
-    def build_report_for_worker(worker: Worker) -> str:
+    def format_report(week: ShiftStats, month: ShiftStats) -> str:
         return (
             "📊 Отчёт по сменам\n"
             "(без учёта сегодняшних смен)\n\n"
-            "🗓 За неделю:\n"
-            f"• Всего смен: {worker.shifts_week}\n"
-            f"• Отдано смен: {worker.given_week}\n"
-            f"• Выходов на замену: {worker.replacement_week}\n"
-            f"• Смен выбрано вручную: {worker.manual_week}\n\n"
-            "📅 За месяц:\n"
-            f"• Всего смен: {worker.shifts_month}\n"
-            f"• Отдано смен: {worker.given_month}\n"
-            f"• Выходов на замену: {worker.replacement_month}\n"
-            f"• Смен выбрано вручную: {worker.manual_month}"
+            f"🗓 За {WEEK_DAYS} дней:\n"
+            f"• Всего смен: {week.shifts}\n"
+            f"• Отдано смен: {week.given}\n"
+            f"• Выходов на замену: {week.replacement}\n"
+            f"• Смен выбрано вручную: {week.manual}\n\n"
+            f"📅 За {MONTH_DAYS} дней:\n"
+            f"• Всего смен: {month.shifts}\n"
+            f"• Отдано смен: {month.given}\n"
+            f"• Выходов на замену: {month.replacement}\n"
+            f"• Смен выбрано вручную: {month.manual}"
         )
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from bisect import bisect_left
+
+from app.catalog import WORKERS, CatalogVersions, catalog_versions
+from app.domain.entities import Worker
+from app.domain.repositories import WorkerRepository
+from app.metrics import metrics
+from app.text_utils import normalize_text
+
+
+def trigrams(value: str) -> set[str]:
+    padded = f"  {value} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class WorkerSearchIndex:
+    """In-memory prefix and trigram index over active workers' names.
+
+    Rebuilt lazily once the workers catalog version moves (every sync and
+    admin edit bumps it) or after ``ttl`` seconds for changes made by other
+    replicas.
+    """
+
+    def __init__(
+        self,
+        workers: WorkerRepository,
+        versions: CatalogVersions = catalog_versions,
+        ttl: float = 60.0,
+    ):
+        self.workers = workers
+        self.versions = versions
+        self.ttl = ttl
+        self._by_id: dict[int, Worker] = {}
+        self._by_name: dict[str, int] = {}
+        self._tokens: list[tuple[str, int]] = []
+        self._trigrams: dict[str, set[int]] = {}
+        self._built_version: int | None = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_version == self.versions.get(WORKERS)
+            and time.monotonic() - self._built_at < self.ttl
+        )
+
+    async def refresh(self) -> None:
+        version = self.versions.get(WORKERS)
+        workers = [w for w in await self.workers.list_all() if w.id is not None and w.full_name]
+        by_id: dict[int, Worker] = {}
+        by_name: dict[str, int] = {}
+        tokens: list[tuple[str, int]] = []
+        grams: dict[str, set[int]] = {}
+        for worker in workers:
+            name = normalize_text(worker.full_name)
+            by_id[worker.id] = worker
+            by_name.setdefault(name, worker.id)
+            tokens.extend((token, worker.id) for token in name.split())
+            for gram in trigrams(name):
+                grams.setdefault(gram, set()).add(worker.id)
+        tokens.sort()
+        self._by_id, self._by_name, self._tokens, self._trigrams = by_id, by_name, tokens, grams
+        self._built_version = version
+        self._built_at = time.monotonic()
+        metrics.incr("worker_search.rebuilds")
+
+    async def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if not self._is_fresh():
+                await self.refresh()
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        ids: set[int] = set()
+        index = bisect_left(self._tokens, (prefix, -1))
+        while index < len(self._tokens) and self._tokens[index][0].startswith(prefix):
+            ids.add(self._tokens[index][1])
+            index += 1
+        return ids
+
+    def _fuzzy_ids(self, query: str) -> list[int]:
+        query_grams = trigrams(query)
+        scores: dict[int, int] = {}
+        for gram in query_grams:
+            for worker_id in self._trigrams.get(gram, ()):
+                scores[worker_id] = scores.get(worker_id, 0) + 1
+        threshold = max(2, len(query_grams) // 2)
+        matched = [worker_id for worker_id, score in scores.items() if score >= threshold]
+        matched.sort(key=lambda worker_id: -scores[worker_id])
+        return matched
+
+    async def search(
+        self, query: str, limit: int = 20, registered: bool | None = None
+    ) -> list[Worker]:
+        """Workers whose name words start with every query word, else a fuzzy match."""
+        await self._ensure_fresh()
+        normalized = normalize_text(query)
+        words = normalized.split()
+        if not words:
+            ranked = sorted(self._by_id, key=lambda worker_id: normalize_text(self._by_id[worker_id].full_name))
+        else:
+            ids = self._prefix_ids(words[0])
+            for word in words[1:]:
+                ids &= self._prefix_ids(word)
+            if ids:
+                ranked = sorted(ids, key=lambda worker_id: normalize_text(self._by_id[worker_id].full_name))
+            else:
+                metrics.incr("worker_search.fuzzy")
+                ranked = self._fuzzy_ids(normalized)
+
+        result: list[Worker] = []
+        for worker_id in ranked:
+            worker = self._by_id[worker_id]
+            if registered is not None and bool(worker.chat_id) != registered:
+                continue
+            result.append(worker)
+            if len(result) >= limit:
+                break
+        return result
+
+    async def find_by_name(self, full_name: str) -> Worker | None:
+        await self._ensure_fresh()
+        worker_id = self._by_name.get(normalize_text(full_name))
+        return self._by_id.get(worker_id) if worker_id is not None else None
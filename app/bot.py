@@ -1,12 +1,18 @@
-﻿import asyncio
+﻿import time
+
+# Taken before the heavy imports below so cold start includes them.
+STARTED_AT = time.perf_counter()
+
+import asyncio
 
 from aiogram import Bot, Dispatcher
 from aiogram.types import BotCommand
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from dotenv import load_dotenv
 
-from app.container import build_container
-from app.infrastructure.db.models import async_main
+from app.container import Container, build_container
+from app.infrastructure.db.engine import get_engine
+from app.infrastructure.db.migrations import run_migrations
 from app.handlers.register_handlers import create_register_router
 from app.handlers.survey_handlers import create_survey_router
 from app.handlers.admin_handlers import create_admin_router
@@ -14,56 +20,135 @@ from app.handlers.shift_handlers import create_shift_router
 from app.handlers.shift_admin_handlers import create_shift_admin_router
 from app.handlers.moves_handlers import create_moves_router
 from app.handlers.instrument_transfer_handlers import create_instrument_transfer_router
+from app.handlers.inventory_handlers import create_inventory_router
 from app.handlers.admin_panel_handlers import create_admin_panel_router
 from app.handlers.report_handlers import create_report_router
+from app.handlers.search_handlers import create_search_router
 from app.logger import setup_logger
+from app.middlewares.admission import AdmissionMiddleware
+from app.middlewares.idempotency import IdempotencyMiddleware
+from app.middlewares.startup import FirstUpdateMiddleware
+from app.middlewares.throttling import ThrottlingMiddleware
+from app.metrics import log_metrics
 
 
-async def main():
-    load_dotenv()
-    container = build_container()
-    settings = container.settings
-
-    logger = setup_logger("bot", "bot.log")
-
-    bot = Bot(token=settings.bot.token)
+def build_dispatcher(container: Container) -> Dispatcher:
     dp = Dispatcher()
-    await bot.set_my_commands(
-        [
-            BotCommand(command="start", description="зарегистрироваться"),
-            BotCommand(command="shift", description="выбрать смену"),
-            BotCommand(command="report", description="посмотреть отчёт"),
-            BotCommand(command="move_instrument", description="перенести инструмент"),
-            BotCommand(command="moves", description="история перемещений"),
-        ]
-    )
-
-    await async_main()
-
+    dp.update.outer_middleware(IdempotencyMiddleware())
+    dp.update.outer_middleware(ThrottlingMiddleware())
+    dp.update.outer_middleware(AdmissionMiddleware())
     dp.include_router(create_admin_router(container.admin_sync))
-    dp.include_router(create_register_router(container.registration))
+    dp.include_router(create_register_router(container.registration, container.worker_search))
     dp.include_router(create_survey_router(container.survey_flow))
-    dp.include_router(create_shift_router(container.shift_service, container.worker_report))
+    dp.include_router(
+        create_shift_router(
+            container.shift_service,
+            container.worker_report,
+            container.worker_search,
+            container.shift_subscriptions,
+        )
+    )
+    dp.include_router(create_search_router(container.worker_search, container.registration))
     dp.include_router(create_report_router(container.worker_report))
     dp.include_router(create_shift_admin_router(container.shift_admin, container.admin_access))
     dp.include_router(create_moves_router(container.instrument_admin))
     dp.include_router(create_instrument_transfer_router(container.instrument_transfer))
+    dp.include_router(create_inventory_router(container.inventory))
     dp.include_router(
         create_admin_panel_router(container.instrument_admin, container.admin_access)
     )
+    return dp
+
+
+async def main():
+    load_dotenv()
+    logger = setup_logger("bot", "bot.log")
+    logger.info("Imports done in %.2fs", time.perf_counter() - STARTED_AT)
+
+    container = build_container()
+    settings = container.settings
+    logger.info("Container built at %.2fs", time.perf_counter() - STARTED_AT)
+
+    bot = Bot(token=settings.bot.token)
+    dp = build_dispatcher(container)
+    dp.update.outer_middleware(FirstUpdateMiddleware(STARTED_AT, logger))
+
+    async def set_commands():
+        try:
+            await bot.set_my_commands(
+                [
+                    BotCommand(command="start", description="зарегистрироваться"),
+                    BotCommand(command="shift", description="выбрать смену"),
+                    BotCommand(command="plan", description="смены на неделю вперёд"),
+                    BotCommand(command="report", description="посмотреть отчёт"),
+                    BotCommand(command="move_instrument", description="перенести инструмент"),
+                    BotCommand(command="moves", description="история перемещений"),
+                    BotCommand(command="inventory", description="где сейчас инструменты"),
+                ]
+            )
+        except Exception:
+            logger.exception("Failed to set bot commands")
+
+    # The loop only keeps weak references to tasks: hold them until they finish.
+    background_tasks: set[asyncio.Task] = set()
+
+    def run_in_background(coro) -> None:
+        task = asyncio.create_task(coro)
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    # Not needed to serve updates, so it runs alongside the migrations.
+    run_in_background(set_commands())
+
+    applied = await run_migrations(get_engine())
+    logger.info(
+        "Schema migrations %s at %.2fs",
+        applied or "up to date",
+        time.perf_counter() - STARTED_AT,
+    )
+
+    async def catch_up_stats():
+        # Days missed while the bot was down; the cron job keeps it current afterwards.
+        try:
+            await container.worker_report.roll_up_stats()
+        except Exception:
+            logger.exception("Failed to roll up shift stats")
+
+    run_in_background(catch_up_stats())
+
+    async def sync_workers():
+        await container.admin_sync.sync_workers()
+        # Warm the search index now rather than on the first morning query.
+        await container.worker_search.refresh()
 
     scheduler = AsyncIOScheduler()
     # scheduler.add_job(container.admin_sync.sync_pairs, "cron", hour=19, minute=50)
-    scheduler.add_job(container.admin_sync.sync_workers, "cron", hour=5, minute=55)
+    scheduler.add_job(sync_workers, "cron", hour=5, minute=55)
     scheduler.add_job(container.admin_sync.sync_shifts, "cron", hour=6, minute=0)
     # scheduler.add_job(container.scheduler.send_surveys, "cron", hour=20, minute=0, args=[bot, dp])
     # scheduler.add_job(container.admin_sync.export_answers, "cron", day_of_week="sun", hour=23, minute=0)
     scheduler.add_job(container.admin_sync.export_shifts, "cron", hour=23, minute=5)
+    scheduler.add_job(container.worker_report.roll_up_stats, "cron", hour=0, minute=10)
+    scheduler.add_job(container.archive.run, "cron", hour=3, minute=30)
+    scheduler.add_job(container.media_registry.prevalidate, "cron", hour=19, minute=30, args=[bot])
+    scheduler.add_job(container.sterilization.check_overdue, "interval", minutes=15, args=[bot])
+    scheduler.add_job(log_metrics, "interval", minutes=5)
+    if container.photo_evidence is not None:
+        scheduler.add_job(
+            container.photo_evidence.run, "interval", minutes=2, args=[bot], max_instances=1
+        )
+    elif container.settings.photos.enabled:
+        logger.warning("PHOTO_PIPELINE is on but Pillow is not installed; photo checks are off")
     # scheduler.add_job(container.reports.send_monthly_reports, "cron", day=1, hour=16, minute=38, args=[bot])
     scheduler.start()
     logger.info("Scheduler started with jobs: %s", scheduler.get_jobs())
 
-    await dp.start_polling(bot)
+    logger.info("Start polling at %.2fs", time.perf_counter() - STARTED_AT)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if container.photo_evidence is not None:
+            container.photo_evidence.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+from collections import defaultdict
+
+
+CABINETS = "cabinets"
+INSTRUMENTS = "instruments"
+WORKERS = "workers"
+
+
+class CatalogVersions:
+    """Process-local counters bumped whenever a reference catalog changes."""
+
+    def __init__(self):
+        self._versions: dict[str, int] = defaultdict(int)
+
+    def bump(self, *names: str) -> None:
+        for name in names:
+            self._versions[name] += 1
+
+    def get(self, name: str) -> int:
+        return self._versions[name]
+
+    def snapshot(self, names: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self._versions[name] for name in names)
+
+
+catalog_versions = CatalogVersions()
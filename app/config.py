@@ -19,6 +19,12 @@ class DbSettings:
     name: str
     user: str
     password: str
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
 
 
 @dataclass
@@ -30,15 +36,59 @@ class SheetsSettings:
     shifts_source_sheet: str
     shift_report_sheet: str
     answers_sheet: str
+    inventory_sheet: str
+    instruments_sheet: str
     main_table: str
 
 
+@dataclass
+class ArchiveSettings:
+    answers_days: int = 400
+    moves_days: int = 365
+    batch_size: int = 5000
+
+
+@dataclass
+class PhotoSettings:
+    enabled: bool = False
+    storage_dir: Path = Path("media/thumbnails")
+    download_workers: int = 3
+    hash_processes: int = 2
+    max_distance: int = 6
+    thumbnail_size: int = 320
+
+
+@dataclass
+class SterilizationSettings:
+    max_hours: float = 6.0
+
+
 @dataclass
 class Settings:
     bot: BotSettings
     db: DbSettings
     sheets: SheetsSettings
     log_dir: Path
+    archive: ArchiveSettings
+    photos: PhotoSettings
+    sterilization: SterilizationSettings
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw else default
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    return float(raw) if raw else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "on"}
 
 
 def load_settings() -> Settings:
@@ -56,6 +106,8 @@ def load_settings() -> Settings:
         shifts_source_sheet=os.getenv("SHIFTS_SOURCE_SHEET_NAME", "Расписание смен"),
         shift_report_sheet=os.getenv("SHIFT_REPORT_SHEET_NAME", "Отчёт по сменам"),
         answers_sheet=os.getenv("ANSWERS_SHEET_NAME", "Ответы"),
+        inventory_sheet=os.getenv("INVENTORY_SHEET_NAME", "Инвентарь"),
+        instruments_sheet=os.getenv("INSTRUMENTS_SHEET_NAME", "Инструменты"),
         main_table=os.getenv("TABLE", ""),
     )
 
@@ -65,6 +117,12 @@ def load_settings() -> Settings:
         name=os.getenv("DB_NAME", ""),
         user=os.getenv("DB_USER", ""),
         password=os.getenv("DB_PASSWORD", ""),
+        pool_size=_env_int("DB_POOL_SIZE", 10),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+        pool_timeout=_env_float("DB_POOL_TIMEOUT", 30.0),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        statement_cache_size=_env_int("DB_STATEMENT_CACHE_SIZE", 100),
     )
 
     bot = BotSettings(
@@ -77,9 +135,31 @@ def load_settings() -> Settings:
         ],
     )
 
+    archive = ArchiveSettings(
+        answers_days=_env_int("ANSWERS_RETENTION_DAYS", 400),
+        moves_days=_env_int("MOVES_RETENTION_DAYS", 365),
+        batch_size=_env_int("ARCHIVE_BATCH_SIZE", 5000),
+    )
+
+    photos = PhotoSettings(
+        enabled=_env_bool("PHOTO_PIPELINE", False),
+        storage_dir=Path(os.getenv("PHOTO_STORAGE_DIR", "") or base_dir / "media" / "thumbnails"),
+        download_workers=_env_int("PHOTO_DOWNLOAD_WORKERS", 3),
+        hash_processes=_env_int("PHOTO_HASH_PROCESSES", 2),
+        max_distance=_env_int("PHOTO_MAX_DISTANCE", 6),
+        thumbnail_size=_env_int("PHOTO_THUMBNAIL_SIZE", 320),
+    )
+
+    sterilization = SterilizationSettings(
+        max_hours=_env_float("STERILIZATION_MAX_HOURS", 6.0),
+    )
+
     return Settings(
         bot=bot,
         db=db,
         sheets=sheets,
         log_dir=log_dir,
+        archive=archive,
+        photos=photos,
+        sterilization=sterilization,
     )
@@ -1,65 +1,96 @@
 from app.config import load_settings
+from app.infrastructure.db.engine import init_engine
 from app.infrastructure.db.repositories import (
     SqlAlchemyAdminRepository,
+    SqlAlchemyArchiveRepository,
     SqlAlchemyWorkerRepository,
     SqlAlchemyPairRepository,
     SqlAlchemySurveyRepository,
+    CachedSurveyRepository,
     SqlAlchemyAnswerRepository,
     SqlAlchemyShiftRepository,
+    SqlAlchemyShiftStatsRepository,
     SqlAlchemyCabinetRepository,
     SqlAlchemyInstrumentRepository,
     SqlAlchemyInstrumentMoveRepository,
+    SqlAlchemyMediaRepository,
+    SqlAlchemyPhotoEvidenceRepository,
+    SqlAlchemySterilizationRepository,
 )
 from app.infrastructure.sheets.gateway import SheetsGateway
+from app.keyboards import build_shift_keyboard
 from app.application.use_cases.admin_access import AdminAccessService
+from app.application.use_cases.archive import ArchiveService
 from app.application.use_cases.registration import RegistrationService
+from app.application.use_cases.media_registry import MediaRegistry
 from app.application.use_cases.survey_flow import SurveyFlowService
 from app.application.use_cases.shift_management import ShiftService
 from app.application.use_cases.shift_admin import ShiftAdminService
+from app.application.use_cases.shift_board import ShiftBoard
+from app.application.use_cases.shift_subscriptions import FreeShiftSubscriptions
 from app.application.use_cases.instrument_transfer import InstrumentTransferService
 from app.application.use_cases.instrument_admin import InstrumentAdminService
+from app.application.use_cases.inventory import InventoryService
+from app.application.use_cases.photo_evidence import PhotoEvidencePipeline, photo_pipeline_available
 from app.application.use_cases.admin_sync import AdminSyncService
 from app.application.use_cases.reports import ReportsService
 from app.application.use_cases.scheduler import SurveyScheduler
+from app.application.use_cases.sterilization import SterilizationMonitor
 from app.application.use_cases.worker_report import WorkerReportService
+from app.application.use_cases.worker_search import WorkerSearchIndex
 
 
 class Container:
-    def __init__(self):
+    def __init__(self, sheets_gateway: SheetsGateway | None = None):
         self.settings = load_settings()
 
         # Infrastructure
+        self.engine = init_engine(self.settings.db)
         self.admin_repo = SqlAlchemyAdminRepository()
         self.worker_repo = SqlAlchemyWorkerRepository()
         self.pair_repo = SqlAlchemyPairRepository()
-        self.survey_repo = SqlAlchemySurveyRepository()
+        self.survey_repo = CachedSurveyRepository(SqlAlchemySurveyRepository())
         self.answer_repo = SqlAlchemyAnswerRepository()
         self.shift_repo = SqlAlchemyShiftRepository()
+        self.shift_stats_repo = SqlAlchemyShiftStatsRepository()
         self.cabinet_repo = SqlAlchemyCabinetRepository()
         self.instrument_repo = SqlAlchemyInstrumentRepository()
         self.instrument_move_repo = SqlAlchemyInstrumentMoveRepository()
+        self.media_repo = SqlAlchemyMediaRepository()
+        self.archive_repo = SqlAlchemyArchiveRepository()
+        self.photo_evidence_repo = SqlAlchemyPhotoEvidenceRepository()
+        self.sterilization_repo = SqlAlchemySterilizationRepository()
 
-        self.sheets_gateway = SheetsGateway(self.settings.sheets)
+        self.sheets_gateway = sheets_gateway or SheetsGateway(self.settings.sheets)
 
         # Application layer
         self.registration = RegistrationService(self.worker_repo, self.sheets_gateway)
+        self.worker_search = WorkerSearchIndex(self.worker_repo)
+        self.media_registry = MediaRegistry(self.media_repo)
         self.survey_flow = SurveyFlowService(
             self.worker_repo,
             self.pair_repo,
             self.survey_repo,
             self.answer_repo,
+            self.media_registry,
         )
-        self.shift_service = ShiftService(self.worker_repo, self.shift_repo)
-        self.shift_admin = ShiftAdminService(self.worker_repo, self.shift_repo)
+        self.shift_board = ShiftBoard(self.shift_repo)
+        self.shift_service = ShiftService(self.worker_repo, self.shift_repo, self.shift_board)
+        self.shift_admin = ShiftAdminService(self.worker_repo, self.shift_repo, self.shift_board)
+        self.shift_subscriptions = FreeShiftSubscriptions(self.shift_service, build_shift_keyboard)
+        self.shift_board.add_listener(self.shift_subscriptions.notify)
+        self.inventory = InventoryService(self.instrument_repo, self.sheets_gateway)
         self.instrument_transfer = InstrumentTransferService(
             self.cabinet_repo,
             self.instrument_repo,
             self.instrument_move_repo,
+            self.inventory,
         )
         self.instrument_admin = InstrumentAdminService(
             self.cabinet_repo,
             self.instrument_repo,
             self.instrument_move_repo,
+            self.sheets_gateway,
         )
         self.admin_access = AdminAccessService(
             self.admin_repo,
@@ -74,7 +105,7 @@ class Container:
             self.answer_repo,
             self.shift_repo,
         )
-        self.worker_report = WorkerReportService(self.worker_repo)
+        self.worker_report = WorkerReportService(self.worker_repo, self.shift_stats_repo)
         self.reports = ReportsService(
             self.worker_repo,
             self.survey_repo,
@@ -82,7 +113,16 @@ class Container:
             self.shift_repo,
         )
         self.scheduler = SurveyScheduler(self.survey_flow)
+        self.archive = ArchiveService(self.archive_repo, self.settings.archive)
+        self.sterilization = SterilizationMonitor(
+            self.sterilization_repo, self.admin_access, self.settings.sterilization
+        )
+        self.photo_evidence = (
+            PhotoEvidencePipeline(self.photo_evidence_repo, self.settings.photos)
+            if self.settings.photos.enabled and photo_pipeline_available()
+            else None
+        )
 
 
-def build_container() -> Container:
-    return Container()
+def build_container(sheets_gateway: SheetsGateway | None = None) -> Container:
+    return Container(sheets_gateway=sheets_gateway)
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+
+DATE_FORMAT = "%d.%m.%Y"
+DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+
+def parse_date(value: str | date | None) -> date | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value.strip(), DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def format_date(value: date | None) -> str | None:
+    if value is None:
+        return None
+    return value.strftime(DATE_FORMAT)
+
+
+def parse_datetime(value: str | datetime | None, fmt: str = DATETIME_FORMAT) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value.strip(), fmt)
+    except ValueError:
+        return None
+
+
+def format_datetime(value: datetime | None, fmt: str = DATETIME_FORMAT) -> str | None:
+    if value is None:
+        return None
+    return value.strftime(fmt)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -10,14 +10,25 @@ class Worker:
     speciality: str | None = None
     phone: str | None = None
     is_active: bool = True
-    shifts_week: int = 0
-    shifts_month: int = 0
-    given_week: int = 0
-    given_month: int = 0
-    replacement_week: int = 0
-    replacement_month: int = 0
-    manual_week: int = 0
-    manual_month: int = 0
+
+
+@dataclass
+class WorkerPage:
+    """One keyset page of workers; cursors are the ids of the edge rows."""
+
+    items: list[Worker] = field(default_factory=list)
+    next_cursor: int | None = None
+    prev_cursor: int | None = None
+
+
+@dataclass
+class ShiftStats:
+    """Shift counters of one worker over a window of closed days."""
+
+    shifts: int = 0
+    given: int = 0
+    replacement: int = 0
+    manual: int = 0
 
 
 @dataclass
@@ -36,22 +47,38 @@ class Pair:
     weekday: str
     date: str
     status: str = "ready"
+    subject_id: int | None = None
+    object_id: int | None = None
+
+
+@dataclass
+class PairDispatch:
+    pair: Pair
+    subject_chat_id: str | None
+    object_file_id: str | None
+    survey_id: int | None = None
+
+
+@dataclass
+class SurveyQuestion:
+    position: int
+    text: str
+    type: str
 
 
 @dataclass
 class Survey:
     id: int | None
     speciality: str
-    question1: str
-    question1_type: str
-    question2: str
-    question2_type: str
-    question3: str
-    question3_type: str
-    question4: str
-    question4_type: str
-    question5: str
-    question5_type: str
+    questions: list[SurveyQuestion] = field(default_factory=list)
+
+
+@dataclass
+class AnswerItem:
+    question_no: int
+    int_score: int | None = None
+    text_value: str | None = None
+    question_text: str | None = None
 
 
 @dataclass
@@ -59,19 +86,26 @@ class Answer:
     id: int | None
     subject: str
     object: str
+    survey_id: int | None
     survey: str
     survey_date: str
     completed_at: str
-    question1: str
-    answer1: str
-    question2: str
-    answer2: str
-    question3: str
-    answer3: str
-    question4: str
-    answer4: str
-    question5: str
-    answer5: str
+    items: list[AnswerItem] = field(default_factory=list)
+    subject_id: int | None = None
+    object_id: int | None = None
+
+
+@dataclass
+class ScoreSummary:
+    object: str
+    survey_id: int | None
+    question_no: int
+    month_avg: float | None
+    month_count: int
+    half_year_avg: float | None
+    half_year_count: int
+    all_time_avg: float | None
+    all_time_count: int
 
 
 @dataclass
@@ -86,6 +120,8 @@ class Shift:
     cabinet: str | None = None
     assistant_name: str | None = None
     manual: bool = False
+    doctor_id: int | None = None
+    scheduled_assistant_id: int | None = None
 
 
 @dataclass
@@ -103,6 +139,31 @@ class Instrument:
     is_active: bool = True
 
 
+@dataclass
+class InstrumentImport:
+    """Changes that bring cabinets and instruments in line with the instruments sheet."""
+
+    new_cabinets: list[str] = field(default_factory=list)
+    restored_cabinets: list[Cabinet] = field(default_factory=list)
+    # (cabinet name, instrument name)
+    created: list[tuple[str, str]] = field(default_factory=list)
+    renamed: list[tuple[Instrument, str]] = field(default_factory=list)
+    restored: list[Instrument] = field(default_factory=list)
+    archived: list[Instrument] = field(default_factory=list)
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def changes(self) -> int:
+        return (
+            len(self.new_cabinets)
+            + len(self.restored_cabinets)
+            + len(self.created)
+            + len(self.renamed)
+            + len(self.restored)
+            + len(self.archived)
+        )
+
+
 @dataclass
 class InstrumentMove:
     id: int | None
@@ -113,3 +174,42 @@ class InstrumentMove:
     after_photo_id: str | None
     moved_by_chat_id: str | None
     moved_at: str
+
+
+@dataclass
+class InventoryItem:
+    instrument_id: int
+    instrument_name: str
+    cabinet_id: int | None
+    cabinet_name: str | None
+    last_moved_at: str | None = None
+    moved_by: str | None = None
+
+
+@dataclass
+class PhotoEvidence:
+    move_id: int
+    kind: str
+    file_id: str
+    file_unique_id: str | None = None
+    phash: int | None = None
+    thumbnail_path: str | None = None
+    duplicate_of_move_id: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class OverdueSterilization:
+    cycle_id: int
+    instrument_id: int
+    instrument_name: str
+    origin_cabinet_name: str | None
+    started_at: str
+
+
+@dataclass
+class MediaFile:
+    file_id: str
+    is_valid: bool
+    checked_at: str | None = None
+    error: str | None = None
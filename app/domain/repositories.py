@@ -1,15 +1,24 @@
-from typing import Protocol, Sequence
+from typing import Callable, Protocol, Sequence
 
 from app.domain.entities import (
     AdminUser,
     Worker,
+    WorkerPage,
     Pair,
+    PairDispatch,
     Survey,
     Answer,
     Shift,
     Cabinet,
     Instrument,
+    InstrumentImport,
     InstrumentMove,
+    InventoryItem,
+    MediaFile,
+    OverdueSterilization,
+    PhotoEvidence,
+    ScoreSummary,
+    ShiftStats,
 )
 
 
@@ -33,6 +42,17 @@ class WorkerRepository(Protocol):
     ) -> Worker | None: ...
     async def list_all(self, include_inactive: bool = False) -> Sequence[Worker]: ...
     async def list_unregistered(self) -> Sequence[Worker]: ...
+    async def list_page(
+        self,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+        limit: int = 10,
+        active: bool | None = True,
+        speciality: str | None = None,
+        registered: bool | None = None,
+        exclude_chat_ids: Sequence[str] = (),
+    ) -> WorkerPage: ...
     async def add(self, worker: Worker) -> None: ...
     async def set_chat_id(self, worker_id: int, chat_id: str) -> bool: ...
     async def clear_chat_id(self, worker_id: int) -> bool: ...
@@ -46,26 +66,22 @@ class WorkerRepository(Protocol):
         chat_id: str | None,
         speciality: str | None,
         phone: str | None,
-        shifts_week: int,
-        shifts_month: int,
-        given_week: int,
-        given_month: int,
-        replacement_week: int,
-        replacement_month: int,
-        manual_week: int,
-        manual_month: int,
         is_active: bool = True,
     ) -> bool: ...
 
 
 class SurveyRepository(Protocol):
     async def get_by_name(self, name: str) -> Survey | None: ...
+    async def get_by_id(self, survey_id: int) -> Survey | None: ...
     async def clear_all(self) -> None: ...
     async def add(self, survey: Survey) -> None: ...
+    async def replace_all(self, surveys: list[Survey]) -> None: ...
 
 
 class PairRepository(Protocol):
     async def list_ready_by_date(self, date: str) -> Sequence[Pair]: ...
+    async def claim_first_ready_per_subject(self, date: str) -> list[PairDispatch]: ...
+    async def next_ready_with_workers(self, subject_id: int) -> PairDispatch | None: ...
     async def next_ready_for_subject(self, subject: str) -> Pair | None: ...
     async def update_status(self, pair_id: int, status: str) -> None: ...
     async def reset_incomplete(self) -> None: ...
@@ -76,22 +92,44 @@ class PairRepository(Protocol):
 class AnswerRepository(Protocol):
     async def save(self, answer: Answer) -> None: ...
     async def list_all(self) -> Sequence[Answer]: ...
+    async def summarize_scores(
+        self, month_since: str, half_year_since: str
+    ) -> Sequence[ScoreSummary]: ...
+    async def list_open_answers(self, since: str) -> list[tuple[str, int | None, int, str]]: ...
 
 
 class ShiftRepository(Protocol):
     async def clear_all(self) -> None: ...
     async def bulk_insert(
-        self, records: list[tuple[str, str, str, str | None, str | None, str | None]]
+        self,
+        records: list[
+            tuple[str, str, str, str | None, str | None, str | None, int | None, int | None]
+        ],
     ) -> None: ...
     async def list_free(self, date: str, shift_type: str) -> list[tuple[int, str]]: ...
     async def get_by_id(self, shift_id: int) -> Shift | None: ...
     async def get_for_assistant(self, assistant_id: int, date: str, shift_type: str) -> Shift | None: ...
-    async def remove_assistant(self, assistant_id: int, date: str, shift_type: str) -> None: ...
+    async def remove_assistant(self, assistant_id: int, date: str, shift_type: str) -> int: ...
     async def add_by_id(self, assistant_id: int, assistant_name: str, shift_id: int) -> bool: ...
-    async def add_manual(self, assistant_id: int, assistant_name: str, doctor_name: str, shift_type: str, date: str) -> bool: ...
-    async def add_slot(self, doctor_name: str, date: str, shift_type: str) -> bool: ...
+    async def add_manual(
+        self,
+        assistant_id: int,
+        assistant_name: str,
+        doctor_name: str,
+        shift_type: str,
+        date: str,
+        doctor_id: int | None = None,
+    ) -> int | None: ...
+    async def add_slot(
+        self, doctor_name: str, date: str, shift_type: str, doctor_id: int | None = None
+    ) -> int | None: ...
+    async def add_slots(
+        self, records: list[tuple[str, str, str, int | None]]
+    ) -> list[tuple[int, str, str]]: ...
     async def delete_by_id(self, shift_id: int) -> bool: ...
     async def list_by_date(self, date: str) -> Sequence[Shift]: ...
+    async def get_day_version(self, date: str) -> int: ...
+    async def list_day(self, date: str) -> tuple[int, list[Shift]]: ...
     async def list_all(self) -> Sequence[Shift]: ...
 
 
@@ -106,6 +144,7 @@ class CabinetRepository(Protocol):
 
 
 class InstrumentRepository(Protocol):
+    async def list_all(self, include_archived: bool = False) -> Sequence[Instrument]: ...
     async def list_by_cabinet(
         self, cabinet_id: int, include_archived: bool = False
     ) -> Sequence[Instrument]: ...
@@ -115,6 +154,16 @@ class InstrumentRepository(Protocol):
     async def update_name(self, instrument_id: int, name: str) -> bool: ...
     async def set_active(self, instrument_id: int, is_active: bool) -> bool: ...
     async def delete(self, instrument_id: int) -> bool: ...
+    async def list_inventory(self) -> Sequence[InventoryItem]: ...
+    async def apply_import(self, plan: InstrumentImport) -> None: ...
+    async def transfer(
+        self,
+        move: InstrumentMove,
+        check: Callable[
+            [Instrument, Cabinet | None, InstrumentMove | None, Cabinet | None], str | None
+        ],
+        sterilization_cabinet_name: str,
+    ) -> str | None: ...
 
 
 class InstrumentMoveRepository(Protocol):
@@ -122,3 +171,35 @@ class InstrumentMoveRepository(Protocol):
     async def list_recent(self, limit: int = 20) -> Sequence[InstrumentMove]: ...
     async def get_last_for_instrument(self, instrument_id: int) -> InstrumentMove | None: ...
     async def get_by_id(self, move_id: int) -> InstrumentMove | None: ...
+
+
+class ArchiveRepository(Protocol):
+    async def archive_answers(self, before: str, limit: int) -> int: ...
+    async def archive_moves(self, before: str, limit: int) -> int: ...
+
+
+class ShiftStatsRepository(Protocol):
+    async def roll_up(self, until: str) -> int: ...
+    async def get_for_worker(
+        self, worker_id: int, week_since: str, month_since: str, until: str
+    ) -> tuple[ShiftStats, ShiftStats]: ...
+
+
+class SterilizationRepository(Protocol):
+    async def claim_overdue(
+        self, started_before: str, limit: int = 100
+    ) -> Sequence[OverdueSterilization]: ...
+
+
+class PhotoEvidenceRepository(Protocol):
+    async def list_pending_moves(self, limit: int = 100) -> Sequence[InstrumentMove]: ...
+    async def find_duplicate(
+        self, move_id: int, file_unique_id: str | None, phash: int | None, max_distance: int
+    ) -> int | None: ...
+    async def save(self, evidence: PhotoEvidence) -> None: ...
+
+
+class MediaRepository(Protocol):
+    async def list_all(self) -> Sequence[MediaFile]: ...
+    async def mark(self, file_id: str, is_valid: bool, error: str | None = None) -> None: ...
+    async def list_unchecked_worker_file_ids(self, recheck_days: int) -> list[str]: ...
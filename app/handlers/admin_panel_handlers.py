@@ -7,13 +7,14 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.application.use_cases.admin_access import AdminAccessService
 from app.application.use_cases.instrument_admin import InstrumentAdminService
-from app.domain.entities import Cabinet, Instrument, Worker
+from app.domain.entities import Cabinet, Instrument, InstrumentImport, WorkerPage
+from app.keyboards import pack_cursor, unpack_cursor
 from app.logger import setup_logger
-from app.text_utils import normalize_text
 
 
 logger = setup_logger("admin_panel", "admin_panel.log")
 PER_PAGE = 10
+IMPORT_EXAMPLES = 10
 
 
 class InstrumentAdminState(StatesGroup):
@@ -35,10 +36,21 @@ def create_admin_panel_router(
         builder.button(text="🗓 Смены", callback_data="admin_shifts")
         builder.button(text="🏢 Кабинеты", callback_data="admin_cabinets")
         builder.button(text="🧰 Инструменты", callback_data="admin_instruments")
+        builder.button(text="📥 Импорт из таблицы", callback_data="admin_import")
         builder.button(text="👮 Админы", callback_data="admin_users")
         builder.adjust(1)
         return builder.as_markup()
 
+    def build_import_keyboard(plan: InstrumentImport | None):
+        builder = InlineKeyboardBuilder()
+        if plan is not None and plan.changes:
+            digest = admin_service.import_digest(plan)
+            builder.button(text="✅ Применить", callback_data=f"admin_import_apply:{digest}")
+        builder.button(text="🔄 Проверить ещё раз", callback_data="admin_import")
+        builder.button(text="⬅️ Назад", callback_data="admin_back")
+        builder.adjust(1)
+        return builder.as_markup()
+
     def build_cabinet_list_keyboard(cabinets: list[Cabinet], view: str):
         builder = InlineKeyboardBuilder()
         for cabinet in cabinets:
@@ -187,13 +199,9 @@ def create_admin_panel_router(
         builder.adjust(1)
         return builder.as_markup()
 
-    def build_admin_add_workers_keyboard(workers: list[Worker], page: int):
-        total = len(workers)
-        start = page * PER_PAGE
-        end = min(start + PER_PAGE, total)
-
+    def build_admin_add_workers_keyboard(page: WorkerPage):
         builder = InlineKeyboardBuilder()
-        for worker in workers[start:end]:
+        for worker in page.items:
             label = f"{worker.full_name} ({worker.chat_id})"
             builder.button(
                 text=label[:64],
@@ -201,10 +209,16 @@ def create_admin_panel_router(
             )
 
         nav = InlineKeyboardBuilder()
-        if start > 0:
-            nav.button(text="Назад", callback_data=f"admin_user_add_page:{page - 1}")
-        if end < total:
-            nav.button(text="Вперёд", callback_data=f"admin_user_add_page:{page + 1}")
+        if page.prev_cursor is not None:
+            nav.button(
+                text="Назад",
+                callback_data=f"admin_user_add_page:{pack_cursor(before=page.prev_cursor)}",
+            )
+        if page.next_cursor is not None:
+            nav.button(
+                text="Вперёд",
+                callback_data=f"admin_user_add_page:{pack_cursor(after=page.next_cursor)}",
+            )
         if nav.buttons:
             builder.row(*nav.buttons)
 
@@ -268,6 +282,31 @@ def create_admin_panel_router(
             ),
         )
 
+    def format_import(plan: InstrumentImport) -> str:
+        sections = [
+            ("🏢 Новые кабинеты", plan.new_cabinets),
+            ("♻️ Кабинеты из архива", [cabinet.name for cabinet in plan.restored_cabinets]),
+            ("➕ Новые инструменты", [f"{name} ({cabinet})" for cabinet, name in plan.created]),
+            (
+                "✏️ Переименование",
+                [f"{instrument.name} → {name}" for instrument, name in plan.renamed],
+            ),
+            ("♻️ Инструменты из архива", [instrument.name for instrument in plan.restored]),
+            ("🗄️ В архив", [instrument.name for instrument in plan.archived]),
+            ("⚠️ Пропущено", plan.problems),
+        ]
+        lines = []
+        for title, items in sections:
+            if not items:
+                continue
+            lines.append(f"{title}: {len(items)}")
+            lines.extend(f"• {item}" for item in items[:IMPORT_EXAMPLES])
+            if len(items) > IMPORT_EXAMPLES:
+                lines.append(f"… и ещё {len(items) - IMPORT_EXAMPLES}")
+        if not plan.changes:
+            lines.append("✅ Справочник совпадает с таблицей.")
+        return "\n".join(lines)
+
     async def format_admin_entry(chat_id: str) -> str:
         name = await admin_access.resolve_worker_name(chat_id)
         if name:
@@ -298,23 +337,19 @@ def create_admin_panel_router(
         else:
             await target.answer(text, reply_markup=build_admins_menu())
 
-    async def render_admin_add_workers(callback: CallbackQuery, page: int):
-        workers = await admin_access.list_registered_workers()
-        admin_ids = {admin.chat_id for admin in await admin_access.list_admins()}
-        admin_ids.update(admin_access.list_super_admins())
-        available = [worker for worker in workers if worker.chat_id not in admin_ids]
-        available.sort(key=lambda w: normalize_text(w.full_name))
-        if not available:
+    async def render_admin_add_workers(callback: CallbackQuery, cursor: str = ""):
+        page = await admin_access.list_admin_candidates_page(
+            limit=PER_PAGE, **unpack_cursor(cursor)
+        )
+        if not page.items:
             await callback.message.edit_text(
                 "ℹ️ Нет доступных сотрудников для добавления.",
                 reply_markup=build_admin_add_menu(),
             )
             return
-        max_page = (len(available) - 1) // PER_PAGE
-        page = max(0, min(page, max_page))
         await callback.message.edit_text(
             "👤 Выберите сотрудника для добавления в админы:",
-            reply_markup=build_admin_add_workers_keyboard(available, page),
+            reply_markup=build_admin_add_workers_keyboard(page),
         )
 
 
@@ -368,15 +403,15 @@ def create_admin_panel_router(
     async def admin_user_add_choose(callback: CallbackQuery):
         if not await require_admin(callback):
             return
-        await render_admin_add_workers(callback, page=0)
+        await render_admin_add_workers(callback)
         await callback.answer()
 
     @router.callback_query(F.data.startswith("admin_user_add_page:"))
     async def admin_user_add_page(callback: CallbackQuery):
         if not await require_admin(callback):
             return
-        _, page_str = callback.data.split(":")
-        await render_admin_add_workers(callback, page=int(page_str))
+        _, cursor = callback.data.split(":")
+        await render_admin_add_workers(callback, cursor)
         await callback.answer()
 
     @router.callback_query(F.data.startswith("admin_user_add_select:"))
@@ -592,6 +627,53 @@ def create_admin_panel_router(
                 "⛔ Нельзя удалить кабинет с инструментами", show_alert=True
             )
 
+    @router.callback_query(F.data == "admin_import")
+    async def admin_import(callback: CallbackQuery, state: FSMContext):
+        if not await require_admin(callback):
+            return
+        await state.clear()
+        await callback.answer("⏳ Читаю таблицу…")
+        try:
+            plan = await admin_service.plan_import()
+        except Exception:
+            logger.exception("Failed to read the instruments sheet")
+            await callback.message.edit_text(
+                "⚠️ Не удалось прочитать лист с инструментами.",
+                reply_markup=build_import_keyboard(None),
+            )
+            return
+        await callback.message.edit_text(
+            "📥 Импорт из таблицы (проверка, ничего не изменено):\n" + format_import(plan),
+            reply_markup=build_import_keyboard(plan),
+        )
+
+    @router.callback_query(F.data.startswith("admin_import_apply:"))
+    async def admin_import_apply(callback: CallbackQuery):
+        if not await require_admin(callback):
+            return
+        _, digest = callback.data.split(":", 1)
+        await callback.answer("⏳ Импортирую…")
+        try:
+            plan, applied = await admin_service.apply_import(digest)
+        except Exception:
+            logger.exception("Instrument import failed")
+            await callback.message.edit_text(
+                "⚠️ Импорт не выполнен, справочник не изменён.",
+                reply_markup=build_import_keyboard(None),
+            )
+            return
+        if applied:
+            logger.info("Instrument import applied by %s", callback.from_user.id)
+            await callback.message.edit_text(
+                "✅ Импорт выполнен:\n" + format_import(plan),
+                reply_markup=build_import_keyboard(None),
+            )
+            return
+        await callback.message.edit_text(
+            "⚠️ Таблица или справочник изменились, проверьте заново:\n" + format_import(plan),
+            reply_markup=build_import_keyboard(plan),
+        )
+
     @router.callback_query(F.data == "admin_instruments")
     async def admin_instruments(callback: CallbackQuery, state: FSMContext):
         if not await require_admin(callback):
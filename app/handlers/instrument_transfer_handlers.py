@@ -26,14 +26,14 @@ def create_instrument_transfer_router(
     @router.message(Command("move_instrument"))
     async def start_transfer(message: Message, state: FSMContext):
         await state.clear()
-        cabinets = await transfer_service.list_cabinets()
-        if not cabinets:
+        markup = await kb.cached_cabinet_keyboard(transfer_service.list_cabinets, prefix="src_cabinet")
+        if not markup.inline_keyboard:
             await message.answer("Список кабинетов пуст. Обратитесь к администратору.")
             return
 
         await message.answer(
             "Выберите кабинет, в котором сейчас находится инструмент:",
-            reply_markup=kb.build_cabinet_keyboard(cabinets, prefix="src_cabinet"),
+            reply_markup=markup,
         )
 
     @router.callback_query(F.data.startswith("src_cabinet:"))
@@ -48,12 +48,15 @@ def create_instrument_transfer_router(
             await callback.answer("Кабинет не найден", show_alert=True)
             return
 
-        instruments = await transfer_service.list_instruments(cabinet_id)
-        if not instruments:
-            cabinets = await transfer_service.list_cabinets()
+        instruments_markup = await kb.cached_instrument_keyboard(
+            cabinet_id, lambda: transfer_service.list_instruments(cabinet_id)
+        )
+        if not instruments_markup.inline_keyboard:
             await callback.message.edit_text(
                 f"В кабинете «{cabinet.name}» нет инструментов. Выберите другой кабинет:",
-                reply_markup=kb.build_cabinet_keyboard(cabinets, prefix="src_cabinet"),
+                reply_markup=await kb.cached_cabinet_keyboard(
+                    transfer_service.list_cabinets, prefix="src_cabinet"
+                ),
             )
             await callback.answer()
             return
@@ -64,7 +67,7 @@ def create_instrument_transfer_router(
         )
         await callback.message.edit_text(
             f"Кабинет: {cabinet.name}\nВыберите инструмент:",
-            reply_markup=kb.build_instrument_keyboard(instruments),
+            reply_markup=instruments_markup,
         )
         await callback.answer()
 
@@ -252,7 +255,7 @@ def create_instrument_transfer_router(
             await message.answer("Сессия переноса сброшена. Начните заново: /move_instrument")
             return
 
-        success = await transfer_service.transfer_instrument(
+        result = await transfer_service.transfer_instrument(
             instrument_id=instrument_id,
             from_cabinet_id=source_cabinet_id,
             to_cabinet_id=dest_cabinet_id,
@@ -261,7 +264,7 @@ def create_instrument_transfer_router(
             moved_by_chat_id=str(message.from_user.id),
         )
 
-        if success:
+        if result.ok:
             instrument_name = data.get("instrument_name", "Инструмент")
             source_name = data.get("source_cabinet_name", "")
             dest_name = data.get("dest_cabinet_name", "")
@@ -277,13 +280,14 @@ def create_instrument_transfer_router(
                 message.from_user.id,
             )
         else:
-            await message.answer("Не удалось сохранить перенос. Проверьте данные и повторите.")
+            await message.answer(f"Не удалось сохранить перенос: {result.message}.")
             logger.warning(
-                "Failed to move instrument %s from %s to %s by chat_id=%s",
+                "Failed to move instrument %s from %s to %s by chat_id=%s: %s",
                 instrument_id,
                 source_cabinet_id,
                 dest_cabinet_id,
                 message.from_user.id,
+                result.reason,
             )
 
         await state.clear()
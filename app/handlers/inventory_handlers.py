@@ -0,0 +1,61 @@
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from app.application.use_cases.inventory import InventoryService
+from app.logger import setup_logger
+
+
+logger = setup_logger("inventory", "inventory.log")
+
+MESSAGE_LIMIT = 4000
+
+
+def create_inventory_router(inventory: InventoryService) -> Router:
+    router = Router()
+
+    def format_inventory(cabinets) -> list[str]:
+        blocks = []
+        for cabinet_name, items in cabinets:
+            lines = [f"🗄 {cabinet_name} ({len(items)})"]
+            for item in items:
+                line = f"• {item.instrument_name}"
+                if item.last_moved_at:
+                    line += f" — 🕒 {item.last_moved_at}"
+                    if item.moved_by:
+                        line += f", {item.moved_by}"
+                lines.append(line)
+            blocks.append("\n".join(lines))
+
+        messages: list[str] = []
+        current = "📦 Где сейчас инструменты:"
+        for block in blocks:
+            if len(current) + len(block) + 2 > MESSAGE_LIMIT:
+                messages.append(current)
+                current = block
+            else:
+                current += "\n\n" + block
+        messages.append(current)
+        return messages
+
+    @router.message(Command("inventory"))
+    async def show_inventory(message: Message):
+        cabinets = await inventory.by_cabinet()
+        if not cabinets:
+            await message.answer("📦 Инструментов пока нет.")
+            return
+        for text in format_inventory(cabinets):
+            await message.answer(text)
+
+    @router.message(Command("exp_inventory"))
+    async def export_inventory(message: Message):
+        msg = await message.answer("Готовим выгрузку инвентаря...")
+        try:
+            count = await inventory.export()
+        except Exception:
+            logger.exception("Failed to export inventory")
+            await msg.edit_text("Не удалось выгрузить инвентарь")
+            return
+        await msg.edit_text(f"Инвентарь выгружен в Google Sheets: {count} инструментов")
+
+    return router
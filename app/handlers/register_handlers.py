@@ -1,10 +1,12 @@
 ﻿from aiogram import F, Router
+from aiogram.dispatcher.event.bases import SkipHandler
 from aiogram.filters import CommandStart, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import Message, CallbackQuery
 
 from app.application.use_cases.registration import RegistrationService
+from app.application.use_cases.worker_search import WorkerSearchIndex
 import app.keyboards as kb
 from app.logger import setup_logger
 
@@ -15,7 +17,9 @@ class RegistrationState(StatesGroup):
     waiting_photo = State()
 
 
-def create_register_router(registration: RegistrationService) -> Router:
+def create_register_router(
+    registration: RegistrationService, search: WorkerSearchIndex | None = None
+) -> Router:
     router = Router()
 
     @router.message(CommandStart())
@@ -43,6 +47,30 @@ def create_register_router(registration: RegistrationService) -> Router:
         )
         await callback.answer()
 
+    @router.message(F.via_bot, F.text)
+    async def register_from_search(message: Message):
+        # Registered users search for doctors; their picks belong to the shift router.
+        if (
+            search is None
+            or message.via_bot.id != message.bot.id
+            or await registration.get_by_chat_id(message.from_user.id, include_inactive=True)
+        ):
+            raise SkipHandler()
+
+        worker = await search.find_by_name(message.text)
+        if not worker or worker.chat_id:
+            await message.answer(
+                "Не нашли такого незарегистрированного сотрудника. Выбери себя в списке:",
+                reply_markup=await kb.build_worker_keyboard(registration),
+            )
+            return
+
+        logger.info("User (id=%s) found %s via search", message.from_user.id, worker.full_name)
+        await message.answer(
+            f"Это ты: {worker.full_name}?",
+            reply_markup=kb.build_confirm_keyboard(worker.id),
+        )
+
     @router.callback_query(F.data.startswith("confirm_yes:"))
     async def confirm_register(callback: CallbackQuery, state: FSMContext):
         worker_id = int(callback.data.split(":", 1)[1])
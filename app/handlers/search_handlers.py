@@ -0,0 +1,38 @@
+from aiogram import Router
+from aiogram.types import InlineQuery, InlineQueryResultArticle, InputTextMessageContent
+
+from app.application.use_cases.registration import RegistrationService
+from app.application.use_cases.worker_search import WorkerSearchIndex
+from app.logger import setup_logger
+
+
+logger = setup_logger("search", "search.log")
+RESULTS_LIMIT = 20
+
+
+def create_search_router(search: WorkerSearchIndex, registration: RegistrationService) -> Router:
+    router = Router()
+
+    @router.inline_query()
+    async def search_workers(query: InlineQuery):
+        # Registered staff look for doctors; everyone else looks for themselves.
+        me = await registration.get_by_chat_id(query.from_user.id)
+        workers = await search.search(
+            query.query,
+            limit=RESULTS_LIMIT,
+            registered=None if me else False,
+        )
+        results = [
+            InlineQueryResultArticle(
+                id=str(worker.id),
+                title=worker.full_name,
+                description=worker.speciality or None,
+                # The chosen name comes back as a message "via" the bot and is
+                # resolved by the shift or registration router.
+                input_message_content=InputTextMessageContent(message_text=worker.full_name),
+            )
+            for worker in workers
+        ]
+        await query.answer(results, cache_time=30, is_personal=True)
+
+    return router
@@ -3,8 +3,9 @@ from aiogram.types import CallbackQuery, Message
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.application.use_cases.admin_access import AdminAccessService
-from app.application.use_cases.shift_admin import ShiftAdminService
-from app.domain.entities import Shift, Worker
+from app.application.use_cases.shift_admin import SLOT_TEMPLATES, ShiftAdminService
+from app.domain.entities import Shift, WorkerPage
+from app.keyboards import pack_cursor, unpack_cursor
 from app.logger import setup_logger
 
 
@@ -53,32 +54,31 @@ def create_shift_admin_router(
         builder = InlineKeyboardBuilder()
         builder.button(text="Утренняя", callback_data="admin_shift_create_type:morning")
         builder.button(text="Вечерняя", callback_data="admin_shift_create_type:evening")
+        builder.button(text="Утренние на неделю", callback_data="admin_shift_create_type:week-morning")
+        builder.button(text="Вечерние на неделю", callback_data="admin_shift_create_type:week-evening")
+        builder.button(text="Обе смены на неделю", callback_data="admin_shift_create_type:week-both")
         builder.button(text="Назад", callback_data="admin_shift_refresh")
         builder.adjust(1)
         return builder.as_markup()
 
-    def build_doctors_keyboard(workers: list[Worker], shift_type: str, page: int):
-        total = len(workers)
-        start = page * PER_PAGE
-        end = min(start + PER_PAGE, total)
-
+    def build_doctors_keyboard(page: WorkerPage, shift_type: str):
         builder = InlineKeyboardBuilder()
-        for w in workers[start:end]:
+        for w in page.items:
             builder.button(
                 text=w.full_name[:64],
                 callback_data=f"admin_shift_create_doctor:{shift_type}:{w.id}",
             )
 
         nav = InlineKeyboardBuilder()
-        if start > 0:
+        if page.prev_cursor is not None:
             nav.button(
                 text="Назад",
-                callback_data=f"admin_shift_doctors:{shift_type}:{page - 1}",
+                callback_data=f"admin_shift_doctors:{shift_type}:{pack_cursor(before=page.prev_cursor)}",
             )
-        if end < total:
+        if page.next_cursor is not None:
             nav.button(
                 text="Вперёд",
-                callback_data=f"admin_shift_doctors:{shift_type}:{page + 1}",
+                callback_data=f"admin_shift_doctors:{shift_type}:{pack_cursor(after=page.next_cursor)}",
             )
         if nav.buttons:
             builder.row(*nav.buttons)
@@ -147,17 +147,16 @@ def create_shift_admin_router(
         if not await require_admin(callback):
             return
         _, shift_type = callback.data.split(":", 1)
-        workers = await shift_admin.list_workers()
-        if not workers:
+        page = await shift_admin.list_workers_page(limit=PER_PAGE)
+        if not page.items:
             await callback.message.edit_text(
                 "⚠️ Список сотрудников пуст.", reply_markup=build_create_type_keyboard()
             )
             await callback.answer()
             return
-        workers.sort(key=lambda w: w.full_name)
         await callback.message.edit_text(
             "👩‍⚕️ Выберите доктора:",
-            reply_markup=build_doctors_keyboard(workers, shift_type, page=0),
+            reply_markup=build_doctors_keyboard(page, shift_type),
         )
         await callback.answer()
 
@@ -165,13 +164,10 @@ def create_shift_admin_router(
     async def shift_doctors_page(callback: CallbackQuery):
         if not await require_admin(callback):
             return
-        _, shift_type, page_str = callback.data.split(":")
-        workers = await shift_admin.list_workers()
-        workers.sort(key=lambda w: w.full_name)
+        _, shift_type, cursor = callback.data.split(":")
+        page = await shift_admin.list_workers_page(limit=PER_PAGE, **unpack_cursor(cursor))
         await callback.message.edit_reply_markup(
-            reply_markup=build_doctors_keyboard(
-                workers, shift_type, page=int(page_str)
-            )
+            reply_markup=build_doctors_keyboard(page, shift_type)
         )
         await callback.answer()
 
@@ -184,7 +180,17 @@ def create_shift_admin_router(
         if not doctor:
             await callback.answer("Доктор не найден", show_alert=True)
             return
-        success = await shift_admin.create_shift_today(doctor.full_name, shift_type)
+        if shift_type in SLOT_TEMPLATES:
+            created, requested = await shift_admin.create_slots_from_template(
+                doctor.full_name, shift_type, doctor.id
+            )
+            text = f"✅ Создано смен: {created}"
+            if created < requested:
+                text += f", уже существовало: {requested - created}"
+            await callback.answer(text, show_alert=created < requested)
+            await render_shifts(callback)
+            return
+        success = await shift_admin.create_shift_today(doctor.full_name, shift_type, doctor.id)
         if success:
             await callback.answer("✅ Смена создана")
         else:
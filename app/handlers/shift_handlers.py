@@ -5,12 +5,21 @@ from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery
 
 from app.application.use_cases.shift_management import ShiftService
+from app.application.use_cases.shift_subscriptions import (
+    FREE_SHIFTS_TEXT,
+    NO_FREE_SHIFTS_TEXT,
+    FreeShiftSubscriptions,
+)
 from app.application.use_cases.worker_report import WorkerReportService
+from app.application.use_cases.worker_search import WorkerSearchIndex
 from app.keyboards import (
     build_shift_keyboard,
-    build_all_doctors_keyboard,
+    cached_all_doctors_keyboard,
     build_cancel_shift_keyboard,
     build_manual_shift_confirm_keyboard,
+    build_plan_day_keyboard,
+    build_plan_days_keyboard,
+    build_plan_shifts_keyboard,
     DoctorsPage,
     ManualShiftConfirm,
     SelectDoctor,
@@ -27,9 +36,15 @@ DOCTOR_NOT_FOUND_MSG = "Доктор не найден"
 def create_shift_router(
     shift_service: ShiftService,
     report_service: WorkerReportService | None = None,
+    search: WorkerSearchIndex | None = None,
+    subscriptions: FreeShiftSubscriptions | None = None,
 ) -> Router:
     router = Router()
 
+    def stop_push(chat_id: int) -> None:
+        if subscriptions:
+            subscriptions.unsubscribe(chat_id)
+
     def readable_shift(shift_type: str) -> str:
         return "Утренняя" if shift_type == "morning" else "Вечерняя"
 
@@ -62,7 +77,7 @@ def create_shift_router(
         if not report_service:
             return ""
         try:
-            report_text = report_service.build_report_for_worker(worker)
+            report_text = await report_service.build_report_for_worker(worker)
         except Exception:
             logger.exception("Failed to build shift report for worker=%s", worker.id)
             return ""
@@ -92,20 +107,26 @@ def create_shift_router(
         free_shifts = await shift_service.list_free_shifts(
             date_str, shift_type, worker.full_name
         )
-        if not free_shifts:
-            await message.answer(
-                "Свободных смен не осталось",
-                reply_markup=build_shift_keyboard([]),
-            )
-            return
-        await message.answer(
-            "Выберите доктора:",
+        sent = await message.answer(
+            FREE_SHIFTS_TEXT if free_shifts else NO_FREE_SHIFTS_TEXT,
             reply_markup=build_shift_keyboard(free_shifts),
         )
+        if subscriptions:
+            # Keeps this keyboard current while others claim and cancel.
+            subscriptions.subscribe(
+                message.bot,
+                sent.chat.id,
+                sent.message_id,
+                date_str,
+                shift_type,
+                worker.full_name,
+                free_shifts,
+            )
 
     @router.callback_query(F.data.startswith("select_shift:"))
     async def mark_shift(callback: CallbackQuery):
         shift_id = int(callback.data.split(":", 1)[1])
+        stop_push(callback.from_user.id)
         shift_type, date_str = shift_service.guess_shift_type_from_now()
         if not shift_type:
             await callback.answer(SHIFT_TIME_MSG, show_alert=True)
@@ -115,7 +136,7 @@ def create_shift_router(
         if not worker:
             return
 
-        shift = await shift_service.get_shift_by_id(shift_id)
+        shift = await shift_service.get_shift_by_id(shift_id, date_str)
         if not shift or shift.date != date_str or shift.type != shift_type:
             await callback.answer("Эта смена недоступна", show_alert=True)
             return
@@ -150,6 +171,7 @@ def create_shift_router(
 
     @router.callback_query(F.data == "shift_show_all")
     async def show_all_doctors(callback: CallbackQuery):
+        stop_push(callback.from_user.id)
         shift_type, date_str = shift_service.guess_shift_type_from_now()
         if not shift_type:
             await callback.answer(SHIFT_TIME_MSG, show_alert=True)
@@ -168,46 +190,34 @@ def create_shift_router(
             await callback.answer()
             return
 
-        workers = await shift_service.list_all_doctors()
         await callback.message.edit_text(
             "Выберите доктора:",
-            reply_markup=build_all_doctors_keyboard(workers, page=0),
+            reply_markup=await cached_all_doctors_keyboard(shift_service.list_doctors_page),
         )
         await callback.answer()
 
     @router.callback_query(DoctorsPage.filter())
     async def doctors_paginate(cb: CallbackQuery, callback_data: DoctorsPage):
-        workers = await shift_service.list_all_doctors()
         await cb.message.edit_reply_markup(
-            reply_markup=build_all_doctors_keyboard(workers, page=callback_data.page)
+            reply_markup=await cached_all_doctors_keyboard(
+                shift_service.list_doctors_page,
+                after=callback_data.after,
+                before=callback_data.before,
+            )
         )
         await cb.answer()
 
-    @router.callback_query(SelectDoctor.filter())
-    async def doctor_selected(cb: CallbackQuery, callback_data: SelectDoctor):
-        shift_type, date_str = shift_service.guess_shift_type_from_now()
-        if not shift_type:
-            await cb.answer(SHIFT_TIME_MSG, show_alert=True)
-            return
-
-        worker = await get_worker_for_callback(cb)
-        if not worker:
-            return
-
-        doctor = await shift_service.get_worker_by_id(callback_data.doctor_id)
-        if not doctor:
-            await cb.answer(DOCTOR_NOT_FOUND_MSG, show_alert=True)
-            return
-
+    async def choose_doctor(worker, doctor, shift_type: str, date_str: str, reply) -> None:
+        if worker.chat_id:
+            stop_push(int(worker.chat_id))
         doctor_shifts = await shift_service.list_doctor_shifts(
             date_str, shift_type, doctor.full_name
         )
         if not doctor_shifts:
-            await cb.message.edit_text(
+            await reply(
                 "Этого врача сейчас нет в графике работы. Вы уверены что хотите создать с ним смену?",
                 reply_markup=build_manual_shift_confirm_keyboard(doctor.id),
             )
-            await cb.answer()
             return
 
         free_slot = await shift_service.get_preferred_free_doctor_slot(
@@ -224,24 +234,59 @@ def create_shift_router(
             )
             if success:
                 report_suffix = await build_report_suffix(worker)
-                await cb.message.edit_text(
+                await reply(
                     f"Готово ✔ {readable_shift(shift_type)} смена у {doctor.full_name} закреплена за вами"
                     f"{report_suffix}"
                 )
             else:
-                await cb.message.edit_text(
-                    "Не удалось записаться на смену. Скорее всего, её уже заняли."
-                )
-            await cb.answer()
+                await reply("Не удалось записаться на смену. Скорее всего, её уже заняли.")
             return
 
-        await cb.message.edit_text(
+        await reply(
             "‼️‼️ Внимание! ‼️‼️\n"
             "У этого врача уже есть смена с другим ассистентом, вы уверены что хотите создать с ним дополнительную смену?",
             reply_markup=build_manual_shift_confirm_keyboard(doctor.id),
         )
+
+    @router.callback_query(SelectDoctor.filter())
+    async def doctor_selected(cb: CallbackQuery, callback_data: SelectDoctor):
+        shift_type, date_str = shift_service.guess_shift_type_from_now()
+        if not shift_type:
+            await cb.answer(SHIFT_TIME_MSG, show_alert=True)
+            return
+
+        worker = await get_worker_for_callback(cb)
+        if not worker:
+            return
+
+        doctor = await shift_service.get_worker_by_id(callback_data.doctor_id)
+        if not doctor:
+            await cb.answer(DOCTOR_NOT_FOUND_MSG, show_alert=True)
+            return
+
+        await choose_doctor(worker, doctor, shift_type, date_str, cb.message.edit_text)
         await cb.answer()
-        return
+
+    @router.message(F.via_bot, F.text)
+    async def doctor_from_search(message: Message):
+        # A doctor picked from the inline search arrives as their name sent via this bot.
+        if search is None or message.via_bot.id != message.bot.id:
+            return
+        shift_type, date_str = shift_service.guess_shift_type_from_now()
+        if not shift_type:
+            await message.answer(SHIFT_TIME_MSG)
+            return
+
+        worker = await get_worker_for_message(message)
+        if not worker:
+            return
+
+        doctor = await search.find_by_name(message.text)
+        if not doctor:
+            await message.answer(DOCTOR_NOT_FOUND_MSG)
+            return
+
+        await choose_doctor(worker, doctor, shift_type, date_str, message.answer)
 
     @router.callback_query(ManualShiftConfirm.filter())
     async def confirm_manual_shift(cb: CallbackQuery, callback_data: ManualShiftConfirm):
@@ -278,6 +323,7 @@ def create_shift_router(
                 doctor.full_name,
                 shift_type,
                 date_str,
+                doctor_id=doctor.id,
             )
 
         if success:
@@ -290,6 +336,89 @@ def create_shift_router(
             await cb.message.edit_text("Не удалось записаться на смену")
         await cb.answer()
 
+    async def render_plan_days(reply) -> None:
+        days = await shift_service.count_free_by_day(shift_service.plan_dates())
+        await reply("📅 Свободные смены на неделю вперёд:", reply_markup=build_plan_days_keyboard(days))
+
+    @router.message(Command("plan"))
+    async def show_plan(message: Message):
+        if not await get_worker_for_message(message):
+            return
+        await render_plan_days(message.answer)
+
+    @router.callback_query(F.data == "plan_days")
+    async def plan_days(callback: CallbackQuery):
+        await render_plan_days(callback.message.edit_text)
+        await callback.answer()
+
+    @router.callback_query(F.data.startswith("plan_day:"))
+    async def plan_day(callback: CallbackQuery):
+        date_str = callback.data.split(":", 1)[1]
+        if date_str not in shift_service.plan_dates():
+            await callback.answer("Эта дата уже недоступна", show_alert=True)
+            return
+        [(_, morning, evening)] = await shift_service.count_free_by_day([date_str])
+        await callback.message.edit_text(
+            f"📅 {date_str}: выберите смену",
+            reply_markup=build_plan_day_keyboard(date_str, morning, evening),
+        )
+        await callback.answer()
+
+    @router.callback_query(F.data.startswith("plan_type:"))
+    async def plan_type(callback: CallbackQuery):
+        _, date_str, shift_type = callback.data.split(":")
+        if date_str not in shift_service.plan_dates():
+            await callback.answer("Эта дата уже недоступна", show_alert=True)
+            return
+        if shift_type not in ("morning", "evening"):
+            await callback.answer("Неизвестный тип смены", show_alert=True)
+            return
+        worker = await get_worker_for_callback(callback)
+        if not worker:
+            return
+        current_shift = await shift_service.get_current_shift(worker.id, date_str, shift_type)
+        if current_shift:
+            await callback.answer(
+                f"У вас уже есть смена с {current_shift.doctor_name}", show_alert=True
+            )
+            return
+        free_shifts = await shift_service.list_free_shifts(date_str, shift_type, worker.full_name)
+        await callback.message.edit_text(
+            f"📅 {date_str}, {readable_shift(shift_type).lower()} смена: "
+            + ("выберите доктора" if free_shifts else "свободных смен нет"),
+            reply_markup=build_plan_shifts_keyboard(date_str, free_shifts),
+        )
+        await callback.answer()
+
+    @router.callback_query(F.data.startswith("plan_shift:"))
+    async def plan_shift(callback: CallbackQuery):
+        _, date_str, shift_id = callback.data.split(":")
+        if date_str not in shift_service.plan_dates():
+            await callback.answer("Эта дата уже недоступна", show_alert=True)
+            return
+        worker = await get_worker_for_callback(callback)
+        if not worker:
+            return
+
+        shift = await shift_service.get_shift_by_id(int(shift_id), date_str)
+        if not shift or shift.assistant_id is not None:
+            await callback.answer("Эта смена недоступна", show_alert=True)
+            return
+        if await shift_service.get_current_shift(worker.id, date_str, shift.type):
+            await callback.answer("На эту смену вы уже записаны", show_alert=True)
+            return
+
+        success = await shift_service.add_shift_by_id(worker.id, worker.full_name, shift.id)
+        if success:
+            await callback.message.edit_text(
+                f"Готово ✔ {readable_shift(shift.type)} смена {date_str} у {shift.doctor_name} закреплена за вами"
+            )
+        else:
+            await callback.message.edit_text(
+                "Не удалось записаться на смену. Скорее всего, её уже заняли."
+            )
+        await callback.answer()
+
     @router.callback_query(F.data == "manual_shift_cancel")
     async def cancel_manual_shift(cb: CallbackQuery):
         await cb.message.edit_text("Выбор отменён.")
@@ -26,47 +26,112 @@ async def start_pair_survey(
     state: FSMContext | None = None,
     dp: Dispatcher | None = None,
     file_id: str | None = None,
+    survey_id: int | None = None,
 ) -> None:
     intro = (
         f"{pair.date} с вами работает: {pair.object}.\n"
         f"Пожалуйста, оцените коллегу: {pair.survey}"
     )
-    if file_id:
-        await bot.send_photo(chat_id=chat_id, photo=file_id, caption=intro)
-    else:
-        await bot.send_message(chat_id, text=intro)
+    await survey_service.media.send_photo(bot, chat_id, file_id, intro)
 
     if state is None:
         state = dp.fsm.get_context(bot, chat_id, chat_id)
 
-    survey = await survey_service.get_survey(pair.survey)
-    await state.update_data(survey=survey, pair=pair, answers=[])
+    if survey_id is not None:
+        survey = await survey_service.get_survey_by_id(survey_id)
+    else:
+        survey = await survey_service.get_survey(pair.survey)
+    if survey is None or not survey.questions:
+        logger.error("Survey '%s' not found or empty. pair id: %s", pair.survey, pair.id)
+        return
+    await state.update_data(survey_id=survey.id, pair=pair, answers=[], question_index=1)
 
     await ask_next_question(
         bot=bot,
         user_id=chat_id,
         question_index=1,
         state=state,
+        survey_service=survey_service,
     )
 
 
-async def ask_next_question(bot, user_id: int, question_index: int, state: FSMContext) -> None:
+async def ask_next_question(
+    bot,
+    user_id: int,
+    question_index: int,
+    state: FSMContext,
+    survey_service: SurveyFlowService,
+) -> None:
     data = await state.get_data()
-    survey = data.get("survey")
-
-    q_text = getattr(survey, f"question{question_index}")
-    q_type = getattr(survey, f"question{question_index}_type")
-
-    if q_type == "int":
-        await bot.send_message(chat_id=user_id, text=q_text, reply_markup=await build_int_keyboard(question_index))
+    survey = await survey_service.get_survey_by_id(data.get("survey_id"))
+    if survey is None or question_index > len(survey.questions):
+        # The survey was removed or shortened by /upd_surveys mid-survey.
+        pair: Pair | None = data.get("pair")
+        logger.warning(
+            "Survey %s changed while pair %s was answering it",
+            data.get("survey_id"),
+            pair.id if pair else None,
+        )
+        await state.clear()
+        if pair is not None:
+            # Release the claim so the pair is handed out again.
+            await survey_service.mark_pair_status(pair.id, "ready")
+        await bot.send_message(chat_id=user_id, text="Опрос изменился, ответы не сохранены.")
+        return
+    question = survey.questions[question_index - 1]
+    await state.update_data(question_index=question_index)
+
+    if question.type == "int":
+        await bot.send_message(chat_id=user_id, text=question.text, reply_markup=await build_int_keyboard(question_index))
     else:
         await state.set_state(SurveyState.answers)
-        await bot.send_message(chat_id=user_id, text=q_text)
+        await bot.send_message(chat_id=user_id, text=question.text)
 
 
 def create_survey_router(survey_service: SurveyFlowService) -> Router:
     router = Router()
 
+    async def advance(bot: Bot, chat_id: int, state: FSMContext) -> None:
+        data = await state.get_data()
+        answers: list = data.get("answers")
+        pair: Pair = data.get("pair")
+        survey = await survey_service.get_survey_by_id(data.get("survey_id"))
+
+        if survey is not None and len(answers) < len(survey.questions):
+            await ask_next_question(
+                bot=bot,
+                user_id=chat_id,
+                question_index=len(answers) + 1,
+                state=state,
+                survey_service=survey_service,
+            )
+            return
+
+        try:
+            await survey_service.save_answers(pair, survey, answers)
+            await survey_service.mark_pair_status(pair.id, "done")
+        except Exception as exc:
+            logger.error("Failed to save answers for pair %s: %s", pair.id, exc)
+
+        await state.clear()
+
+        next_dispatch = None
+        if pair.subject_id is not None:
+            next_dispatch = await survey_service.get_next_ready_dispatch(pair.subject_id)
+        if next_dispatch:
+            next_pair = next_dispatch.pair
+            await survey_service.mark_pair_status(next_pair.id, "in_progress")
+            await start_pair_survey(
+                bot,
+                chat_id,
+                next_pair,
+                survey_service,
+                state=state,
+                file_id=next_dispatch.object_file_id,
+            )
+        else:
+            await bot.send_message(chat_id, "Спасибо! На сегодня опросы закончились.")
+
     @router.callback_query(F.data.startswith("rate:"))
     async def handle_rate(callback: CallbackQuery, state: FSMContext):
         _, question_index, rate, timestamp = callback.data.split(":")
@@ -81,9 +146,13 @@ def create_survey_router(survey_service: SurveyFlowService) -> Router:
 
         data = await state.get_data()
         answers: list = data.get("answers")
-        if idx > 1 and len(answers) == 0:
+        if answers is None or (idx > 1 and len(answers) == 0):
             await callback.message.edit_text(text="Время для ответа истекло", reply_markup=None)
             return
+        if idx != data.get("question_index"):
+            # A repeated tap on a keyboard that was already answered.
+            await callback.answer()
+            return
 
         answers.append(rate)
         await state.update_data(answers=answers)
@@ -107,9 +176,7 @@ def create_survey_router(survey_service: SurveyFlowService) -> Router:
 
         await callback.message.edit_text(text=text, reply_markup=None)
 
-        await ask_next_question(
-            bot=callback.bot, user_id=callback.from_user.id, question_index=idx + 1, state=state
-        )
+        await advance(callback.bot, callback.from_user.id, state)
 
     @router.message(StateFilter(SurveyState.answers))
     async def handle_text_answer(message: Message, state: FSMContext):
@@ -133,33 +200,6 @@ def create_survey_router(survey_service: SurveyFlowService) -> Router:
             pair.id,
         )
 
-        if idx < 5:
-            await ask_next_question(
-                bot=message.bot, user_id=message.from_user.id, question_index=idx + 1, state=state
-            )
-        else:
-            survey = data.get("survey")
-            try:
-                await survey_service.save_answers(pair, survey, data.get("answers"))
-                await survey_service.mark_pair_status(pair.id, "done")
-            except Exception as exc:
-                logger.error("Failed to save answers for pair %s: %s", pair.id, exc)
-
-            await state.clear()
-
-            next_pair = await survey_service.get_next_ready_pair(pair.subject)
-            if next_pair:
-                await survey_service.mark_pair_status(next_pair.id, "in_progress")
-                file_id = await survey_service.get_worker_file_id(next_pair.object)
-                await start_pair_survey(
-                    message.bot,
-                    message.from_user.id,
-                    next_pair,
-                    survey_service,
-                    state=state,
-                    file_id=file_id,
-                )
-            else:
-                await message.answer("Спасибо! На сегодня опросы закончились.")
+        await advance(message.bot, message.from_user.id, state)
 
     return router
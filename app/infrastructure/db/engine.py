@@ -0,0 +1,101 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import DbSettings
+from app.metrics import metrics
+
+
+# Bound to the engine by init_engine(); repositories import it at module load.
+async_session = async_sessionmaker()
+
+_engine: AsyncEngine | None = None
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long callers waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            metrics.incr("db.pool.checkout_errors")
+            raise
+        finally:
+            metrics.observe("db.pool.wait_seconds", time.perf_counter() - started)
+
+
+def build_url(settings: DbSettings) -> URL:
+    return URL.create(
+        "postgresql+asyncpg",
+        username=settings.user or None,
+        password=settings.password or None,
+        host=settings.host,
+        port=int(settings.port) if settings.port else None,
+        database=settings.name or None,
+        query={"prepared_statement_cache_size": str(settings.statement_cache_size)},
+    )
+
+
+def _instrument(engine: AsyncEngine) -> None:
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr("db.pool.connects")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("db.pool.checkouts")
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.observe("db.pool.hold_seconds", time.perf_counter() - started)
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("db.pool.invalidated")
+
+    metrics.register_gauge("db.pool.size", pool.size)
+    metrics.register_gauge("db.pool.checked_out", pool.checkedout)
+    metrics.register_gauge("db.pool.overflow", pool.overflow)
+
+
+def init_engine(settings: DbSettings) -> AsyncEngine:
+    global _engine
+    if _engine is not None:
+        return _engine
+
+    _engine = create_async_engine(
+        build_url(settings),
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        connect_args={"statement_cache_size": settings.statement_cache_size},
+    )
+    _instrument(_engine)
+    async_session.configure(bind=_engine)
+    return _engine
+
+
+def get_engine() -> AsyncEngine:
+    if _engine is None:
+        raise RuntimeError("Database engine is not initialized (call init_engine first)")
+    return _engine
+
+
+async def dispose_engine() -> None:
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
@@ -1,27 +1,48 @@
+from datetime import datetime
+
+from app.date_utils import (
+    format_date,
+    format_datetime,
+    parse_date,
+    parse_datetime,
+)
 from app.domain.entities import (
     AdminUser as AdminUserEntity,
     Answer as AnswerEntity,
+    AnswerItem as AnswerItemEntity,
     Cabinet as CabinetEntity,
     Instrument as InstrumentEntity,
     InstrumentMove as InstrumentMoveEntity,
     Pair as PairEntity,
     Shift as ShiftEntity,
     Survey as SurveyEntity,
+    SurveyQuestion as SurveyQuestionEntity,
     Worker as WorkerEntity,
 )
 from app.infrastructure.db.models import (
     AdminUser as AdminUserModel,
     Answer as AnswerModel,
+    AnswerItem as AnswerItemModel,
     Cabinet as CabinetModel,
     Instrument as InstrumentModel,
     InstrumentMove as InstrumentMoveModel,
     Pair as PairModel,
     Shift as ShiftModel,
     Survey as SurveyModel,
+    SurveyQuestion as SurveyQuestionModel,
     Worker as WorkerModel,
 )
 
 
+def _parse_iso_datetime(value: str | datetime | None) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 def to_admin_entity(model: AdminUserModel | None) -> AdminUserEntity | None:
     if model is None:
         return None
@@ -51,14 +72,6 @@ def to_worker_entity(model: WorkerModel | None) -> WorkerEntity | None:
         speciality=model.speciality,
         phone=model.phone,
         is_active=model.is_active if model.is_active is not None else True,
-        shifts_week=model.shifts_week or 0,
-        shifts_month=model.shifts_month or 0,
-        given_week=model.given_week or 0,
-        given_month=model.given_month or 0,
-        replacement_week=model.replacement_week or 0,
-        replacement_month=model.replacement_month or 0,
-        manual_week=model.manual_week or 0,
-        manual_month=model.manual_month or 0,
     )
 
 
@@ -71,14 +84,6 @@ def from_worker_entity(entity: WorkerEntity) -> WorkerModel:
         speciality=entity.speciality,
         phone=entity.phone,
         is_active=entity.is_active,
-        shifts_week=entity.shifts_week,
-        shifts_month=entity.shifts_month,
-        given_week=entity.given_week,
-        given_month=entity.given_month,
-        replacement_week=entity.replacement_week,
-        replacement_month=entity.replacement_month,
-        manual_week=entity.manual_week,
-        manual_month=entity.manual_month,
     )
 
 
@@ -91,8 +96,10 @@ def to_pair_entity(model: PairModel | None) -> PairEntity | None:
         object=model.object,
         survey=model.survey,
         weekday=model.weekday,
-        date=model.date,
+        date=format_date(model.date),
         status=model.status,
+        subject_id=model.subject_id,
+        object_id=model.object_id,
     )
 
 
@@ -103,27 +110,25 @@ def from_pair_entity(entity: PairEntity) -> PairModel:
         object=entity.object,
         survey=entity.survey,
         weekday=entity.weekday,
-        date=entity.date,
+        date=parse_date(entity.date),
         status=entity.status,
+        subject_id=entity.subject_id,
+        object_id=entity.object_id,
     )
 
 
-def to_survey_entity(model: SurveyModel | None) -> SurveyEntity | None:
+def to_survey_entity(
+    model: SurveyModel | None, questions: list[SurveyQuestionModel] | None = None
+) -> SurveyEntity | None:
     if model is None:
         return None
     return SurveyEntity(
         id=model.id,
         speciality=model.speciality,
-        question1=model.question1,
-        question1_type=model.question1_type,
-        question2=model.question2,
-        question2_type=model.question2_type,
-        question3=model.question3,
-        question3_type=model.question3_type,
-        question4=model.question4,
-        question4_type=model.question4_type,
-        question5=model.question5,
-        question5_type=model.question5_type,
+        questions=[
+            SurveyQuestionEntity(position=item.position, text=item.text, type=item.type)
+            for item in sorted(questions or [], key=lambda item: item.position)
+        ],
     )
 
 
@@ -131,39 +136,53 @@ def from_survey_entity(entity: SurveyEntity) -> SurveyModel:
     return SurveyModel(
         id=entity.id,
         speciality=entity.speciality,
-        question1=entity.question1,
-        question1_type=entity.question1_type,
-        question2=entity.question2,
-        question2_type=entity.question2_type,
-        question3=entity.question3,
-        question3_type=entity.question3_type,
-        question4=entity.question4,
-        question4_type=entity.question4_type,
-        question5=entity.question5,
-        question5_type=entity.question5_type,
     )
 
 
-def to_answer_entity(model: AnswerModel | None) -> AnswerEntity | None:
+def from_survey_question_entity(entity: SurveyQuestionEntity, survey_id: int) -> SurveyQuestionModel:
+    return SurveyQuestionModel(
+        survey_id=survey_id,
+        position=entity.position,
+        text=entity.text,
+        type=entity.type,
+    )
+
+
+def to_answer_item_entity(model: AnswerItemModel) -> AnswerItemEntity:
+    return AnswerItemEntity(
+        question_no=model.question_no,
+        int_score=model.int_score,
+        text_value=model.text_value,
+        question_text=model.question_text,
+    )
+
+
+def from_answer_item_entity(entity: AnswerItemEntity, answer_id: int) -> AnswerItemModel:
+    return AnswerItemModel(
+        answer_id=answer_id,
+        question_no=entity.question_no,
+        int_score=entity.int_score,
+        text_value=entity.text_value,
+        question_text=entity.question_text,
+    )
+
+
+def to_answer_entity(
+    model: AnswerModel | None, items: list[AnswerItemModel] | None = None
+) -> AnswerEntity | None:
     if model is None:
         return None
     return AnswerEntity(
         id=model.id,
         subject=model.subject,
         object=model.object,
+        survey_id=model.survey_id,
         survey=model.survey,
-        survey_date=model.survey_date,
-        completed_at=model.completed_at,
-        question1=model.question1,
-        answer1=model.answer1,
-        question2=model.question2,
-        answer2=model.answer2,
-        question3=model.question3,
-        answer3=model.answer3,
-        question4=model.question4,
-        answer4=model.answer4,
-        question5=model.question5,
-        answer5=model.answer5,
+        survey_date=format_date(model.survey_date),
+        completed_at=str(model.completed_at) if model.completed_at else None,
+        items=[to_answer_item_entity(item) for item in items or []],
+        subject_id=model.subject_id,
+        object_id=model.object_id,
     )
 
 
@@ -172,19 +191,12 @@ def from_answer_entity(entity: AnswerEntity) -> AnswerModel:
         id=entity.id,
         subject=entity.subject,
         object=entity.object,
+        survey_id=entity.survey_id,
         survey=entity.survey,
-        survey_date=entity.survey_date,
-        completed_at=entity.completed_at,
-        question1=entity.question1,
-        answer1=entity.answer1,
-        question2=entity.question2,
-        answer2=entity.answer2,
-        question3=entity.question3,
-        answer3=entity.answer3,
-        question4=entity.question4,
-        answer4=entity.answer4,
-        question5=entity.question5,
-        answer5=entity.answer5,
+        survey_date=parse_date(entity.survey_date),
+        completed_at=_parse_iso_datetime(entity.completed_at),
+        subject_id=entity.subject_id,
+        object_id=entity.object_id,
     )
 
 
@@ -195,13 +207,15 @@ def to_shift_entity(model: ShiftModel | None) -> ShiftEntity | None:
         id=model.id,
         assistant_id=model.assistant_id,
         doctor_name=model.doctor_name,
-        date=model.date,
+        date=format_date(model.date),
         type=model.type,
         scheduled_assistant_name=model.scheduled_assistant_name,
         speciality=model.speciality,
         cabinet=model.cabinet,
         assistant_name=model.assistant_name,
         manual=model.manual,
+        doctor_id=model.doctor_id,
+        scheduled_assistant_id=model.scheduled_assistant_id,
     )
 
 
@@ -210,13 +224,15 @@ def from_shift_entity(entity: ShiftEntity) -> ShiftModel:
         id=entity.id,
         assistant_id=entity.assistant_id,
         doctor_name=entity.doctor_name,
-        date=entity.date,
+        date=parse_date(entity.date),
         type=entity.type,
         scheduled_assistant_name=entity.scheduled_assistant_name,
         speciality=entity.speciality,
         cabinet=entity.cabinet,
         assistant_name=entity.assistant_name,
         manual=entity.manual,
+        doctor_id=entity.doctor_id,
+        scheduled_assistant_id=entity.scheduled_assistant_id,
     )
 
 
@@ -269,7 +285,7 @@ def to_instrument_move_entity(model: InstrumentMoveModel | None) -> InstrumentMo
         before_photo_id=model.before_photo_id,
         after_photo_id=model.after_photo_id,
         moved_by_chat_id=model.moved_by_chat_id,
-        moved_at=model.moved_at,
+        moved_at=format_datetime(model.moved_at),
     )
 
 
@@ -282,5 +298,5 @@ def from_instrument_move_entity(entity: InstrumentMoveEntity) -> InstrumentMoveM
         before_photo_id=entity.before_photo_id,
         after_photo_id=entity.after_photo_id,
         moved_by_chat_id=entity.moved_by_chat_id,
-        moved_at=entity.moved_at,
+        moved_at=parse_datetime(entity.moved_at),
     )
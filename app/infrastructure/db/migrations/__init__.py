@@ -0,0 +1,90 @@
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.logger import setup_logger
+
+
+logger = setup_logger("migrations", "migrations.log")
+
+# pg_advisory_lock key shared by every replica running migrations.
+MIGRATIONS_LOCK_KEY = 7_240_031_029
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+def load_migrations() -> list[Migration]:
+    """Collect ``vNNNN_<name>.py`` modules of this package ordered by version."""
+    migrations: list[Migration] = []
+    for module_info in pkgutil.iter_modules(__path__):
+        prefix, _, name = module_info.name.partition("_")
+        if not prefix.startswith("v") or not prefix[1:].isdigit():
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(version=int(prefix[1:]), name=name, upgrade=module.upgrade))
+    migrations.sort(key=lambda item: item.version)
+    versions = [item.version for item in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return migrations
+
+
+async def _applied_versions(conn: AsyncConnection) -> set[int]:
+    await conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+    )
+    await conn.execute(text("ALTER TABLE schema_migrations ADD COLUMN IF NOT EXISTS name TEXT"))
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    versions = {row.version for row in result}
+    await conn.commit()
+    return versions
+
+
+async def run_migrations(engine: AsyncEngine) -> list[int]:
+    """Apply pending migrations, each in its own transaction.
+
+    A session-level advisory lock serialises concurrent replicas: the ones
+    that wait find everything applied once they get the lock.
+    """
+    migrations = load_migrations()
+    applied_now: list[int] = []
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+        await conn.commit()
+        try:
+            applied = await _applied_versions(conn)
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                logger.info("Applying migration %04d_%s", migration.version, migration.name)
+                try:
+                    await migration.upgrade(conn)
+                    await conn.execute(
+                        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                        {"version": migration.version, "name": migration.name},
+                    )
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    logger.exception("Migration %04d_%s failed", migration.version, migration.name)
+                    raise
+                applied_now.append(migration.version)
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+            await conn.commit()
+
+    return applied_now
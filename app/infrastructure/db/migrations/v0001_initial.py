@@ -0,0 +1,131 @@
+"""Baseline schema as it was created by Base.metadata.create_all()."""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS admins (
+        id BIGSERIAL PRIMARY KEY,
+        chat_id VARCHAR(31) NOT NULL UNIQUE,
+        added_at VARCHAR(63)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS workers (
+        id BIGSERIAL PRIMARY KEY,
+        full_name TEXT,
+        file_id VARCHAR(255),
+        chat_id VARCHAR(31),
+        speciality VARCHAR(255),
+        phone VARCHAR(31),
+        is_active BOOLEAN,
+        shifts_week INTEGER NOT NULL,
+        shifts_month INTEGER NOT NULL,
+        given_week INTEGER NOT NULL,
+        given_month INTEGER NOT NULL,
+        replacement_week INTEGER NOT NULL,
+        replacement_month INTEGER NOT NULL,
+        manual_week INTEGER NOT NULL,
+        manual_month INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pairs (
+        id BIGSERIAL PRIMARY KEY,
+        subject TEXT,
+        object TEXT,
+        survey TEXT,
+        weekday VARCHAR(31),
+        date VARCHAR(31),
+        status VARCHAR(15)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS surveys (
+        id BIGSERIAL PRIMARY KEY,
+        speciality VARCHAR(511),
+        question1 TEXT,
+        question1_type VARCHAR(7),
+        question2 TEXT,
+        question2_type VARCHAR(7),
+        question3 TEXT,
+        question3_type VARCHAR(7),
+        question4 TEXT,
+        question4_type VARCHAR(7),
+        question5 TEXT,
+        question5_type VARCHAR(7)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS answers (
+        id BIGSERIAL PRIMARY KEY,
+        subject TEXT,
+        object TEXT,
+        survey TEXT,
+        survey_date VARCHAR(31),
+        completed_at VARCHAR(63),
+        question1 TEXT,
+        answer1 TEXT,
+        question2 TEXT,
+        answer2 TEXT,
+        question3 TEXT,
+        answer3 TEXT,
+        question4 TEXT,
+        answer4 TEXT,
+        question5 TEXT,
+        answer5 TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS shifts (
+        id BIGSERIAL PRIMARY KEY,
+        assistant_id BIGINT,
+        doctor_name TEXT,
+        date VARCHAR(31),
+        type VARCHAR(10),
+        scheduled_assistant_name TEXT,
+        speciality TEXT,
+        cabinet TEXT,
+        assistant_name TEXT,
+        manual BOOLEAN
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cabinets (
+        id BIGSERIAL PRIMARY KEY,
+        name TEXT,
+        is_active BOOLEAN
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS instruments (
+        id BIGSERIAL PRIMARY KEY,
+        name TEXT,
+        cabinet_id BIGINT,
+        is_active BOOLEAN
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS instrument_moves (
+        id BIGSERIAL PRIMARY KEY,
+        instrument_id BIGINT,
+        from_cabinet_id BIGINT,
+        to_cabinet_id BIGINT,
+        before_photo_id VARCHAR(255),
+        after_photo_id VARCHAR(255),
+        moved_by_chat_id VARCHAR(31),
+        moved_at VARCHAR(63)
+    )
+    """,
+    """
+    INSERT INTO cabinets (name, is_active)
+    SELECT 'Стерилизационная', TRUE
+    WHERE NOT EXISTS (SELECT 1 FROM cabinets WHERE name = 'Стерилизационная')
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,47 @@
+"""Convert dd.mm.yyyy strings to DATE/TIMESTAMP columns.
+
+Values that do not match the expected format become NULL instead of
+aborting the migration.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    r"""
+    ALTER TABLE shifts ALTER COLUMN date TYPE DATE USING (
+        CASE WHEN date ~ '^\s*\d{1,2}\.\d{1,2}\.\d{4}\s*$'
+        THEN to_date(trim(date), 'DD.MM.YYYY') END
+    )
+    """,
+    r"""
+    ALTER TABLE pairs ALTER COLUMN date TYPE DATE USING (
+        CASE WHEN date ~ '^\s*\d{1,2}\.\d{1,2}\.\d{4}\s*$'
+        THEN to_date(trim(date), 'DD.MM.YYYY') END
+    )
+    """,
+    r"""
+    ALTER TABLE answers ALTER COLUMN survey_date TYPE DATE USING (
+        CASE WHEN survey_date ~ '^\s*\d{1,2}\.\d{1,2}\.\d{4}\s*$'
+        THEN to_date(trim(survey_date), 'DD.MM.YYYY') END
+    )
+    """,
+    # completed_at was written as str(datetime.now()): 2024-05-01 20:15:03.123456
+    r"""
+    ALTER TABLE answers ALTER COLUMN completed_at TYPE TIMESTAMP USING (
+        CASE WHEN completed_at ~ '^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?$'
+        THEN completed_at::timestamp END
+    )
+    """,
+    r"""
+    ALTER TABLE instrument_moves ALTER COLUMN moved_at TYPE TIMESTAMP USING (
+        CASE WHEN moved_at ~ '^\d{2}\.\d{2}\.\d{4} \d{2}:\d{2}:\d{2}$'
+        THEN to_timestamp(moved_at, 'DD.MM.YYYY HH24:MI:SS')::timestamp END
+    )
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,21 @@
+"""Indexes for the lookups done on every tap and in the daily jobs."""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_shifts_date_type ON shifts (date, type)",
+    "CREATE INDEX IF NOT EXISTS ix_shifts_assistant_date ON shifts (assistant_id, date, type)",
+    "CREATE INDEX IF NOT EXISTS ix_pairs_status_date ON pairs (status, date)",
+    "CREATE INDEX IF NOT EXISTS ix_pairs_subject_status ON pairs (subject, status)",
+    "CREATE INDEX IF NOT EXISTS ix_answers_object ON answers (object)",
+    "CREATE INDEX IF NOT EXISTS ix_workers_chat_id ON workers (chat_id)",
+    "CREATE INDEX IF NOT EXISTS ix_workers_full_name ON workers (full_name)",
+    "CREATE INDEX IF NOT EXISTS ix_instruments_cabinet_id ON instruments (cabinet_id)",
+    "CREATE INDEX IF NOT EXISTS ix_instrument_moves_instrument_id ON instrument_moves (instrument_id, id)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,70 @@
+"""Move question1..5/answer1..5 out of answers into answer_items.
+
+Answers keep a header row (who, about whom, which survey and when) and
+reference the survey by id. Every answered question becomes one item with
+either a typed score or a free-text value, and keeps the question text it
+was asked with.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    "ALTER TABLE answers ADD COLUMN IF NOT EXISTS survey_id BIGINT",
+    """
+    UPDATE answers AS a
+    SET survey_id = s.id
+    FROM surveys AS s
+    WHERE a.survey_id IS NULL AND s.speciality = a.survey
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS answer_items (
+        id BIGSERIAL PRIMARY KEY,
+        answer_id BIGINT NOT NULL REFERENCES answers (id) ON DELETE CASCADE,
+        question_no SMALLINT NOT NULL,
+        question_text TEXT,
+        int_score SMALLINT,
+        text_value TEXT,
+        CONSTRAINT uq_answer_items_answer_question UNIQUE (answer_id, question_no)
+    )
+    """,
+    # Question types come from the survey when it still exists; otherwise a
+    # purely numeric answer is treated as a score.
+    *(
+        rf"""
+        INSERT INTO answer_items (answer_id, question_no, question_text, int_score, text_value)
+        SELECT
+            a.id,
+            {no},
+            nullif(trim(a.question{no}), ''),
+            CASE
+                WHEN coalesce(s.question{no}_type, 'int') = 'int'
+                     AND trim(a.answer{no}) ~ '^\d{{1,4}}$'
+                THEN trim(a.answer{no})::smallint
+            END,
+            CASE
+                WHEN coalesce(s.question{no}_type, 'int') = 'int'
+                     AND trim(a.answer{no}) ~ '^\d{{1,4}}$'
+                THEN NULL
+                ELSE a.answer{no}
+            END
+        FROM answers AS a
+        LEFT JOIN surveys AS s ON s.id = a.survey_id
+        WHERE a.answer{no} IS NOT NULL AND trim(a.answer{no}) <> ''
+        ON CONFLICT (answer_id, question_no) DO NOTHING
+        """
+        for no in range(1, 6)
+    ),
+    *(
+        f"ALTER TABLE answers DROP COLUMN IF EXISTS question{no}, DROP COLUMN IF EXISTS answer{no}"
+        for no in range(1, 6)
+    ),
+    "CREATE INDEX IF NOT EXISTS ix_answers_object_date ON answers (object, survey_date)",
+    "DROP INDEX IF EXISTS ix_answers_object",
+    "CREATE INDEX IF NOT EXISTS ix_answers_survey_id ON answers (survey_id)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
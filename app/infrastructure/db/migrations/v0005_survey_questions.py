@@ -0,0 +1,37 @@
+"""Move question1..5 out of surveys into ordered survey_questions."""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS survey_questions (
+        id BIGSERIAL PRIMARY KEY,
+        survey_id BIGINT NOT NULL REFERENCES surveys (id) ON DELETE CASCADE,
+        position SMALLINT NOT NULL,
+        text TEXT NOT NULL,
+        type VARCHAR(7) NOT NULL,
+        CONSTRAINT uq_survey_questions_survey_position UNIQUE (survey_id, position)
+    )
+    """,
+    *(
+        f"""
+        INSERT INTO survey_questions (survey_id, position, text, type)
+        SELECT id, {no}, question{no}, coalesce(nullif(trim(question{no}_type), ''), 'int')
+        FROM surveys
+        WHERE question{no} IS NOT NULL AND trim(question{no}) <> ''
+        ON CONFLICT (survey_id, position) DO NOTHING
+        """
+        for no in range(1, 6)
+    ),
+    *(
+        f"ALTER TABLE surveys DROP COLUMN IF EXISTS question{no}, DROP COLUMN IF EXISTS question{no}_type"
+        for no in range(1, 6)
+    ),
+    "CREATE INDEX IF NOT EXISTS ix_surveys_speciality ON surveys (speciality)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
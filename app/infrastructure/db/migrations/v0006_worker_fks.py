@@ -0,0 +1,76 @@
+"""Reference workers by id from shifts, pairs and answers.
+
+The name columns stay as display labels; the new *_id columns are
+backfilled by matching trimmed, case-insensitive full names.
+"""
+
+from sqlalchemy import text
+
+
+WORKER_KEYS = """
+    SELECT DISTINCT ON (lower(trim(full_name))) id, lower(trim(full_name)) AS name_key
+    FROM workers
+    WHERE full_name IS NOT NULL AND trim(full_name) <> ''
+    ORDER BY lower(trim(full_name)), id
+"""
+
+
+def backfill(table: str, id_column: str, name_column: str) -> str:
+    return f"""
+    UPDATE {table} AS t
+    SET {id_column} = w.id
+    FROM ({WORKER_KEYS}) AS w
+    WHERE t.{id_column} IS NULL AND lower(trim(t.{name_column})) = w.name_key
+    """
+
+
+STATEMENTS = [
+    "ALTER TABLE shifts ADD COLUMN IF NOT EXISTS doctor_id BIGINT",
+    "ALTER TABLE shifts ADD COLUMN IF NOT EXISTS scheduled_assistant_id BIGINT",
+    "ALTER TABLE pairs ADD COLUMN IF NOT EXISTS subject_id BIGINT",
+    "ALTER TABLE pairs ADD COLUMN IF NOT EXISTS object_id BIGINT",
+    "ALTER TABLE answers ADD COLUMN IF NOT EXISTS subject_id BIGINT",
+    "ALTER TABLE answers ADD COLUMN IF NOT EXISTS object_id BIGINT",
+    backfill("shifts", "doctor_id", "doctor_name"),
+    backfill("shifts", "scheduled_assistant_id", "scheduled_assistant_name"),
+    backfill("pairs", "subject_id", "subject"),
+    backfill("pairs", "object_id", "object"),
+    backfill("answers", "subject_id", "subject"),
+    backfill("answers", "object_id", "object"),
+    # assistant_id was never constrained; drop dangling references first.
+    # assistant_name stays: it is the only trace of a deleted worker.
+    """
+    UPDATE shifts SET assistant_id = NULL
+    WHERE assistant_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM workers w WHERE w.id = shifts.assistant_id)
+    """,
+    *(
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_{table}_{column}') THEN
+                ALTER TABLE {table} ADD CONSTRAINT fk_{table}_{column}
+                FOREIGN KEY ({column}) REFERENCES workers (id) ON DELETE SET NULL;
+            END IF;
+        END
+        $$
+        """
+        for table, column in (
+            ("shifts", "assistant_id"),
+            ("shifts", "doctor_id"),
+            ("shifts", "scheduled_assistant_id"),
+            ("pairs", "subject_id"),
+            ("pairs", "object_id"),
+            ("answers", "subject_id"),
+            ("answers", "object_id"),
+        )
+    ),
+    "CREATE INDEX IF NOT EXISTS ix_shifts_doctor_date ON shifts (doctor_id, date, type)",
+    "CREATE INDEX IF NOT EXISTS ix_pairs_subject_id_status ON pairs (subject_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_answers_object_id_date ON answers (object_id, survey_date)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,20 @@
+"""Remember which Telegram file_ids the bot could actually send."""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS media_files (
+        file_id VARCHAR(255) PRIMARY KEY,
+        is_valid BOOLEAN NOT NULL,
+        checked_at TIMESTAMP NOT NULL,
+        error TEXT
+    )
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,18 @@
+"""Index workers by normalized name for keyset-paginated lists.
+
+Pages are ordered by (lower(btrim(full_name)), id) and continue from the
+edge row of the previous page, so every page view reads limit + 1 rows
+from this index instead of the whole table.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_workers_name_key ON workers (lower(btrim(full_name)), id)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
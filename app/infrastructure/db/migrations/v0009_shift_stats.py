@@ -0,0 +1,58 @@
+"""Compute shift counters from shifts instead of copying them from the sheet.
+
+shift_stats_daily holds one row per worker and closed day. It is backfilled
+from the whole shift history here and then extended by the nightly rollup.
+The per-worker counters that sync_workers used to copy go away.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS shift_stats_daily (
+        worker_id BIGINT NOT NULL REFERENCES workers (id) ON DELETE CASCADE,
+        date DATE NOT NULL,
+        shifts INTEGER NOT NULL DEFAULT 0,
+        given INTEGER NOT NULL DEFAULT 0,
+        replacement INTEGER NOT NULL DEFAULT 0,
+        manual INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (worker_id, date)
+    )
+    """,
+    """
+    INSERT INTO shift_stats_daily (worker_id, date, shifts, given, replacement, manual)
+    SELECT worker_id, date, sum(shifts), sum(given), sum(replacement), sum(manual)
+    FROM (
+        SELECT
+            assistant_id AS worker_id,
+            date,
+            1 AS shifts,
+            0 AS given,
+            CASE
+                WHEN scheduled_assistant_id IS NOT NULL AND scheduled_assistant_id <> assistant_id
+                THEN 1 ELSE 0
+            END AS replacement,
+            CASE WHEN manual THEN 1 ELSE 0 END AS manual
+        FROM shifts
+        WHERE assistant_id IS NOT NULL AND date < CURRENT_DATE
+        UNION ALL
+        SELECT scheduled_assistant_id, date, 0, 1, 0, 0
+        FROM shifts
+        WHERE scheduled_assistant_id IS NOT NULL
+          AND assistant_id IS DISTINCT FROM scheduled_assistant_id
+          AND date < CURRENT_DATE
+    ) AS contributions
+    GROUP BY worker_id, date
+    ON CONFLICT (worker_id, date) DO NOTHING
+    """,
+    *(
+        f"ALTER TABLE workers DROP COLUMN IF EXISTS {name}_week, DROP COLUMN IF EXISTS {name}_month"
+        for name in ("shifts", "given", "replacement", "manual")
+    ),
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
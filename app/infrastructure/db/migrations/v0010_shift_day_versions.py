@@ -0,0 +1,46 @@
+"""Version every day of the shift schedule for the in-memory shift board.
+
+A row trigger bumps shift_days.version for the date of every inserted,
+updated or deleted shift, whoever writes it (taps, admin screens, sheet
+sync). Replicas compare their board's version with this counter to find
+out whether someone else changed the day.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS shift_days (
+        date DATE PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION bump_shift_day_version() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.date IS NOT NULL THEN
+            INSERT INTO shift_days (date, version) VALUES (OLD.date, 1)
+            ON CONFLICT (date) DO UPDATE SET version = shift_days.version + 1;
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.date IS NOT NULL
+           AND (TG_OP = 'INSERT' OR NEW.date IS DISTINCT FROM OLD.date) THEN
+            INSERT INTO shift_days (date, version) VALUES (NEW.date, 1)
+            ON CONFLICT (date) DO UPDATE SET version = shift_days.version + 1;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_shifts_day_version ON shifts",
+    """
+    CREATE TRIGGER trg_shifts_day_version
+    AFTER INSERT OR UPDATE OR DELETE ON shifts
+    FOR EACH ROW EXECUTE FUNCTION bump_shift_day_version()
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,72 @@
+"""Archive tables for answers and instrument moves older than the retention.
+
+Rows are moved here in batches by the nightly archive job, keeping answers
+and instrument_moves down to recent history. answer_score_archive keeps the
+score sums of archived answers so all-time averages in the monthly reports
+stay correct without reading the archive.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS answers_archive (
+        id BIGINT PRIMARY KEY,
+        subject TEXT,
+        object TEXT,
+        subject_id BIGINT,
+        object_id BIGINT,
+        survey_id BIGINT,
+        survey TEXT,
+        survey_date DATE,
+        completed_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_answers_archive_object_date ON answers_archive (object, survey_date)",
+    """
+    CREATE TABLE IF NOT EXISTS answer_items_archive (
+        id BIGINT PRIMARY KEY,
+        answer_id BIGINT NOT NULL,
+        question_no SMALLINT NOT NULL,
+        question_text TEXT,
+        int_score SMALLINT,
+        text_value TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_answer_items_archive_answer_id ON answer_items_archive (answer_id)",
+    """
+    CREATE TABLE IF NOT EXISTS answer_score_archive (
+        id BIGSERIAL PRIMARY KEY,
+        object TEXT,
+        survey_id BIGINT,
+        question_no SMALLINT NOT NULL,
+        score_sum BIGINT NOT NULL,
+        score_count BIGINT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS instrument_moves_archive (
+        id BIGINT PRIMARY KEY,
+        instrument_id BIGINT,
+        from_cabinet_id BIGINT,
+        to_cabinet_id BIGINT,
+        before_photo_id VARCHAR(255),
+        after_photo_id VARCHAR(255),
+        moved_by_chat_id VARCHAR(31),
+        moved_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_instrument_moves_archive_instrument_id
+    ON instrument_moves_archive (instrument_id, id)
+    """,
+    # The mover picks old rows by these.
+    "CREATE INDEX IF NOT EXISTS ix_answers_survey_date ON answers (survey_date)",
+    "CREATE INDEX IF NOT EXISTS ix_instrument_moves_moved_at ON instrument_moves (moved_at)",
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -0,0 +1,36 @@
+"""Perceptual hashes of instrument move photos for the evidence pipeline.
+
+One row per move photo (before/after), written by the background pipeline
+once the photo is downloaded. duplicate_of_move_id flags an after photo
+that matches a photo of another move, or the before photo of its own.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS photo_evidence (
+        move_id BIGINT NOT NULL,
+        kind VARCHAR(6) NOT NULL,
+        file_id VARCHAR(255) NOT NULL,
+        file_unique_id VARCHAR(63),
+        phash BIGINT,
+        thumbnail_path TEXT,
+        duplicate_of_move_id BIGINT,
+        error TEXT,
+        processed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (move_id, kind)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_photo_evidence_file_unique_id ON photo_evidence (file_unique_id)",
+    """
+    CREATE INDEX IF NOT EXISTS ix_photo_evidence_duplicates
+    ON photo_evidence (move_id) WHERE duplicate_of_move_id IS NOT NULL
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
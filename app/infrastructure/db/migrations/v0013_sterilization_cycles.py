@@ -0,0 +1,55 @@
+"""Sterilization cycles of instruments.
+
+A cycle opens when an instrument is moved into «Стерилизационная» and
+closes when it is moved out. Open cycles have ended_at NULL; the partial
+indexes keep at most one open cycle per instrument and let the overdue
+check read only the open ones, oldest first. Existing moves are
+backfilled.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS sterilization_cycles (
+        id BIGSERIAL PRIMARY KEY,
+        instrument_id BIGINT NOT NULL,
+        origin_cabinet_id BIGINT,
+        start_move_id BIGINT NOT NULL,
+        started_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        end_move_id BIGINT,
+        ended_at TIMESTAMP WITHOUT TIME ZONE,
+        overdue_notified_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_sterilization_cycles_open
+    ON sterilization_cycles (instrument_id) WHERE ended_at IS NULL
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_sterilization_cycles_open_started
+    ON sterilization_cycles (started_at) WHERE ended_at IS NULL
+    """,
+    """
+    INSERT INTO sterilization_cycles
+        (instrument_id, origin_cabinet_id, start_move_id, started_at, end_move_id, ended_at)
+    SELECT m.instrument_id, m.from_cabinet_id, m.id, m.moved_at, m.next_id, m.next_at
+    FROM (
+        SELECT id, instrument_id, from_cabinet_id, to_cabinet_id, moved_at,
+               LEAD(id) OVER w AS next_id,
+               LEAD(moved_at) OVER w AS next_at
+        FROM instrument_moves
+        WINDOW w AS (PARTITION BY instrument_id ORDER BY id)
+    ) AS m
+    JOIN cabinets AS c ON c.id = m.to_cabinet_id
+    WHERE lower(btrim(c.name)) = 'стерилизационная'
+      AND m.moved_at IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM sterilization_cycles)
+    """,
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
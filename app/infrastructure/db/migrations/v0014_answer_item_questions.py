@@ -0,0 +1,35 @@
+"""Keep the question text on every answer item.
+
+Databases migrated before answer_items had question_text lost the texts
+stored on answers when v0004 dropped question1..5. Their items are filled
+from the survey's current wording once, so later survey edits no longer
+relabel them; items of removed surveys stay without text.
+"""
+
+from sqlalchemy import text
+
+
+STATEMENTS = [
+    "ALTER TABLE answer_items ADD COLUMN IF NOT EXISTS question_text TEXT",
+    "ALTER TABLE answer_items_archive ADD COLUMN IF NOT EXISTS question_text TEXT",
+    *(
+        f"""
+        UPDATE {items} AS i
+        SET question_text = q.text
+        FROM {answers} AS a
+        JOIN survey_questions AS q ON q.survey_id = a.survey_id
+        WHERE i.question_text IS NULL
+          AND a.id = i.answer_id
+          AND q.position = i.question_no
+        """
+        for items, answers in (
+            ("answer_items", "answers"),
+            ("answer_items_archive", "answers_archive"),
+        )
+    ),
+]
+
+
+async def upgrade(conn) -> None:
+    for statement in STATEMENTS:
+        await conn.execute(text(statement))
@@ -1,25 +1,23 @@
-import os
-
-from dotenv import load_dotenv
-from sqlalchemy import BigInteger, String, Text, Column, Boolean, Integer, select
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-
-
-load_dotenv()
-
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-
-
-engine = create_async_engine(
-    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+from sqlalchemy import (
+    BigInteger,
+    String,
+    Text,
+    Column,
+    Boolean,
+    Integer,
+    SmallInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    text,
 )
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import DeclarativeBase
 
-async_session = async_sessionmaker(engine)
+# The schema itself is owned by app/infrastructure/db/migrations; keep these
+# declarations in sync with the latest migration.
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -35,6 +33,11 @@ class AdminUser(Base):
 
 class Worker(Base):
     __tablename__ = "workers"
+    __table_args__ = (
+        Index("ix_workers_chat_id", "chat_id"),
+        Index("ix_workers_full_name", "full_name"),
+        Index("ix_workers_name_key", text("lower(btrim(full_name))"), "id"),
+    )
     id = Column(BigInteger, primary_key=True)
     full_name = Column(Text)
     file_id = Column(String(255))
@@ -42,70 +45,127 @@ class Worker(Base):
     speciality = Column(String(255))
     phone = Column(String(31))
     is_active = Column(Boolean, default=True)
-    shifts_week = Column(Integer, default=0, nullable=False)
-    shifts_month = Column(Integer, default=0, nullable=False)
-    given_week = Column(Integer, default=0, nullable=False)
-    given_month = Column(Integer, default=0, nullable=False)
-    replacement_week = Column(Integer, default=0, nullable=False)
-    replacement_month = Column(Integer, default=0, nullable=False)
-    manual_week = Column(Integer, default=0, nullable=False)
-    manual_month = Column(Integer, default=0, nullable=False)
 
 
 class Pair(Base):
     __tablename__ = "pairs"
+    __table_args__ = (
+        Index("ix_pairs_status_date", "status", "date"),
+        Index("ix_pairs_subject_status", "subject", "status"),
+        Index("ix_pairs_subject_id_status", "subject_id", "status"),
+    )
     id = Column(BigInteger, primary_key=True)
     subject = Column(Text)
     object = Column(Text)
+    subject_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
+    object_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
     survey = Column(Text)
     weekday = Column(String(31))
-    date = Column(String(31))
+    date = Column(Date)
     status = Column(String(15), default="ready")
 
 
 class Survey(Base):
     __tablename__ = "surveys"
+    __table_args__ = (Index("ix_surveys_speciality", "speciality"),)
     id = Column(BigInteger, primary_key=True)
     speciality = Column(String(511))
-    question1 = Column(Text)
-    question1_type = Column(String(7))
-    question2 = Column(Text)
-    question2_type = Column(String(7))
-    question3 = Column(Text)
-    question3_type = Column(String(7))
-    question4 = Column(Text)
-    question4_type = Column(String(7))
-    question5 = Column(Text)
-    question5_type = Column(String(7))
+
+
+class SurveyQuestion(Base):
+    __tablename__ = "survey_questions"
+    __table_args__ = (
+        UniqueConstraint("survey_id", "position", name="uq_survey_questions_survey_position"),
+    )
+    id = Column(BigInteger, primary_key=True)
+    survey_id = Column(BigInteger, ForeignKey("surveys.id", ondelete="CASCADE"), nullable=False)
+    position = Column(SmallInteger, nullable=False)
+    text = Column(Text, nullable=False)
+    type = Column(String(7), nullable=False)
 
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        Index("ix_answers_object_date", "object", "survey_date"),
+        Index("ix_answers_survey_id", "survey_id"),
+        Index("ix_answers_object_id_date", "object_id", "survey_date"),
+        Index("ix_answers_survey_date", "survey_date"),
+    )
+    id = Column(BigInteger, primary_key=True)
+    subject = Column(Text)
+    object = Column(Text)
+    subject_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
+    object_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
+    survey_id = Column(BigInteger)
+    survey = Column(Text)
+    survey_date = Column(Date)
+    completed_at = Column(DateTime)
+
+
+class AnswerItem(Base):
+    __tablename__ = "answer_items"
+    __table_args__ = (
+        UniqueConstraint("answer_id", "question_no", name="uq_answer_items_answer_question"),
+    )
     id = Column(BigInteger, primary_key=True)
+    answer_id = Column(BigInteger, ForeignKey("answers.id", ondelete="CASCADE"), nullable=False)
+    question_no = Column(SmallInteger, nullable=False)
+    question_text = Column(Text)
+    int_score = Column(SmallInteger)
+    text_value = Column(Text)
+
+
+class AnswerArchive(Base):
+    __tablename__ = "answers_archive"
+    __table_args__ = (Index("ix_answers_archive_object_date", "object", "survey_date"),)
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
     subject = Column(Text)
     object = Column(Text)
+    subject_id = Column(BigInteger)
+    object_id = Column(BigInteger)
+    survey_id = Column(BigInteger)
     survey = Column(Text)
-    survey_date = Column(String(31))
-    completed_at = Column(String(63))
-    question1 = Column(Text)
-    answer1 = Column(Text)
-    question2 = Column(Text)
-    answer2 = Column(Text)
-    question3 = Column(Text)
-    answer3 = Column(Text)
-    question4 = Column(Text)
-    answer4 = Column(Text)
-    question5 = Column(Text)
-    answer5 = Column(Text)
+    survey_date = Column(Date)
+    completed_at = Column(DateTime)
+
+
+class AnswerItemArchive(Base):
+    __tablename__ = "answer_items_archive"
+    __table_args__ = (Index("ix_answer_items_archive_answer_id", "answer_id"),)
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    answer_id = Column(BigInteger, nullable=False)
+    question_no = Column(SmallInteger, nullable=False)
+    question_text = Column(Text)
+    int_score = Column(SmallInteger)
+    text_value = Column(Text)
+
+
+class AnswerScoreArchive(Base):
+    # Score sums of archived answers, one row per group and archive batch.
+    __tablename__ = "answer_score_archive"
+    id = Column(BigInteger, primary_key=True)
+    object = Column(Text)
+    survey_id = Column(BigInteger)
+    question_no = Column(SmallInteger, nullable=False)
+    score_sum = Column(BigInteger, nullable=False)
+    score_count = Column(BigInteger, nullable=False)
 
 
 class Shift(Base):
     __tablename__ = "shifts"
+    __table_args__ = (
+        Index("ix_shifts_date_type", "date", "type"),
+        Index("ix_shifts_assistant_date", "assistant_id", "date", "type"),
+        Index("ix_shifts_doctor_date", "doctor_id", "date", "type"),
+    )
     id = Column(BigInteger, primary_key=True)
-    assistant_id = Column(BigInteger)
+    assistant_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
+    doctor_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
     doctor_name = Column(Text)
-    date = Column(String(31))
+    date = Column(Date)
     type = Column(String(10))
+    scheduled_assistant_id = Column(BigInteger, ForeignKey("workers.id", ondelete="SET NULL"))
     scheduled_assistant_name = Column(Text, nullable=True)
     speciality = Column(Text, nullable=True)
     cabinet = Column(Text, nullable=True)
@@ -113,6 +173,25 @@ class Shift(Base):
     manual = Column(Boolean, default=False)
 
 
+class ShiftDay(Base):
+    # Maintained by the trg_shifts_day_version trigger, never written directly.
+    __tablename__ = "shift_days"
+    date = Column(Date, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class ShiftStatsDaily(Base):
+    __tablename__ = "shift_stats_daily"
+    worker_id = Column(
+        BigInteger, ForeignKey("workers.id", ondelete="CASCADE"), primary_key=True
+    )
+    date = Column(Date, primary_key=True)
+    shifts = Column(Integer, nullable=False, default=0)
+    given = Column(Integer, nullable=False, default=0)
+    replacement = Column(Integer, nullable=False, default=0)
+    manual = Column(Integer, nullable=False, default=0)
+
+
 class Cabinet(Base):
     __tablename__ = "cabinets"
     id = Column(BigInteger, primary_key=True)
@@ -122,6 +201,7 @@ class Cabinet(Base):
 
 class Instrument(Base):
     __tablename__ = "instruments"
+    __table_args__ = (Index("ix_instruments_cabinet_id", "cabinet_id"),)
     id = Column(BigInteger, primary_key=True)
     name = Column(Text)
     cabinet_id = Column(BigInteger)
@@ -130,6 +210,10 @@ class Instrument(Base):
 
 class InstrumentMove(Base):
     __tablename__ = "instrument_moves"
+    __table_args__ = (
+        Index("ix_instrument_moves_instrument_id", "instrument_id", "id"),
+        Index("ix_instrument_moves_moved_at", "moved_at"),
+    )
     id = Column(BigInteger, primary_key=True)
     instrument_id = Column(BigInteger)
     from_cabinet_id = Column(BigInteger)
@@ -137,17 +221,73 @@ class InstrumentMove(Base):
     before_photo_id = Column(String(255))
     after_photo_id = Column(String(255))
     moved_by_chat_id = Column(String(31))
-    moved_at = Column(String(63))
+    moved_at = Column(DateTime)
+
 
+class InstrumentMoveArchive(Base):
+    __tablename__ = "instrument_moves_archive"
+    __table_args__ = (
+        Index("ix_instrument_moves_archive_instrument_id", "instrument_id", "id"),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    instrument_id = Column(BigInteger)
+    from_cabinet_id = Column(BigInteger)
+    to_cabinet_id = Column(BigInteger)
+    before_photo_id = Column(String(255))
+    after_photo_id = Column(String(255))
+    moved_by_chat_id = Column(String(31))
+    moved_at = Column(DateTime)
+
+
+class PhotoEvidence(Base):
+    __tablename__ = "photo_evidence"
+    __table_args__ = (
+        Index("ix_photo_evidence_file_unique_id", "file_unique_id"),
+        Index(
+            "ix_photo_evidence_duplicates",
+            "move_id",
+            postgresql_where=text("duplicate_of_move_id IS NOT NULL"),
+        ),
+    )
+    move_id = Column(BigInteger, primary_key=True)
+    kind = Column(String(6), primary_key=True)
+    file_id = Column(String(255), nullable=False)
+    file_unique_id = Column(String(63))
+    phash = Column(BigInteger)
+    thumbnail_path = Column(Text)
+    duplicate_of_move_id = Column(BigInteger)
+    error = Column(Text)
+    processed_at = Column(DateTime, nullable=False)
+
+
+class SterilizationCycle(Base):
+    __tablename__ = "sterilization_cycles"
+    __table_args__ = (
+        Index(
+            "ux_sterilization_cycles_open",
+            "instrument_id",
+            unique=True,
+            postgresql_where=text("ended_at IS NULL"),
+        ),
+        Index(
+            "ix_sterilization_cycles_open_started",
+            "started_at",
+            postgresql_where=text("ended_at IS NULL"),
+        ),
+    )
+    id = Column(BigInteger, primary_key=True)
+    instrument_id = Column(BigInteger, nullable=False)
+    origin_cabinet_id = Column(BigInteger)
+    start_move_id = Column(BigInteger, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    end_move_id = Column(BigInteger)
+    ended_at = Column(DateTime)
+    overdue_notified_at = Column(DateTime)
 
-async def async_main():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
 
-    async with async_session() as session:
-        result = await session.execute(
-            select(Cabinet).where(Cabinet.name == "Стерилизационная")
-        )
-        if result.scalar_one_or_none() is None:
-            session.add(Cabinet(name="Стерилизационная", is_active=True))
-            await session.commit()
+class MediaFile(Base):
+    __tablename__ = "media_files"
+    file_id = Column(String(255), primary_key=True)
+    is_valid = Column(Boolean, nullable=False)
+    checked_at = Column(DateTime, nullable=False)
+    error = Column(Text)
@@ -1,34 +1,77 @@
-from sqlalchemy import select, update, delete, or_
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Sequence
+
+from sqlalchemy import (
+    and_,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import BIT, insert as pg_insert
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import column
+from sqlalchemy.types import BigInteger, Date, String, Text
+
+from app.catalog import CABINETS, INSTRUMENTS, WORKERS, catalog_versions
+from app.date_utils import format_date, format_datetime, parse_date, parse_datetime
 
 from app.domain.entities import AdminUser as AdminUserEntity
 from app.domain.entities import Worker as WorkerEntity
+from app.domain.entities import WorkerPage
 from app.domain.entities import Pair as PairEntity
+from app.domain.entities import PairDispatch
 from app.domain.entities import Survey as SurveyEntity
 from app.domain.entities import Answer as AnswerEntity
 from app.domain.entities import Shift as ShiftEntity
 from app.domain.entities import Cabinet as CabinetEntity
 from app.domain.entities import Instrument as InstrumentEntity
+from app.domain.entities import InstrumentImport
 from app.domain.entities import InstrumentMove as InstrumentMoveEntity
+from app.domain.entities import InventoryItem
+from app.domain.entities import MediaFile as MediaFileEntity
+from app.domain.entities import OverdueSterilization
+from app.domain.entities import PhotoEvidence as PhotoEvidenceEntity
+from app.domain.entities import ScoreSummary, ShiftStats
 from app.domain.repositories import (
     AdminRepository,
+    ArchiveRepository,
     WorkerRepository,
     PairRepository,
     SurveyRepository,
     AnswerRepository,
     ShiftRepository,
+    ShiftStatsRepository,
     CabinetRepository,
     InstrumentRepository,
     InstrumentMoveRepository,
+    MediaRepository,
+    PhotoEvidenceRepository,
+    SterilizationRepository,
 )
+from app.infrastructure.db.engine import async_session
 from app.infrastructure.db.mappers import (
     from_admin_entity,
     from_answer_entity,
+    from_answer_item_entity,
     from_cabinet_entity,
     from_instrument_entity,
     from_instrument_move_entity,
     from_pair_entity,
     from_shift_entity,
     from_survey_entity,
+    from_survey_question_entity,
     from_worker_entity,
     to_admin_entity,
     to_answer_entity,
@@ -43,15 +86,26 @@ from app.infrastructure.db.mappers import (
 from app.infrastructure.db.models import (
     AdminUser as AdminUserModel,
     Answer as AnswerModel,
+    AnswerArchive as AnswerArchiveModel,
+    AnswerItem as AnswerItemModel,
+    AnswerItemArchive as AnswerItemArchiveModel,
+    AnswerScoreArchive as AnswerScoreArchiveModel,
     Cabinet as CabinetModel,
     Instrument as InstrumentModel,
     InstrumentMove as InstrumentMoveModel,
+    InstrumentMoveArchive as InstrumentMoveArchiveModel,
+    MediaFile as MediaFileModel,
+    PhotoEvidence as PhotoEvidenceModel,
     Pair as PairModel,
     Shift as ShiftModel,
+    ShiftDay as ShiftDayModel,
+    ShiftStatsDaily as ShiftStatsDailyModel,
+    SterilizationCycle as SterilizationCycleModel,
     Survey as SurveyModel,
+    SurveyQuestion as SurveyQuestionModel,
     Worker as WorkerModel,
-    async_session,
 )
+from app.text_utils import normalize_text
 
 
 class SqlAlchemyAdminRepository(AdminRepository):
@@ -150,10 +204,86 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
             result = await session.execute(stmt)
             return [to_worker_entity(item) for item in result.scalars().all()]
 
+    @staticmethod
+    def _name_key(model=WorkerModel):
+        # Matches ix_workers_name_key so pages are read straight off the index.
+        return func.lower(func.btrim(model.full_name))
+
+    async def list_page(
+        self,
+        *,
+        after: int | None = None,
+        before: int | None = None,
+        limit: int = 10,
+        active: bool | None = True,
+        speciality: str | None = None,
+        registered: bool | None = None,
+        exclude_chat_ids: Sequence[str] = (),
+    ) -> WorkerPage:
+        name_key = self._name_key()
+        stmt = select(WorkerModel)
+        if active is True:
+            stmt = stmt.where(self._active_clause())
+        elif active is False:
+            stmt = stmt.where(WorkerModel.is_active.is_(False))
+        if speciality is not None:
+            stmt = stmt.where(func.lower(WorkerModel.speciality) == speciality.strip().lower())
+        has_chat = (WorkerModel.chat_id.is_not(None)) & (func.btrim(WorkerModel.chat_id) != "")
+        if registered is True:
+            stmt = stmt.where(has_chat)
+        elif registered is False:
+            stmt = stmt.where(~has_chat)
+        if exclude_chat_ids:
+            stmt = stmt.where(
+                or_(WorkerModel.chat_id.is_(None), WorkerModel.chat_id.not_in(list(exclude_chat_ids)))
+            )
+
+        cursor_id = before if before is not None else after
+        if cursor_id is not None:
+            cursor = aliased(WorkerModel)
+            stmt = stmt.join(cursor, cursor.id == cursor_id)
+            row = tuple_(name_key, WorkerModel.id)
+            cursor_row = tuple_(self._name_key(cursor), cursor.id)
+            stmt = stmt.where(row < cursor_row if before is not None else row > cursor_row)
+
+        backwards = before is not None
+        order = (name_key.desc(), WorkerModel.id.desc()) if backwards else (name_key, WorkerModel.id)
+        stmt = stmt.order_by(*order).limit(limit + 1)
+
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            rows = [to_worker_entity(item) for item in result.scalars().all()]
+
+        if not rows and cursor_id is not None:
+            # The edge worker is gone or the list shrank: start over.
+            return await self.list_page(
+                limit=limit,
+                active=active,
+                speciality=speciality,
+                registered=registered,
+                exclude_chat_ids=exclude_chat_ids,
+            )
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+            return WorkerPage(
+                items=rows,
+                next_cursor=rows[-1].id if rows else None,
+                prev_cursor=rows[0].id if has_more else None,
+            )
+        return WorkerPage(
+            items=rows,
+            next_cursor=rows[-1].id if has_more else None,
+            prev_cursor=rows[0].id if rows and after is not None else None,
+        )
+
     async def add(self, worker: WorkerEntity) -> None:
         async with async_session() as session:
             session.add(from_worker_entity(worker))
             await session.commit()
+            catalog_versions.bump(WORKERS)
 
     async def set_chat_id(self, worker_id: int, chat_id: str) -> bool:
         async with async_session() as session:
@@ -169,6 +299,7 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
             )
             await session.execute(stmt)
             await session.commit()
+            catalog_versions.bump(WORKERS)
             return True
 
     async def clear_chat_id(self, worker_id: int) -> bool:
@@ -178,6 +309,7 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
                 return False
             worker.chat_id = None
             await session.commit()
+            catalog_versions.bump(WORKERS)
             return True
 
     async def set_file_id(self, worker_id: int, file_id: str) -> None:
@@ -194,6 +326,7 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
                 return False
             worker.is_active = is_active
             await session.commit()
+            catalog_versions.bump(WORKERS)
             return True
 
     async def update_from_sync(
@@ -204,14 +337,6 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
         chat_id: str | None,
         speciality: str | None,
         phone: str | None,
-        shifts_week: int,
-        shifts_month: int,
-        given_week: int,
-        given_month: int,
-        replacement_week: int,
-        replacement_month: int,
-        manual_week: int,
-        manual_month: int,
         is_active: bool = True,
     ) -> bool:
         async with async_session() as session:
@@ -223,28 +348,34 @@ class SqlAlchemyWorkerRepository(WorkerRepository):
                     chat_id=chat_id or None,
                     speciality=speciality or None,
                     phone=phone or None,
-                    shifts_week=shifts_week,
-                    shifts_month=shifts_month,
-                    given_week=given_week,
-                    given_month=given_month,
-                    replacement_week=replacement_week,
-                    replacement_month=replacement_month,
-                    manual_week=manual_week,
-                    manual_month=manual_month,
                     is_active=is_active,
                 )
             )
             result = await session.execute(stmt)
             await session.commit()
+            catalog_versions.bump(WORKERS)
             return result.rowcount > 0
 
 
 class SqlAlchemySurveyRepository(SurveyRepository):
+    @staticmethod
+    async def _with_questions(session, model: SurveyModel | None) -> SurveyEntity | None:
+        if model is None:
+            return None
+        result = await session.execute(
+            select(SurveyQuestionModel).where(SurveyQuestionModel.survey_id == model.id)
+        )
+        return to_survey_entity(model, list(result.scalars().all()))
+
     async def get_by_name(self, name: str) -> SurveyEntity | None:
         async with async_session() as session:
-            stmt = select(SurveyModel).where(SurveyModel.speciality == name)
+            stmt = select(SurveyModel).where(SurveyModel.speciality == name).order_by(SurveyModel.id).limit(1)
             result = await session.execute(stmt)
-            return to_survey_entity(result.scalar_one_or_none())
+            return await self._with_questions(session, result.scalar_one_or_none())
+
+    async def get_by_id(self, survey_id: int) -> SurveyEntity | None:
+        async with async_session() as session:
+            return await self._with_questions(session, await session.get(SurveyModel, survey_id))
 
     async def clear_all(self) -> None:
         async with async_session() as session:
@@ -253,21 +384,154 @@ class SqlAlchemySurveyRepository(SurveyRepository):
 
     async def add(self, survey: SurveyEntity) -> None:
         async with async_session() as session:
-            session.add(from_survey_entity(survey))
+            model = from_survey_entity(survey)
+            session.add(model)
+            await session.flush()
+            session.add_all(from_survey_question_entity(item, model.id) for item in survey.questions)
             await session.commit()
 
+    async def replace_all(self, surveys: list[SurveyEntity]) -> None:
+        async with async_session() as session:
+            await session.execute(delete(SurveyModel))
+            for survey in surveys:
+                model = from_survey_entity(survey)
+                session.add(model)
+                await session.flush()
+                session.add_all(from_survey_question_entity(item, model.id) for item in survey.questions)
+            await session.commit()
+
+
+class CachedSurveyRepository(SurveyRepository):
+    """Keeps loaded surveys in memory; they only change on a sheet sync."""
+
+    def __init__(self, inner: SurveyRepository):
+        self.inner = inner
+        self._by_id: dict[int, SurveyEntity] = {}
+        self._id_by_name: dict[str, int] = {}
+
+    def _remember(self, survey: SurveyEntity | None) -> SurveyEntity | None:
+        if survey is not None and survey.id is not None:
+            self._by_id[survey.id] = survey
+            self._id_by_name.setdefault(survey.speciality, survey.id)
+        return survey
+
+    def invalidate(self) -> None:
+        self._by_id.clear()
+        self._id_by_name.clear()
+
+    async def get_by_name(self, name: str) -> SurveyEntity | None:
+        survey_id = self._id_by_name.get(name)
+        if survey_id is not None and survey_id in self._by_id:
+            return self._by_id[survey_id]
+        return self._remember(await self.inner.get_by_name(name))
+
+    async def get_by_id(self, survey_id: int) -> SurveyEntity | None:
+        if survey_id in self._by_id:
+            return self._by_id[survey_id]
+        return self._remember(await self.inner.get_by_id(survey_id))
+
+    async def clear_all(self) -> None:
+        await self.inner.clear_all()
+        self.invalidate()
+
+    async def add(self, survey: SurveyEntity) -> None:
+        await self.inner.add(survey)
+        self.invalidate()
+
+    async def replace_all(self, surveys: list[SurveyEntity]) -> None:
+        await self.inner.replace_all(surveys)
+        self.invalidate()
+
 
 class SqlAlchemyPairRepository(PairRepository):
     async def list_ready_by_date(self, date: str):
         async with async_session() as session:
             stmt = (
                 select(PairModel)
-                .where(PairModel.status == "ready", PairModel.date <= date)
+                .where(PairModel.status == "ready", PairModel.date <= parse_date(date))
                 .order_by(PairModel.id)
             )
             result = await session.execute(stmt)
             return [to_pair_entity(item) for item in result.scalars().all()]
 
+    @staticmethod
+    def _dispatch_query():
+        subject = aliased(WorkerModel)
+        obj = aliased(WorkerModel)
+        return (
+            select(PairModel, subject.chat_id, obj.file_id)
+            .outerjoin(subject, subject.id == PairModel.subject_id)
+            .outerjoin(obj, obj.id == PairModel.object_id)
+        )
+
+    async def claim_first_ready_per_subject(self, date: str) -> list[PairDispatch]:
+        # Oldest ready pair per subject with a chat_id and nothing in progress,
+        # flipped to in_progress and returned with everything the sender needs.
+        subject = aliased(WorkerModel)
+        obj = aliased(WorkerModel)
+        busy = aliased(PairModel)
+        picked = (
+            select(PairModel.id)
+            .join(subject, subject.id == PairModel.subject_id)
+            .where(
+                PairModel.status == "ready",
+                PairModel.date <= parse_date(date),
+                subject.chat_id.is_not(None),
+                subject.chat_id != "",
+                ~select(busy.id)
+                .where(busy.subject_id == PairModel.subject_id, busy.status == "in_progress")
+                .exists(),
+            )
+            .distinct(PairModel.subject_id)
+            .order_by(PairModel.subject_id, PairModel.id)
+            .cte("picked")
+        )
+        claimed = (
+            update(PairModel)
+            # Re-checked on the row itself: a concurrent claim that committed
+            # first leaves it in_progress, and this UPDATE then skips it.
+            .where(PairModel.id.in_(select(picked.c.id)), PairModel.status == "ready")
+            .values(status="in_progress")
+            .returning(PairModel.id)
+            .cte("claimed")
+        )
+        survey_id = (
+            select(func.min(SurveyModel.id))
+            .where(SurveyModel.speciality == PairModel.survey)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(PairModel, subject.chat_id, obj.file_id, survey_id)
+            .join(claimed, claimed.c.id == PairModel.id)
+            .join(subject, subject.id == PairModel.subject_id)
+            .outerjoin(obj, obj.id == PairModel.object_id)
+            .order_by(PairModel.id)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            plan = []
+            for pair, chat_id, file_id, pair_survey_id in result.all():
+                entity = to_pair_entity(pair)
+                # The outer SELECT sees the snapshot taken before the UPDATE.
+                entity.status = "in_progress"
+                plan.append(PairDispatch(entity, chat_id, file_id, pair_survey_id))
+            await session.commit()
+            return plan
+
+    async def next_ready_with_workers(self, subject_id: int) -> PairDispatch | None:
+        async with async_session() as session:
+            stmt = (
+                self._dispatch_query()
+                .where(PairModel.subject_id == subject_id, PairModel.status == "ready")
+                .order_by(PairModel.id)
+                .limit(1)
+            )
+            row = (await session.execute(stmt)).first()
+            if row is None:
+                return None
+            pair, chat_id, file_id = row
+            return PairDispatch(to_pair_entity(pair), chat_id, file_id)
+
     async def next_ready_for_subject(self, subject: str) -> PairEntity | None:
         async with async_session() as session:
             stmt = (
@@ -313,13 +577,116 @@ class SqlAlchemyPairRepository(PairRepository):
 class SqlAlchemyAnswerRepository(AnswerRepository):
     async def save(self, answer: AnswerEntity) -> None:
         async with async_session() as session:
-            session.add(from_answer_entity(answer))
+            model = from_answer_entity(answer)
+            session.add(model)
+            await session.flush()
+            session.add_all(from_answer_item_entity(item, model.id) for item in answer.items)
             await session.commit()
 
     async def list_all(self):
         async with async_session() as session:
-            result = await session.execute(select(AnswerModel))
-            return [to_answer_entity(item) for item in result.scalars().all()]
+            answers = (await session.execute(select(AnswerModel).order_by(AnswerModel.id))).scalars().all()
+            items = (
+                await session.execute(
+                    select(AnswerItemModel).order_by(AnswerItemModel.answer_id, AnswerItemModel.question_no)
+                )
+            ).scalars().all()
+            items_by_answer = defaultdict(list)
+            for item in items:
+                items_by_answer[item.answer_id].append(item)
+            return [to_answer_entity(answer, items_by_answer[answer.id]) for answer in answers]
+
+    async def summarize_scores(self, month_since: str, half_year_since: str) -> list[ScoreSummary]:
+        """Score averages per object, survey and question.
+
+        Month and half-year windows read the hot answers table only; the
+        all-time figures add the sums kept for archived answers.
+        """
+        month = parse_date(month_since)
+        half_year = parse_date(half_year_since)
+        score = AnswerItemModel.int_score
+        hot = (
+            select(
+                AnswerModel.object.label("object"),
+                AnswerModel.survey_id.label("survey_id"),
+                AnswerItemModel.question_no.label("question_no"),
+                func.sum(score).filter(AnswerModel.survey_date >= month).label("month_sum"),
+                func.count(score).filter(AnswerModel.survey_date >= month).label("month_count"),
+                func.sum(score).filter(AnswerModel.survey_date >= half_year).label("half_sum"),
+                func.count(score).filter(AnswerModel.survey_date >= half_year).label("half_count"),
+                func.sum(score).label("all_sum"),
+                func.count(score).label("all_count"),
+            )
+            .join(AnswerItemModel, AnswerItemModel.answer_id == AnswerModel.id)
+            .where(score.between(1, 5), AnswerModel.survey_date.is_not(None))
+            .group_by(AnswerModel.object, AnswerModel.survey_id, AnswerItemModel.question_no)
+        )
+        archived = select(
+            AnswerScoreArchiveModel.object,
+            AnswerScoreArchiveModel.survey_id,
+            AnswerScoreArchiveModel.question_no,
+            literal(None),
+            literal(0),
+            literal(None),
+            literal(0),
+            AnswerScoreArchiveModel.score_sum,
+            AnswerScoreArchiveModel.score_count,
+        )
+        rows = union_all(hot, archived).subquery()
+        key = (rows.c.object, rows.c.survey_id, rows.c.question_no)
+        stmt = (
+            select(
+                *key,
+                func.sum(rows.c.month_sum),
+                func.sum(rows.c.month_count),
+                func.sum(rows.c.half_sum),
+                func.sum(rows.c.half_count),
+                func.sum(rows.c.all_sum),
+                func.sum(rows.c.all_count),
+            )
+            .group_by(*key)
+            .order_by(*key)
+        )
+
+        def average(total, count) -> float | None:
+            return float(total) / float(count) if count else None
+
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            return [
+                ScoreSummary(
+                    object=row[0],
+                    survey_id=row[1],
+                    question_no=row[2],
+                    month_avg=average(row[3], row[4]),
+                    month_count=int(row[4]),
+                    half_year_avg=average(row[5], row[6]),
+                    half_year_count=int(row[6]),
+                    all_time_avg=average(row[7], row[8]),
+                    all_time_count=int(row[8]),
+                )
+                for row in result.all()
+            ]
+
+    async def list_open_answers(self, since: str) -> list[tuple[str, int | None, int, str]]:
+        stmt = (
+            select(
+                AnswerModel.object,
+                AnswerModel.survey_id,
+                AnswerItemModel.question_no,
+                AnswerItemModel.text_value,
+            )
+            .join(AnswerItemModel, AnswerItemModel.answer_id == AnswerModel.id)
+            .where(
+                AnswerItemModel.text_value.is_not(None),
+                func.trim(AnswerItemModel.text_value) != "",
+                AnswerModel.survey_date >= parse_date(since),
+            )
+            .order_by(AnswerModel.id, AnswerItemModel.question_no)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
 
 
 class SqlAlchemyShiftRepository(ShiftRepository):
@@ -329,7 +696,10 @@ class SqlAlchemyShiftRepository(ShiftRepository):
             await session.commit()
 
     async def bulk_insert(
-        self, records: list[tuple[str, str, str, str | None, str | None, str | None]]
+        self,
+        records: list[
+            tuple[str, str, str, str | None, str | None, str | None, int | None, int | None]
+        ],
     ) -> None:
         async with async_session() as session:
             for (
@@ -339,11 +709,15 @@ class SqlAlchemyShiftRepository(ShiftRepository):
                 scheduled_assistant_name,
                 speciality,
                 cabinet,
+                doctor_id,
+                scheduled_assistant_id,
             ) in records:
                 session.add(
                     ShiftModel(
+                        doctor_id=doctor_id,
+                        scheduled_assistant_id=scheduled_assistant_id,
                         doctor_name=doctor_name,
-                        date=date,
+                        date=parse_date(date),
                         type=shift_type,
                         scheduled_assistant_name=scheduled_assistant_name,
                         speciality=speciality,
@@ -357,7 +731,7 @@ class SqlAlchemyShiftRepository(ShiftRepository):
         async with async_session() as session:
             result = await session.execute(
                 select(ShiftModel.id, ShiftModel.doctor_name).where(
-                    ShiftModel.date == date,
+                    ShiftModel.date == parse_date(date),
                     ShiftModel.type == shift_type,
                     ShiftModel.assistant_id.is_(None),
                 )
@@ -374,25 +748,26 @@ class SqlAlchemyShiftRepository(ShiftRepository):
             result = await session.execute(
                 select(ShiftModel).where(
                     ShiftModel.assistant_id == assistant_id,
-                    ShiftModel.date == date,
+                    ShiftModel.date == parse_date(date),
                     ShiftModel.type == shift_type,
                 )
             )
             return to_shift_entity(result.scalar_one_or_none())
 
-    async def remove_assistant(self, assistant_id: int, date: str, shift_type: str) -> None:
+    async def remove_assistant(self, assistant_id: int, date: str, shift_type: str) -> int:
         async with async_session() as session:
             stmt = (
                 update(ShiftModel)
                 .where(
                     ShiftModel.assistant_id == assistant_id,
-                    ShiftModel.date == date,
+                    ShiftModel.date == parse_date(date),
                     ShiftModel.type == shift_type,
                 )
                 .values(assistant_id=None, assistant_name=None)
             )
-            await session.execute(stmt)
+            result = await session.execute(stmt)
             await session.commit()
+            return result.rowcount
 
     async def add_by_id(self, assistant_id: int, assistant_name: str, shift_id: int) -> bool:
         async with async_session() as session:
@@ -423,51 +798,107 @@ class SqlAlchemyShiftRepository(ShiftRepository):
         doctor_name: str,
         shift_type: str,
         date: str,
-    ) -> bool:
+        doctor_id: int | None = None,
+    ) -> int | None:
         async with async_session() as session:
             already = await session.execute(
                 select(ShiftModel).where(
                     ShiftModel.assistant_id == assistant_id,
-                    ShiftModel.date == date,
+                    ShiftModel.date == parse_date(date),
                     ShiftModel.type == shift_type,
                 )
             )
             if already.scalar_one_or_none():
-                return False
+                return None
 
             shift = ShiftModel(
                 assistant_id=assistant_id,
                 assistant_name=assistant_name,
+                doctor_id=doctor_id,
                 doctor_name=doctor_name,
                 type=shift_type,
-                date=date,
+                date=parse_date(date),
                 manual=True,
             )
             session.add(shift)
+            await session.flush()
+            shift_id = shift.id
             await session.commit()
-            return True
+            return shift_id
 
-    async def add_slot(self, doctor_name: str, date: str, shift_type: str) -> bool:
+    async def add_slot(
+        self, doctor_name: str, date: str, shift_type: str, doctor_id: int | None = None
+    ) -> int | None:
         async with async_session() as session:
             existing = await session.execute(
                 select(ShiftModel.id).where(
                     ShiftModel.doctor_name == doctor_name,
-                    ShiftModel.date == date,
+                    ShiftModel.date == parse_date(date),
                     ShiftModel.type == shift_type,
                 )
             )
             if existing.scalar_one_or_none():
-                return False
+                return None
 
             shift = ShiftModel(
+                doctor_id=doctor_id,
                 doctor_name=doctor_name,
-                date=date,
+                date=parse_date(date),
                 type=shift_type,
                 manual=False,
             )
             session.add(shift)
+            await session.flush()
+            shift_id = shift.id
             await session.commit()
-            return True
+            return shift_id
+
+    async def add_slots(
+        self, records: list[tuple[str, str, str, int | None]]
+    ) -> list[tuple[int, str, str]]:
+        """Inserts free slots in one statement, skipping ones that already exist.
+
+        Records are (doctor_name, date, shift_type, doctor_id); returns
+        (id, date, shift_type) of the slots actually created.
+        """
+        if not records:
+            return []
+        slots = values(
+            column("doctor_name", Text),
+            column("date", Date),
+            column("type", String),
+            column("doctor_id", BigInteger),
+            name="slots",
+        ).data(
+            [
+                (doctor_name, parse_date(date), shift_type, doctor_id)
+                for doctor_name, date, shift_type, doctor_id in records
+            ]
+        )
+        taken = select(ShiftModel.id).where(
+            ShiftModel.doctor_name == slots.c.doctor_name,
+            ShiftModel.date == slots.c.date,
+            ShiftModel.type == slots.c.type,
+        )
+        stmt = (
+            insert(ShiftModel)
+            .from_select(
+                ["doctor_name", "date", "type", "doctor_id", "manual"],
+                select(
+                    slots.c.doctor_name,
+                    slots.c.date,
+                    slots.c.type,
+                    slots.c.doctor_id,
+                    literal(False),
+                ).where(~exists(taken)),
+            )
+            .returning(ShiftModel.id, ShiftModel.date, ShiftModel.type)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            created = [(row.id, format_date(row.date), row.type) for row in result.all()]
+            await session.commit()
+            return created
 
     async def delete_by_id(self, shift_id: int) -> bool:
         async with async_session() as session:
@@ -481,7 +912,7 @@ class SqlAlchemyShiftRepository(ShiftRepository):
     async def list_by_date(self, date: str):
         async with async_session() as session:
             result = await session.execute(
-                select(ShiftModel).where(ShiftModel.date == date)
+                select(ShiftModel).where(ShiftModel.date == parse_date(date))
             )
             return [to_shift_entity(item) for item in result.scalars().all()]
 
@@ -490,6 +921,220 @@ class SqlAlchemyShiftRepository(ShiftRepository):
             result = await session.execute(select(ShiftModel))
             return [to_shift_entity(item) for item in result.scalars().all()]
 
+    @staticmethod
+    def _day_version(date):
+        return select(func.coalesce(func.max(ShiftDayModel.version), 0)).where(
+            ShiftDayModel.date == date
+        )
+
+    async def get_day_version(self, date: str) -> int:
+        async with async_session() as session:
+            return await session.scalar(self._day_version(parse_date(date)))
+
+    async def list_day(self, date: str) -> tuple[int, list[ShiftEntity]]:
+        day = parse_date(date)
+        async with async_session() as session:
+            # Version first: a write landing in between makes the board look
+            # older than it is, so it is reloaded again rather than kept stale.
+            version = await session.scalar(self._day_version(day))
+            result = await session.execute(select(ShiftModel).where(ShiftModel.date == day))
+            return version, [to_shift_entity(item) for item in result.scalars().all()]
+
+
+# pg_advisory_xact_lock key so replicas running the nightly rollup take turns.
+SHIFT_STATS_LOCK_KEY = 7_240_031_038
+
+
+class SqlAlchemyArchiveRepository(ArchiveRepository):
+    """Moves old answers and instrument moves to their *_archive tables.
+
+    Each call moves at most ``limit`` rows in one transaction, so the
+    nightly job can loop without holding long locks on the hot tables.
+    """
+
+    @staticmethod
+    def _copy(target, source, where):
+        names = [column.name for column in source.__table__.columns]
+        return insert(target).from_select(
+            names, select(*(source.__table__.c[name] for name in names)).where(where)
+        )
+
+    async def archive_answers(self, before: str, limit: int) -> int:
+        cutoff = parse_date(before)
+        old = or_(
+            AnswerModel.survey_date < cutoff,
+            and_(AnswerModel.survey_date.is_(None), AnswerModel.completed_at < cutoff),
+        )
+        batch = (
+            select(AnswerModel.id)
+            .where(old)
+            .order_by(AnswerModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        score = AnswerItemModel.int_score
+        async with async_session() as session:
+            ids = list((await session.execute(batch)).scalars())
+            if not ids:
+                return 0
+            # Same filter as summarize_scores, so all-time averages do not move.
+            totals = (
+                select(
+                    AnswerModel.object,
+                    AnswerModel.survey_id,
+                    AnswerItemModel.question_no,
+                    func.sum(score),
+                    func.count(score),
+                )
+                .join(AnswerItemModel, AnswerItemModel.answer_id == AnswerModel.id)
+                .where(
+                    AnswerModel.id.in_(ids),
+                    score.between(1, 5),
+                    AnswerModel.survey_date.is_not(None),
+                )
+                .group_by(AnswerModel.object, AnswerModel.survey_id, AnswerItemModel.question_no)
+            )
+            await session.execute(
+                insert(AnswerScoreArchiveModel).from_select(
+                    ["object", "survey_id", "question_no", "score_sum", "score_count"], totals
+                )
+            )
+            await session.execute(
+                self._copy(AnswerItemArchiveModel, AnswerItemModel, AnswerItemModel.answer_id.in_(ids))
+            )
+            await session.execute(self._copy(AnswerArchiveModel, AnswerModel, AnswerModel.id.in_(ids)))
+            # answer_items go with their answers (ON DELETE CASCADE).
+            await session.execute(delete(AnswerModel).where(AnswerModel.id.in_(ids)))
+            await session.commit()
+            return len(ids)
+
+    async def archive_moves(self, before: str, limit: int) -> int:
+        later = aliased(InstrumentMoveModel)
+        latest_id = (
+            select(func.max(later.id))
+            .where(later.instrument_id == InstrumentMoveModel.instrument_id)
+            .scalar_subquery()
+        )
+        batch = (
+            select(InstrumentMoveModel.id)
+            .where(
+                InstrumentMoveModel.moved_at < parse_date(before),
+                # The last move of every instrument stays: transfers and the
+                # inventory read it.
+                InstrumentMoveModel.id < latest_id,
+            )
+            .order_by(InstrumentMoveModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with async_session() as session:
+            ids = list((await session.execute(batch)).scalars())
+            if not ids:
+                return 0
+            await session.execute(
+                self._copy(
+                    InstrumentMoveArchiveModel, InstrumentMoveModel, InstrumentMoveModel.id.in_(ids)
+                )
+            )
+            await session.execute(delete(InstrumentMoveModel).where(InstrumentMoveModel.id.in_(ids)))
+            await session.commit()
+            return len(ids)
+
+
+class SqlAlchemyShiftStatsRepository(ShiftStatsRepository):
+    @staticmethod
+    def _daily_rollup(start, end):
+        worked = select(
+            ShiftModel.assistant_id.label("worker_id"),
+            ShiftModel.date.label("date"),
+            literal(1).label("shifts"),
+            literal(0).label("given"),
+            case(
+                (
+                    and_(
+                        ShiftModel.scheduled_assistant_id.is_not(None),
+                        ShiftModel.scheduled_assistant_id != ShiftModel.assistant_id,
+                    ),
+                    1,
+                ),
+                else_=0,
+            ).label("replacement"),
+            case((ShiftModel.manual.is_(True), 1), else_=0).label("manual"),
+        ).where(ShiftModel.assistant_id.is_not(None), ShiftModel.date.between(start, end))
+        # A scheduled shift someone else took (or nobody did) counts as given away.
+        given = select(
+            ShiftModel.scheduled_assistant_id,
+            ShiftModel.date,
+            literal(0),
+            literal(1),
+            literal(0),
+            literal(0),
+        ).where(
+            ShiftModel.scheduled_assistant_id.is_not(None),
+            ShiftModel.assistant_id.is_distinct_from(ShiftModel.scheduled_assistant_id),
+            ShiftModel.date.between(start, end),
+        )
+        rows = union_all(worked, given).subquery()
+        return select(
+            rows.c.worker_id,
+            rows.c.date,
+            func.sum(rows.c.shifts),
+            func.sum(rows.c.given),
+            func.sum(rows.c.replacement),
+            func.sum(rows.c.manual),
+        ).group_by(rows.c.worker_id, rows.c.date)
+
+    async def roll_up(self, until: str) -> int:
+        """Recomputes daily rows from the last rolled-up day through ``until``.
+
+        Earlier days are closed and stay as they are, so a nightly run only
+        scans the shifts of the days it has not seen yet.
+        """
+        end = parse_date(until)
+        async with async_session() as session:
+            await session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SHIFT_STATS_LOCK_KEY}
+            )
+            start = await session.scalar(select(func.max(ShiftStatsDailyModel.date)))
+            if start is None:
+                start = await session.scalar(select(func.min(ShiftModel.date)))
+            if start is None or start > end:
+                return 0
+            await session.execute(
+                delete(ShiftStatsDailyModel).where(ShiftStatsDailyModel.date.between(start, end))
+            )
+            result = await session.execute(
+                insert(ShiftStatsDailyModel).from_select(
+                    ["worker_id", "date", "shifts", "given", "replacement", "manual"],
+                    self._daily_rollup(start, end),
+                )
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def get_for_worker(
+        self, worker_id: int, week_since: str, month_since: str, until: str
+    ) -> tuple[ShiftStats, ShiftStats]:
+        week_start = parse_date(week_since)
+        in_week = ShiftStatsDailyModel.date >= week_start
+        columns = (
+            ShiftStatsDailyModel.shifts,
+            ShiftStatsDailyModel.given,
+            ShiftStatsDailyModel.replacement,
+            ShiftStatsDailyModel.manual,
+        )
+        stmt = select(
+            *(func.coalesce(func.sum(column).filter(in_week), 0) for column in columns),
+            *(func.coalesce(func.sum(column), 0) for column in columns),
+        ).where(
+            ShiftStatsDailyModel.worker_id == worker_id,
+            ShiftStatsDailyModel.date >= parse_date(month_since),
+            ShiftStatsDailyModel.date <= parse_date(until),
+        )
+        async with async_session() as session:
+            row = (await session.execute(stmt)).one()
+        return ShiftStats(*row[:4]), ShiftStats(*row[4:])
+
 
 class SqlAlchemyCabinetRepository(CabinetRepository):
     async def list_all(self, include_archived: bool = False):
@@ -509,6 +1154,7 @@ class SqlAlchemyCabinetRepository(CabinetRepository):
         async with async_session() as session:
             session.add(from_cabinet_entity(cabinet))
             await session.commit()
+            catalog_versions.bump(CABINETS)
 
     async def update_name(self, cabinet_id: int, name: str) -> bool:
         async with async_session() as session:
@@ -517,6 +1163,7 @@ class SqlAlchemyCabinetRepository(CabinetRepository):
                 return False
             cabinet.name = name
             await session.commit()
+            catalog_versions.bump(CABINETS)
             return True
 
     async def set_active(self, cabinet_id: int, is_active: bool) -> bool:
@@ -526,6 +1173,7 @@ class SqlAlchemyCabinetRepository(CabinetRepository):
                 return False
             cabinet.is_active = is_active
             await session.commit()
+            catalog_versions.bump(CABINETS)
             return True
 
     async def delete(self, cabinet_id: int) -> bool:
@@ -535,6 +1183,7 @@ class SqlAlchemyCabinetRepository(CabinetRepository):
                 return False
             await session.delete(cabinet)
             await session.commit()
+            catalog_versions.bump(CABINETS)
             return True
 
     async def has_instruments(self, cabinet_id: int) -> bool:
@@ -548,6 +1197,14 @@ class SqlAlchemyCabinetRepository(CabinetRepository):
 
 
 class SqlAlchemyInstrumentRepository(InstrumentRepository):
+    async def list_all(self, include_archived: bool = False):
+        async with async_session() as session:
+            stmt = select(InstrumentModel).order_by(InstrumentModel.name, InstrumentModel.id)
+            if not include_archived:
+                stmt = stmt.where(InstrumentModel.is_active.is_(True))
+            result = await session.execute(stmt)
+            return [to_instrument_entity(item) for item in result.scalars().all()]
+
     async def list_by_cabinet(self, cabinet_id: int, include_archived: bool = False):
         async with async_session() as session:
             stmt = (
@@ -565,6 +1222,202 @@ class SqlAlchemyInstrumentRepository(InstrumentRepository):
             instrument = await session.get(InstrumentModel, instrument_id)
             return to_instrument_entity(instrument)
 
+    async def transfer(
+        self,
+        move: InstrumentMoveEntity,
+        check: Callable[
+            [
+                InstrumentEntity,
+                CabinetEntity | None,
+                InstrumentMoveEntity | None,
+                CabinetEntity | None,
+            ],
+            str | None,
+        ],
+        sterilization_cabinet_name: str,
+    ) -> str | None:
+        """Moves the instrument and logs the move in one transaction.
+
+        The instrument row is locked first, so ``check`` sees its current
+        cabinet, the target cabinet, its last move and the active cabinet
+        named ``sterilization_cabinet_name``, all on one connection, and a
+        concurrent transfer of the same instrument waits until this one
+        commits. Moves into or out of the sterilization cabinet open or
+        close its sterilization cycle in the same transaction. Returns
+        ``check``'s failure reason, "instrument_not_found", or None once the
+        move is saved.
+        """
+        async with async_session() as session:
+            instrument = (
+                await session.execute(
+                    select(InstrumentModel)
+                    .where(InstrumentModel.id == move.instrument_id)
+                    .with_for_update()
+                )
+            ).scalar_one_or_none()
+            if instrument is None:
+                return "instrument_not_found"
+            target = await session.get(CabinetModel, move.to_cabinet_id)
+            sterilization = None
+            active_cabinets = await session.execute(
+                select(CabinetModel)
+                .where(CabinetModel.is_active.is_(True))
+                .order_by(CabinetModel.name)
+            )
+            for cabinet in active_cabinets.scalars():
+                if cabinet.name and normalize_text(cabinet.name) == normalize_text(
+                    sterilization_cabinet_name
+                ):
+                    sterilization = cabinet
+                    break
+            last_move = (
+                await session.execute(
+                    select(InstrumentMoveModel)
+                    .where(InstrumentMoveModel.instrument_id == move.instrument_id)
+                    .order_by(InstrumentMoveModel.id.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            reason = check(
+                to_instrument_entity(instrument),
+                to_cabinet_entity(target),
+                to_instrument_move_entity(last_move),
+                to_cabinet_entity(sterilization),
+            )
+            if reason is not None:
+                await session.rollback()
+                return reason
+            instrument.cabinet_id = move.to_cabinet_id
+            move_model = from_instrument_move_entity(move)
+            session.add(move_model)
+            if sterilization is not None and sterilization.id in (
+                move.from_cabinet_id,
+                move.to_cabinet_id,
+            ):
+                await session.flush()
+                await self._track_sterilization(session, move_model, sterilization.id)
+            await session.commit()
+        catalog_versions.bump(INSTRUMENTS)
+        return None
+
+    @staticmethod
+    async def _track_sterilization(
+        session, move: InstrumentMoveModel, sterilization_cabinet_id: int
+    ) -> None:
+        await session.execute(
+            update(SterilizationCycleModel)
+            .where(
+                SterilizationCycleModel.instrument_id == move.instrument_id,
+                SterilizationCycleModel.ended_at.is_(None),
+            )
+            .values(end_move_id=move.id, ended_at=move.moved_at)
+        )
+        if move.to_cabinet_id == sterilization_cabinet_id:
+            session.add(
+                SterilizationCycleModel(
+                    instrument_id=move.instrument_id,
+                    origin_cabinet_id=move.from_cabinet_id,
+                    start_move_id=move.id,
+                    started_at=move.moved_at,
+                )
+            )
+
+    async def apply_import(self, plan: InstrumentImport) -> None:
+        """Applies an import plan in one transaction.
+
+        New instruments are placed in cabinets looked up by normalized name,
+        including the cabinets this plan creates.
+        """
+        async with async_session() as session:
+            if plan.restored_cabinets:
+                await session.execute(
+                    update(CabinetModel)
+                    .where(CabinetModel.id.in_([item.id for item in plan.restored_cabinets]))
+                    .values(is_active=True)
+                )
+            if plan.new_cabinets:
+                await session.execute(
+                    insert(CabinetModel),
+                    [{"name": name, "is_active": True} for name in plan.new_cabinets],
+                )
+            if plan.created:
+                cabinet_ids: dict[str, int] = {}
+                rows = await session.execute(
+                    select(CabinetModel.id, CabinetModel.name).order_by(CabinetModel.id)
+                )
+                for cabinet_id, name in rows.all():
+                    cabinet_ids.setdefault(normalize_text(name), cabinet_id)
+                await session.execute(
+                    insert(InstrumentModel),
+                    [
+                        {
+                            "name": name,
+                            "cabinet_id": cabinet_ids[normalize_text(cabinet)],
+                            "is_active": True,
+                        }
+                        for cabinet, name in plan.created
+                    ],
+                )
+            if plan.renamed:
+                await session.execute(
+                    update(InstrumentModel),
+                    [{"id": instrument.id, "name": name} for instrument, name in plan.renamed],
+                )
+            for instruments, is_active in ((plan.restored, True), (plan.archived, False)):
+                if instruments:
+                    await session.execute(
+                        update(InstrumentModel)
+                        .where(InstrumentModel.id.in_([item.id for item in instruments]))
+                        .values(is_active=is_active)
+                    )
+            await session.commit()
+        if plan.new_cabinets or plan.restored_cabinets:
+            catalog_versions.bump(CABINETS)
+        catalog_versions.bump(INSTRUMENTS)
+
+    async def list_inventory(self) -> list[InventoryItem]:
+        """Every active instrument with its cabinet and last move, in one query."""
+        last_move = (
+            select(InstrumentMoveModel.moved_at, InstrumentMoveModel.moved_by_chat_id)
+            .where(InstrumentMoveModel.instrument_id == InstrumentModel.id)
+            .order_by(InstrumentMoveModel.id.desc())
+            .limit(1)
+            .lateral("last_move")
+        )
+        mover_name = (
+            select(WorkerModel.full_name)
+            .where(WorkerModel.chat_id == last_move.c.moved_by_chat_id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(
+                InstrumentModel.id,
+                InstrumentModel.name,
+                InstrumentModel.cabinet_id,
+                CabinetModel.name,
+                last_move.c.moved_at,
+                func.coalesce(mover_name, last_move.c.moved_by_chat_id),
+            )
+            .outerjoin(CabinetModel, CabinetModel.id == InstrumentModel.cabinet_id)
+            .outerjoin(last_move, literal(True))
+            .where(InstrumentModel.is_active.is_(True))
+            .order_by(CabinetModel.name, InstrumentModel.name, InstrumentModel.id)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            return [
+                InventoryItem(
+                    instrument_id=row[0],
+                    instrument_name=row[1],
+                    cabinet_id=row[2],
+                    cabinet_name=row[3],
+                    last_moved_at=format_datetime(row[4]),
+                    moved_by=row[5],
+                )
+                for row in result.all()
+            ]
+
     async def update_cabinet(self, instrument_id: int, cabinet_id: int) -> bool:
         async with async_session() as session:
             instrument = await session.get(InstrumentModel, instrument_id)
@@ -572,12 +1425,14 @@ class SqlAlchemyInstrumentRepository(InstrumentRepository):
                 return False
             instrument.cabinet_id = cabinet_id
             await session.commit()
+            catalog_versions.bump(INSTRUMENTS)
             return True
 
     async def add(self, instrument: InstrumentEntity) -> None:
         async with async_session() as session:
             session.add(from_instrument_entity(instrument))
             await session.commit()
+            catalog_versions.bump(INSTRUMENTS)
 
     async def update_name(self, instrument_id: int, name: str) -> bool:
         async with async_session() as session:
@@ -586,6 +1441,7 @@ class SqlAlchemyInstrumentRepository(InstrumentRepository):
                 return False
             instrument.name = name
             await session.commit()
+            catalog_versions.bump(INSTRUMENTS)
             return True
 
     async def set_active(self, instrument_id: int, is_active: bool) -> bool:
@@ -595,6 +1451,7 @@ class SqlAlchemyInstrumentRepository(InstrumentRepository):
                 return False
             instrument.is_active = is_active
             await session.commit()
+            catalog_versions.bump(INSTRUMENTS)
             return True
 
     async def delete(self, instrument_id: int) -> bool:
@@ -604,6 +1461,7 @@ class SqlAlchemyInstrumentRepository(InstrumentRepository):
                 return False
             await session.delete(instrument)
             await session.commit()
+            catalog_versions.bump(INSTRUMENTS)
             return True
 
 
@@ -636,3 +1494,169 @@ class SqlAlchemyInstrumentMoveRepository(InstrumentMoveRepository):
         async with async_session() as session:
             move = await session.get(InstrumentMoveModel, move_id)
             return to_instrument_move_entity(move)
+
+
+class SqlAlchemySterilizationRepository(SterilizationRepository):
+    async def claim_overdue(
+        self, started_before: str, limit: int = 100
+    ) -> list[OverdueSterilization]:
+        """Claims open cycles started before ``started_before`` that were not reported yet.
+
+        Reads the open-cycle index only, oldest first. The claimed rows are
+        marked notified in the same transaction and locked rows are skipped,
+        so each cycle is returned to exactly one caller across replicas.
+        """
+        stmt = (
+            select(
+                SterilizationCycleModel.id,
+                SterilizationCycleModel.instrument_id,
+                InstrumentModel.name,
+                CabinetModel.name,
+                SterilizationCycleModel.started_at,
+            )
+            .join(InstrumentModel, InstrumentModel.id == SterilizationCycleModel.instrument_id)
+            .outerjoin(CabinetModel, CabinetModel.id == SterilizationCycleModel.origin_cabinet_id)
+            .where(
+                SterilizationCycleModel.ended_at.is_(None),
+                SterilizationCycleModel.started_at < parse_datetime(started_before),
+                SterilizationCycleModel.overdue_notified_at.is_(None),
+                InstrumentModel.is_active.is_(True),
+            )
+            .order_by(SterilizationCycleModel.started_at)
+            .limit(limit)
+            .with_for_update(of=SterilizationCycleModel, skip_locked=True)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            items = [
+                OverdueSterilization(
+                    cycle_id=cycle_id,
+                    instrument_id=instrument_id,
+                    instrument_name=instrument_name,
+                    origin_cabinet_name=cabinet_name,
+                    started_at=format_datetime(started_at),
+                )
+                for cycle_id, instrument_id, instrument_name, cabinet_name, started_at in result.all()
+            ]
+            if items:
+                await session.execute(
+                    update(SterilizationCycleModel)
+                    .where(SterilizationCycleModel.id.in_([item.cycle_id for item in items]))
+                    .values(overdue_notified_at=datetime.now())
+                )
+            await session.commit()
+            return items
+
+
+class SqlAlchemyPhotoEvidenceRepository(PhotoEvidenceRepository):
+    async def list_pending_moves(self, limit: int = 100) -> list[InstrumentMoveEntity]:
+        """Moves with photos that the evidence pipeline has not seen yet, oldest first."""
+        seen = select(PhotoEvidenceModel.move_id).where(
+            PhotoEvidenceModel.move_id == InstrumentMoveModel.id
+        )
+        stmt = (
+            select(InstrumentMoveModel)
+            .where(
+                or_(
+                    InstrumentMoveModel.before_photo_id.is_not(None),
+                    InstrumentMoveModel.after_photo_id.is_not(None),
+                ),
+                ~exists(seen),
+            )
+            .order_by(InstrumentMoveModel.id)
+            .limit(limit)
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            return [to_instrument_move_entity(item) for item in result.scalars().all()]
+
+    async def find_duplicate(
+        self, move_id: int, file_unique_id: str | None, phash: int | None, max_distance: int
+    ) -> int | None:
+        """Move whose photo is the same file or within ``max_distance`` bits of ``phash``.
+
+        Photos of ``move_id`` itself only count when they are its before photo.
+        """
+        matches = []
+        if file_unique_id:
+            matches.append(PhotoEvidenceModel.file_unique_id == file_unique_id)
+        if phash is not None:
+            distance = func.bit_count(cast(PhotoEvidenceModel.phash.op("#")(phash), BIT(64)))
+            matches.append(distance <= max_distance)
+        if not matches:
+            return None
+        stmt = (
+            select(PhotoEvidenceModel.move_id)
+            .where(
+                or_(PhotoEvidenceModel.move_id != move_id, PhotoEvidenceModel.kind == "before"),
+                or_(*matches),
+            )
+            .order_by(PhotoEvidenceModel.move_id.desc())
+            .limit(1)
+        )
+        async with async_session() as session:
+            return await session.scalar(stmt)
+
+    async def save(self, evidence: PhotoEvidenceEntity) -> None:
+        values = {
+            "file_id": evidence.file_id,
+            "file_unique_id": evidence.file_unique_id,
+            "phash": evidence.phash,
+            "thumbnail_path": evidence.thumbnail_path,
+            "duplicate_of_move_id": evidence.duplicate_of_move_id,
+            "error": evidence.error,
+            "processed_at": datetime.now(),
+        }
+        stmt = (
+            pg_insert(PhotoEvidenceModel)
+            .values(move_id=evidence.move_id, kind=evidence.kind, **values)
+            .on_conflict_do_update(
+                index_elements=[PhotoEvidenceModel.move_id, PhotoEvidenceModel.kind], set_=values
+            )
+        )
+        async with async_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+class SqlAlchemyMediaRepository(MediaRepository):
+    async def list_all(self):
+        async with async_session() as session:
+            result = await session.execute(select(MediaFileModel))
+            return [
+                MediaFileEntity(
+                    file_id=item.file_id,
+                    is_valid=item.is_valid,
+                    checked_at=format_datetime(item.checked_at),
+                    error=item.error,
+                )
+                for item in result.scalars().all()
+            ]
+
+    async def mark(self, file_id: str, is_valid: bool, error: str | None = None) -> None:
+        values = {"is_valid": is_valid, "checked_at": datetime.now(), "error": error}
+        stmt = (
+            pg_insert(MediaFileModel)
+            .values(file_id=file_id, **values)
+            .on_conflict_do_update(index_elements=[MediaFileModel.file_id], set_=values)
+        )
+        async with async_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def list_unchecked_worker_file_ids(self, recheck_days: int) -> list[str]:
+        stale_before = datetime.now() - timedelta(days=recheck_days)
+        stmt = (
+            select(WorkerModel.file_id)
+            .outerjoin(MediaFileModel, MediaFileModel.file_id == WorkerModel.file_id)
+            .where(
+                WorkerModel.file_id.is_not(None),
+                WorkerModel.file_id != "",
+                SqlAlchemyWorkerRepository._active_clause(),
+                or_(MediaFileModel.file_id.is_(None), MediaFileModel.checked_at < stale_before),
+            )
+            .distinct()
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            return [row[0] for row in result.all()]
@@ -1,21 +1,46 @@
+import threading
 from pathlib import Path
-from typing import Iterable
-
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from typing import TYPE_CHECKING, Iterable
 
 from app.config import SheetsSettings
 
+if TYPE_CHECKING:
+    import gspread
+
 
 class SheetsGateway:
-    """Thin wrapper over gspread to isolate IO with Google Sheets."""
+    """Thin wrapper over gspread to isolate IO with Google Sheets.
+
+    The gspread client is authorized and the spreadsheet opened on first use,
+    so building the gateway costs nothing at startup.
+    """
 
     def __init__(self, settings: SheetsSettings):
         self.settings = settings
-        self.client = self._build_client(settings.credentials_path)
-        self.spreadsheet = self.client.open(settings.main_table) if settings.main_table else None
+        self._client: "gspread.Client | None" = None
+        self._spreadsheet = None
+        self._lock = threading.RLock()
+
+    @property
+    def client(self) -> "gspread.Client":
+        with self._lock:
+            if self._client is None:
+                self._client = self._build_client(self.settings.credentials_path)
+            return self._client
+
+    @property
+    def spreadsheet(self):
+        if not self.settings.main_table:
+            return None
+        with self._lock:
+            if self._spreadsheet is None:
+                self._spreadsheet = self.client.open(self.settings.main_table)
+            return self._spreadsheet
+
+    def _build_client(self, credentials_path: Path) -> "gspread.Client":
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
 
-    def _build_client(self, credentials_path: Path) -> gspread.Client:
         scope = [
             "https://spreadsheets.google.com/feeds",
             "https://www.googleapis.com/auth/drive",
@@ -42,6 +67,10 @@ class SheetsGateway:
         worksheet = self._require_main_sheet(self.settings.shifts_source_sheet)
         return worksheet.get_all_values()[1:]
 
+    def read_instruments(self) -> list[list[str]]:
+        worksheet = self._require_main_sheet(self.settings.instruments_sheet)
+        return worksheet.get_all_values()[1:]
+
     # --- Writers ---
     def upsert_worker_registration(
         self,
@@ -95,9 +124,16 @@ class SheetsGateway:
         if rows:
             worksheet.append_rows(list(rows), value_input_option="RAW")
 
+    def export_inventory(self, headers: list[str], rows: list[list[str]]) -> None:
+        worksheet = self._require_main_sheet(self.settings.inventory_sheet)
+        worksheet.clear()
+        # One values write for the whole table instead of a row per request.
+        worksheet.update([headers, *rows], "A1", value_input_option="RAW")
+
     # --- Helpers ---
     def _require_main_sheet(self, name: str):
-        if not self.spreadsheet:
+        spreadsheet = self.spreadsheet
+        if not spreadsheet:
             raise RuntimeError("Main spreadsheet is not configured (TABLE env missing)")
-        return self.spreadsheet.worksheet(name)
+        return spreadsheet.worksheet(name)
 
@@ -1,12 +1,58 @@
-﻿from datetime import datetime
-from typing import Sequence
+﻿import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Sequence
 
 from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.application.use_cases.registration import RegistrationService
-from app.domain.entities import Worker, Cabinet, Instrument
+from app.catalog import CABINETS, INSTRUMENTS, WORKERS, CatalogVersions, catalog_versions
+from app.domain.entities import Worker, WorkerPage, Cabinet, Instrument
+from app.metrics import metrics
+
+
+class MarkupCache:
+    """Prebuilt markups keyed by (key, versions of the catalogs they show).
+
+    Entries also expire after ``ttl`` seconds so that catalog changes made by
+    another replica show up without a restart.
+    """
+
+    def __init__(self, versions: CatalogVersions, ttl: float = 60.0, max_size: int = 512):
+        self.versions = versions
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[tuple[int, ...], float, Any]] = OrderedDict()
+
+    async def get(
+        self,
+        key: tuple,
+        depends_on: tuple[str, ...],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        versions = self.versions.snapshot(depends_on)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] == versions and now - entry[1] < self.ttl:
+            self._entries.move_to_end(key)
+            metrics.incr("markup_cache.hit")
+            return entry[2]
+
+        metrics.incr("markup_cache.miss")
+        value = await build()
+        self._entries[key] = (versions, now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+markup_cache = MarkupCache(catalog_versions)
 
 
 class SelectDoctor(CallbackData, prefix="msd"):
@@ -14,7 +60,8 @@ class SelectDoctor(CallbackData, prefix="msd"):
 
 
 class DoctorsPage(CallbackData, prefix="dpg"):
-    page: int
+    after: int | None = None
+    before: int | None = None
 
 
 class ManualShiftConfirm(CallbackData, prefix="msc"):
@@ -22,8 +69,13 @@ class ManualShiftConfirm(CallbackData, prefix="msc"):
 
 
 async def build_worker_keyboard(registration: RegistrationService) -> InlineKeyboardMarkup:
-    workers = await registration.list_unregistered()
+    async def build() -> InlineKeyboardMarkup:
+        return _build_worker_keyboard(await registration.list_unregistered())
+
+    return await markup_cache.get(("unregistered_workers",), (WORKERS,), build)
 
+
+def _build_worker_keyboard(workers: Sequence[Worker]) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
     if not workers:
@@ -31,6 +83,8 @@ async def build_worker_keyboard(registration: RegistrationService) -> InlineKeyb
             text="Нет доступных сотрудников: все уже зарегистрированы",
             callback_data="noop",
         )
+    else:
+        builder.button(text="🔍 Найти себя по имени", switch_inline_query_current_chat="")
 
     for worker in workers:
         builder.button(
@@ -58,6 +112,8 @@ def build_confirm_keyboard(worker_id: int) -> InlineKeyboardMarkup:
 
 
 async def build_int_keyboard(question_index) -> InlineKeyboardMarkup:
+    # Built per question: the timestamp makes every markup unique, so caching
+    # it would only push the catalog keyboards out of markup_cache.
     builder = InlineKeyboardBuilder()
     timestamp = int(datetime.now().timestamp())
 
@@ -105,6 +161,26 @@ def build_cabinet_keyboard(
     return builder.as_markup()
 
 
+async def cached_cabinet_keyboard(
+    load: Callable[[], Awaitable[Sequence[Cabinet]]],
+    prefix: str = "cabinet",
+    exclude_id: int | None = None,
+) -> InlineKeyboardMarkup:
+    async def build() -> InlineKeyboardMarkup:
+        return build_cabinet_keyboard(await load(), prefix=prefix, exclude_id=exclude_id)
+
+    return await markup_cache.get(("cabinets", prefix, exclude_id), (CABINETS,), build)
+
+
+async def cached_instrument_keyboard(
+    cabinet_id: int, load: Callable[[], Awaitable[Sequence[Instrument]]]
+) -> InlineKeyboardMarkup:
+    async def build() -> InlineKeyboardMarkup:
+        return build_instrument_keyboard(await load())
+
+    return await markup_cache.get(("instruments", cabinet_id), (INSTRUMENTS,), build)
+
+
 def build_instrument_keyboard(instruments: Sequence[Instrument]) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for instrument in instruments:
@@ -119,31 +195,87 @@ def build_instrument_keyboard(instruments: Sequence[Instrument]) -> InlineKeyboa
 PER_PAGE = 10
 
 
-def build_all_doctors_keyboard(
-    workers: Sequence[Worker], page: int = 0
-) -> InlineKeyboardMarkup:
-    total = len(workers)
-    start = page * PER_PAGE
-    end = min(start + PER_PAGE, total)
+def pack_cursor(after: int | None = None, before: int | None = None) -> str:
+    if before is not None:
+        return f"b{before}"
+    if after is not None:
+        return f"a{after}"
+    return ""
+
+
+def unpack_cursor(value: str) -> dict[str, int]:
+    """Turns pack_cursor() output back into list_page() keyword arguments."""
+    if len(value) < 2 or not value[1:].isdigit():
+        return {}
+    return {"before" if value[0] == "b" else "after": int(value[1:])}
+
 
+def build_all_doctors_keyboard(page: WorkerPage) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
 
-    for w in workers[start:end]:
+    for w in page.items:
         builder.button(
             text=w.full_name[:64],
             callback_data=SelectDoctor(doctor_id=w.id).pack(),
         )
 
     nav = InlineKeyboardBuilder()
-    if start > 0:
-        nav.button(text="Назад", callback_data=DoctorsPage(page=page - 1).pack())
-    if end < total:
-        nav.button(text="Вперёд", callback_data=DoctorsPage(page=page + 1).pack())
+    if page.prev_cursor is not None:
+        nav.button(text="Назад", callback_data=DoctorsPage(before=page.prev_cursor).pack())
+    if page.next_cursor is not None:
+        nav.button(text="Вперёд", callback_data=DoctorsPage(after=page.next_cursor).pack())
 
     builder.adjust(1)
     if nav.buttons:
         builder.row(*nav.buttons)
+    builder.row(
+        InlineKeyboardButton(text="🔍 Поиск врача", switch_inline_query_current_chat="")
+    )
+
+    return builder.as_markup()
+
+
+async def cached_all_doctors_keyboard(
+    load: Callable[..., Awaitable[WorkerPage]],
+    after: int | None = None,
+    before: int | None = None,
+) -> InlineKeyboardMarkup:
+    async def build() -> InlineKeyboardMarkup:
+        return build_all_doctors_keyboard(await load(after=after, before=before, limit=PER_PAGE))
+
+    return await markup_cache.get(("all_doctors", after, before), (WORKERS,), build)
 
+
+WEEKDAYS = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+
+
+def build_plan_days_keyboard(days: list[tuple[str, int, int]]) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for date_str, morning, evening in days:
+        weekday = WEEKDAYS[datetime.strptime(date_str, "%d.%m.%Y").weekday()]
+        builder.button(
+            text=f"{weekday} {date_str[:5]} — 🌅 {morning} · 🌙 {evening}",
+            callback_data=f"plan_day:{date_str}",
+        )
+    builder.adjust(1)
+    return builder.as_markup()
+
+
+def build_plan_day_keyboard(date_str: str, morning: int, evening: int) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    builder.button(text=f"🌅 Утренняя ({morning})", callback_data=f"plan_type:{date_str}:morning")
+    builder.button(text=f"🌙 Вечерняя ({evening})", callback_data=f"plan_type:{date_str}:evening")
+    builder.button(text="К списку дней", callback_data="plan_days")
+    builder.adjust(1)
+    return builder.as_markup()
+
+
+def build_plan_shifts_keyboard(date_str: str, shifts: list[tuple[int, str]]) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for shift_id, name in shifts:
+        builder.button(text=name, callback_data=f"plan_shift:{date_str}:{shift_id}")
+    builder.button(text="Назад", callback_data=f"plan_day:{date_str}")
+    builder.adjust(1)
     return builder.as_markup()
 
 
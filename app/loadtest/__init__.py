@@ -0,0 +1 @@
+# Local stand-ins for Telegram and Google Sheets used by load tests.
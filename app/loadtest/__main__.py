@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from app.bot import build_dispatcher
+from app.config import load_settings
+from app.container import build_container
+from app.infrastructure.db.engine import get_engine
+from app.infrastructure.db.migrations import run_migrations
+from app.loadtest.fake_bot import FakeTelegramSession, build_fake_bot
+from app.loadtest.fake_sheets import FakeSheetsBackend, FakeSheetsGateway
+from app.loadtest.replay import MorningProfile, MorningReplay
+from app.logger import setup_logger
+from app.metrics import metrics
+
+
+CHAT_ID_BASE = 900_000_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay a shift-rush morning against the real dispatcher "
+        "with fake Telegram and Google Sheets backends. Use a dedicated database: "
+        "workers and shifts are reseeded on every run."
+    )
+    parser.add_argument("--assistants", type=int, default=300)
+    parser.add_argument("--doctors", type=int, default=120)
+    parser.add_argument("--speedup", type=float, default=30.0)
+    parser.add_argument("--at", default="07:40", help="Wall-clock time the bot believes it is (HH:MM)")
+    parser.add_argument("--tg-latency", type=float, default=0.05)
+    parser.add_argument("--tg-global-rate", type=int, default=30)
+    parser.add_argument("--sheets-latency", type=float, default=0.3)
+    parser.add_argument("--sheets-quota", type=int, default=60)
+    parser.add_argument("--sheets-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    load_dotenv()
+    logger = setup_logger("loadtest", "loadtest.log")
+
+    hour, minute = (int(part) for part in args.at.split(":"))
+    fixed_now = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    settings = load_settings()
+    sheets = FakeSheetsGateway(
+        settings.sheets,
+        FakeSheetsBackend(
+            latency=args.sheets_latency,
+            quota_per_minute=args.sheets_quota,
+            error_rate=args.sheets_error_rate,
+        ),
+    )
+    sheets.seed_morning(args.assistants, args.doctors, fixed_now, CHAT_ID_BASE)
+
+    container = build_container(sheets_gateway=sheets)
+    container.shift_service.clock = lambda: fixed_now
+
+    await run_migrations(get_engine())
+    await container.admin_sync.sync_workers()
+    await container.shift_repo.clear_all()
+    await container.admin_sync.sync_shifts()
+
+    session = FakeTelegramSession(latency=args.tg_latency, global_rate=args.tg_global_rate)
+    bot = build_fake_bot(session)
+    dp = build_dispatcher(container)
+
+    profile = MorningProfile(assistants=args.assistants, speedup=args.speedup)
+    chat_ids = [CHAT_ID_BASE + idx for idx in range(args.assistants)]
+    replay = MorningReplay(dp, bot, session, chat_ids, profile=profile, seed=args.seed)
+    report = await replay.run()
+
+    text = report.format(session)
+    text += f"\nSheets calls: {dict(sheets.backend.calls)}, quota errors: {sheets.backend.quota_errors}"
+    text += f"\nMetrics: {metrics.format()}"
+    logger.info("Load test finished:\n%s", text)
+    print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
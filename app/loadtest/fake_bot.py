@@ -0,0 +1,201 @@
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncGenerator
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.methods import (
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    GetFile,
+    GetMe,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod,
+)
+from aiogram.types import File, InlineKeyboardMarkup, Message, User
+
+
+FAKE_BOT_TOKEN = "123456789:AAFakeLoadTestTokenAAAAAAAAAAAAAAAAA"
+FAKE_BOT_ID = 123456789
+
+MESSAGE_METHODS = (
+    SendMessage,
+    SendPhoto,
+    EditMessageText,
+    EditMessageReplyMarkup,
+    EditMessageCaption,
+)
+
+
+@dataclass
+class RecordedRequest:
+    method: str
+    chat_id: int | str | None
+    at: float
+    text: str | None = None
+    reply_markup: InlineKeyboardMarkup | None = None
+    retried_after: int | None = None
+
+
+@dataclass
+class FakeBotStats:
+    requests: Counter = field(default_factory=Counter)
+    retry_after: Counter = field(default_factory=Counter)
+
+
+class FakeTelegramSession(BaseSession):
+    """In-process Bot API session: answers every method locally and records it.
+
+    Flood control is modelled with a global sliding window (``global_rate``
+    requests per second) and a per-chat window (``chat_rate``); exceeding either
+    raises ``TelegramRetryAfter`` just like the real API does. Photos and
+    getFile calls for ``invalid_file_ids`` fail with ``TelegramBadRequest``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        global_rate: int = 30,
+        chat_rate: int = 3,
+        keep_history: int = 10_000,
+        invalid_file_ids: set[str] | None = None,
+    ):
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.invalid_file_ids = invalid_file_ids or set()
+        self.history: deque[RecordedRequest] = deque(maxlen=keep_history)
+        self.last_markup: dict[int, InlineKeyboardMarkup] = {}
+        self.stats = FakeBotStats()
+        self._message_id = 0
+        self._global_window: deque[float] = deque()
+        self._chat_windows: dict[Any, deque[float]] = {}
+
+    async def close(self) -> None:
+        return None
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[Any],
+        timeout: int | None = None,
+    ) -> Any:
+        name = type(method).__name__
+        chat_id = getattr(method, "chat_id", None)
+        now = time.monotonic()
+
+        retry_after = self._check_flood(chat_id, now)
+        if retry_after:
+            self.stats.retry_after[name] += 1
+            self.history.append(
+                RecordedRequest(method=name, chat_id=chat_id, at=now, retried_after=retry_after)
+            )
+            raise TelegramRetryAfter(
+                method=method,
+                message=f"Too Many Requests: retry after {retry_after}",
+                retry_after=retry_after,
+            )
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        file_id = getattr(method, "photo", None) or getattr(method, "file_id", None)
+        if isinstance(file_id, str) and file_id in self.invalid_file_ids:
+            self.stats.requests[f"{name}:bad_file"] += 1
+            raise TelegramBadRequest(
+                method=method, message="Bad Request: wrong file identifier/HTTP URL specified"
+            )
+
+        self.stats.requests[name] += 1
+        reply_markup = getattr(method, "reply_markup", None)
+        if not isinstance(reply_markup, InlineKeyboardMarkup):
+            reply_markup = None
+        self.history.append(
+            RecordedRequest(
+                method=name,
+                chat_id=chat_id,
+                at=now,
+                text=getattr(method, "text", None) or getattr(method, "caption", None),
+                reply_markup=reply_markup,
+            )
+        )
+        if chat_id is not None and isinstance(method, MESSAGE_METHODS):
+            if reply_markup is not None:
+                self.last_markup[int(chat_id)] = reply_markup
+            else:
+                self.last_markup.pop(int(chat_id), None)
+        return self._build_result(bot, method)
+
+    def _check_flood(self, chat_id: Any, now: float) -> int:
+        window = self._global_window
+        while window and now - window[0] >= 1:
+            window.popleft()
+        if self.global_rate and len(window) >= self.global_rate:
+            return 1
+        if chat_id is not None and self.chat_rate:
+            chat_window = self._chat_windows.setdefault(chat_id, deque())
+            while chat_window and now - chat_window[0] >= 1:
+                chat_window.popleft()
+            if len(chat_window) >= self.chat_rate:
+                return 1
+            chat_window.append(now)
+        window.append(now)
+        return 0
+
+    def _build_result(self, bot: Bot, method: TelegramMethod[Any]) -> Any:
+        if isinstance(method, MESSAGE_METHODS):
+            self._message_id += 1
+            chat_id = getattr(method, "chat_id", None) or 0
+            message_id = getattr(method, "message_id", None) or self._message_id
+            return Message.model_validate(
+                {
+                    "message_id": message_id,
+                    "date": datetime.now(),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": getattr(method, "text", None),
+                    "caption": getattr(method, "caption", None),
+                    "reply_markup": getattr(method, "reply_markup", None),
+                },
+                context={"bot": bot},
+            )
+        if isinstance(method, GetMe):
+            return User(id=FAKE_BOT_ID, is_bot=True, first_name="LoadTestBot", username="load_test_bot")
+        if isinstance(method, GetFile):
+            return File(file_id=method.file_id, file_unique_id=method.file_id[:16])
+        return True
+
+    def callback_data_for(self, chat_id: int) -> list[str]:
+        markup = self.last_markup.get(chat_id)
+        if not markup:
+            return []
+        return [
+            button.callback_data
+            for row in markup.inline_keyboard
+            for button in row
+            if button.callback_data
+        ]
+
+
+def build_fake_bot(session: FakeTelegramSession | None = None) -> Bot:
+    return Bot(token=FAKE_BOT_TOKEN, session=session or FakeTelegramSession())
@@ -0,0 +1,172 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+
+from app.config import SheetsSettings
+
+
+def build_quota_error():
+    import gspread
+    from requests import Response
+
+    response = Response()
+    response.status_code = 429
+    response._content = json.dumps(
+        {
+            "error": {
+                "code": 429,
+                "message": "Quota exceeded for quota metric 'Read requests'",
+                "status": "RESOURCE_EXHAUSTED",
+            }
+        }
+    ).encode("utf-8")
+    return gspread.exceptions.APIError(response)
+
+
+class FakeSheetsBackend:
+    """In-memory spreadsheet with Google-like latency and per-minute quota.
+
+    Every call blocks the caller for ``latency`` seconds, exactly like gspread
+    does, and raises a 429 ``APIError`` once more than ``quota_per_minute``
+    calls happened in the last minute or with probability ``error_rate``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.3,
+        jitter: float = 0.2,
+        quota_per_minute: int = 60,
+        error_rate: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.sheets: dict[str, list[list[str]]] = {}
+        self.calls: Counter = Counter()
+        self.quota_errors = 0
+        self._call_times: list[float] = []
+        self._lock = threading.Lock()
+
+    def call(self, name: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._call_times = [t for t in self._call_times if now - t < 60]
+            self.calls[name] += 1
+            over_quota = (
+                self.quota_per_minute and len(self._call_times) >= self.quota_per_minute
+            )
+            self._call_times.append(now)
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        if over_quota or (self.error_rate and random.random() < self.error_rate):
+            self.quota_errors += 1
+            raise build_quota_error()
+
+    def rows(self, sheet: str) -> list[list[str]]:
+        return self.sheets.setdefault(sheet, [])
+
+
+class FakeSheetsGateway:
+    """Drop-in replacement for ``SheetsGateway`` backed by ``FakeSheetsBackend``."""
+
+    def __init__(self, settings: SheetsSettings, backend: FakeSheetsBackend | None = None):
+        self.settings = settings
+        self.backend = backend or FakeSheetsBackend()
+
+    # --- Readers ---
+    def read_workers(self) -> list[list[str]]:
+        return self._read(self.settings.workers_sheet)
+
+    def read_pairs(self) -> list[list[str]]:
+        return self._read(self.settings.pairs_sheet)
+
+    def read_surveys(self) -> list[list[str]]:
+        return self._read(self.settings.surveys_sheet)
+
+    def read_shifts(self) -> list[list[str]]:
+        return self._read(self.settings.shifts_source_sheet)
+
+    def read_instruments(self) -> list[list[str]]:
+        return self._read(self.settings.instruments_sheet)
+
+    # --- Writers ---
+    def upsert_worker_registration(
+        self,
+        full_name: str,
+        chat_id: str | None = None,
+        file_id: str | None = None,
+    ) -> None:
+        self.backend.call("upsert_worker_registration")
+        rows = self.backend.rows(self.settings.workers_sheet)
+        normalized = full_name.strip()
+        for row in rows[1:]:
+            if row and row[0].strip() == normalized:
+                while len(row) < 3:
+                    row.append("")
+                if file_id is not None:
+                    row[1] = file_id
+                if chat_id is not None:
+                    row[2] = chat_id
+                return
+        rows.append([normalized, file_id or "", chat_id or "", "", ""])
+
+    def export_answers(self, headers: list[str], rows: Iterable[list[str]]) -> None:
+        self.backend.call("export_answers")
+        self.backend.sheets[self.settings.answers_sheet] = [headers, *rows]
+
+    def export_shifts(self, headers: list[str], rows: Iterable[list[str]]) -> None:
+        self.backend.call("export_shifts")
+        sheet = self.backend.rows(self.settings.shift_report_sheet)
+        if not sheet:
+            sheet.append(headers)
+        sheet.extend(rows)
+
+    def export_inventory(self, headers: list[str], rows: list[list[str]]) -> None:
+        self.backend.call("export_inventory")
+        self.backend.sheets[self.settings.inventory_sheet] = [headers, *rows]
+
+    # --- Helpers ---
+    def _read(self, name: str) -> list[list[str]]:
+        self.backend.call(f"read:{name}")
+        return [list(row) for row in self.backend.rows(name)[1:]]
+
+    def seed_morning(
+        self,
+        assistants: int,
+        doctors: int,
+        date: datetime,
+        chat_id_base: int,
+    ) -> None:
+        """Fill the workers and schedule sheets with a synthetic clinic day."""
+        workers = self.backend.rows(self.settings.workers_sheet)
+        workers.clear()
+        workers.append(["ФИО", "file_id", "chat_id", "Специальность", "Телефон"])
+        for idx in range(doctors):
+            workers.append([f"Врач {idx + 1:03d}", "", "", "Врач", ""])
+        for idx in range(assistants):
+            workers.append(
+                [f"Ассистент {idx + 1:03d}", "", str(chat_id_base + idx), "Ассистент", ""]
+            )
+
+        schedule = self.backend.rows(self.settings.shifts_source_sheet)
+        schedule.clear()
+        schedule.append(["", "Смена", "Дата", "Врач", "Ассистент", "Специальность", "Кабинет"])
+        date_str = date.strftime("%d.%m.%Y")
+        for shift_code in ("1", "2"):
+            for idx in range(doctors):
+                planned = f"Ассистент {idx + 1:03d}" if idx < assistants else ""
+                schedule.append(
+                    [
+                        "",
+                        shift_code,
+                        date_str,
+                        f"Врач {idx + 1:03d}",
+                        planned,
+                        "Врач",
+                        str(100 + idx),
+                    ]
+                )
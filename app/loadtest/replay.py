@@ -0,0 +1,197 @@
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from app.loadtest.fake_bot import FakeTelegramSession
+
+
+@dataclass
+class MorningProfile:
+    """Shape of the 07:30-08:00 rush replayed against the dispatcher.
+
+    ``bursts`` are (minute offset from the start, share of assistants) pairs;
+    every assistant arrives around one of them, opens /shift, thinks for
+    ``think_time`` seconds and taps one of the offered doctors.
+    """
+
+    assistants: int = 300
+    duration_minutes: float = 30
+    bursts: tuple[tuple[float, float], ...] = ((0, 0.45), (10, 0.2), (15, 0.25), (25, 0.1))
+    burst_spread_minutes: float = 1.5
+    think_time: tuple[float, float] = (1.0, 6.0)
+    double_tap_rate: float = 0.1
+    show_all_rate: float = 0.05
+    speedup: float = 30.0
+
+
+@dataclass
+class ReplayReport:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Counter = field(default_factory=Counter)
+    updates: int = 0
+    elapsed: float = 0.0
+
+    @staticmethod
+    def _percentile(values: list[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def format(self, session: FakeTelegramSession | None = None) -> str:
+        lines = [
+            f"Updates: {self.updates} in {self.elapsed:.1f}s "
+            f"({self.updates / self.elapsed if self.elapsed else 0:.1f} upd/s)"
+        ]
+        for kind, values in sorted(self.latencies.items()):
+            lines.append(
+                f"{kind:<14} n={len(values):<5} "
+                f"p50={self._percentile(values, 50) * 1000:7.1f}ms "
+                f"p95={self._percentile(values, 95) * 1000:7.1f}ms "
+                f"p99={self._percentile(values, 99) * 1000:7.1f}ms "
+                f"max={max(values) * 1000:7.1f}ms"
+            )
+        if self.errors:
+            lines.append("Errors: " + ", ".join(f"{k}={v}" for k, v in self.errors.most_common()))
+        if session is not None:
+            lines.append(
+                "Bot API calls: "
+                + ", ".join(f"{k}={v}" for k, v in session.stats.requests.most_common())
+            )
+            if session.stats.retry_after:
+                lines.append(
+                    "RetryAfter: "
+                    + ", ".join(f"{k}={v}" for k, v in session.stats.retry_after.most_common())
+                )
+        return "\n".join(lines)
+
+
+class UpdateFactory:
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+
+    @staticmethod
+    def _user(chat_id: int) -> dict:
+        return {"id": chat_id, "is_bot": False, "first_name": f"Load {chat_id}"}
+
+    def command(self, chat_id: int, text: str) -> Update:
+        return Update.model_validate(
+            {
+                "update_id": next(self._update_ids),
+                "message": {
+                    "message_id": next(self._message_ids),
+                    "date": datetime.now(),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": self._user(chat_id),
+                    "text": text,
+                    "entities": [
+                        {"type": "bot_command", "offset": 0, "length": len(text.split()[0])}
+                    ],
+                },
+            },
+            context={"bot": self.bot},
+        )
+
+    def callback(self, chat_id: int, data: str) -> Update:
+        return Update.model_validate(
+            {
+                "update_id": next(self._update_ids),
+                "callback_query": {
+                    "id": str(next(self._callback_ids)),
+                    "from": self._user(chat_id),
+                    "chat_instance": str(chat_id),
+                    "data": data,
+                    "message": {
+                        "message_id": next(self._message_ids),
+                        "date": datetime.now(),
+                        "chat": {"id": chat_id, "type": "private"},
+                        "text": "Выберите доктора:",
+                    },
+                },
+            },
+            context={"bot": self.bot},
+        )
+
+
+class MorningReplay:
+    """Replays a realistic morning of /shift and select_shift: taps."""
+
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        session: FakeTelegramSession,
+        chat_ids: list[int],
+        profile: MorningProfile | None = None,
+        seed: int | None = None,
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.session = session
+        self.chat_ids = chat_ids
+        self.profile = profile or MorningProfile(assistants=len(chat_ids))
+        self.factory = UpdateFactory(bot)
+        self.random = random.Random(seed)
+        self.report = ReplayReport()
+
+    def _arrival_offsets(self) -> list[float]:
+        profile = self.profile
+        centers = [minute for minute, _ in profile.bursts]
+        weights = [share for _, share in profile.bursts]
+        offsets = []
+        for _ in self.chat_ids:
+            center = self.random.choices(centers, weights=weights)[0]
+            minute = self.random.gauss(center, profile.burst_spread_minutes)
+            minute = min(max(minute, 0), profile.duration_minutes)
+            offsets.append(minute * 60 / profile.speedup)
+        return offsets
+
+    async def _feed(self, kind: str, update: Update) -> None:
+        started = time.perf_counter()
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception as exc:
+            self.report.errors[f"{kind}:{type(exc).__name__}"] += 1
+        finally:
+            self.report.latencies[kind].append(time.perf_counter() - started)
+            self.report.updates += 1
+
+    async def _assistant(self, chat_id: int, delay: float) -> None:
+        profile = self.profile
+        await asyncio.sleep(delay)
+        await self._feed("/shift", self.factory.command(chat_id, "/shift"))
+        if self.random.random() < profile.double_tap_rate:
+            await self._feed("/shift", self.factory.command(chat_id, "/shift"))
+
+        await asyncio.sleep(self.random.uniform(*profile.think_time) / profile.speedup)
+        options = self.session.callback_data_for(chat_id)
+        if self.random.random() < profile.show_all_rate and "shift_show_all" in options:
+            await self._feed("shift_show_all", self.factory.callback(chat_id, "shift_show_all"))
+            return
+
+        shifts = [data for data in options if data.startswith("select_shift:")]
+        if not shifts:
+            return
+        # Preferred slots come first; most assistants take the top one.
+        choice = shifts[0] if self.random.random() < 0.7 else self.random.choice(shifts)
+        await self._feed("select_shift:", self.factory.callback(chat_id, choice))
+
+    async def run(self) -> ReplayReport:
+        started = time.perf_counter()
+        offsets = self._arrival_offsets()
+        await asyncio.gather(
+            *(self._assistant(chat_id, delay) for chat_id, delay in zip(self.chat_ids, offsets))
+        )
+        self.report.elapsed = time.perf_counter() - started
+        return self.report
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+from app.logger import setup_logger
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+
+class Metrics:
+    """Process-local counters, timings and gauges, exported to metrics.log."""
+
+    def __init__(self):
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, Timing] = defaultdict(Timing)
+        self._gauges: dict[str, Callable[[], float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        self._timings[name].add(value)
+
+    def register_gauge(self, name: str, read: Callable[[], float]) -> None:
+        self._gauges[name] = read
+
+    def snapshot(self) -> dict[str, float]:
+        result: dict[str, float] = dict(self._counters)
+        for name, timing in self._timings.items():
+            result[f"{name}.count"] = timing.count
+            result[f"{name}.avg"] = timing.total / timing.count if timing.count else 0.0
+            result[f"{name}.max"] = timing.max
+        for name, read in self._gauges.items():
+            try:
+                result[name] = read()
+            except Exception:
+                continue
+        return result
+
+    def format(self) -> str:
+        snapshot = self.snapshot()
+        return ", ".join(
+            f"{name}={value:.4f}" if isinstance(value, float) else f"{name}={value}"
+            for name, value in sorted(snapshot.items())
+        )
+
+
+metrics = Metrics()
+
+
+def log_metrics() -> None:
+    logger = setup_logger("metrics", "metrics.log")
+    logger.info("%s", metrics.format())
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update
+
+from app.metrics import metrics
+from app.middlewares.throttling import update_prefix
+
+
+OVERLOADED_TEXT = "Бот сейчас перегружен, попробуйте ещё раз через минуту 🙏"
+
+CLAIMS, SURVEYS, ADMIN = 0, 1, 2
+PRIORITY_NAMES = {CLAIMS: "claims", SURVEYS: "surveys", ADMIN: "admin"}
+
+CLAIM_PREFIXES = frozenset(
+    {
+        "/shift",
+        "/plan",
+        "select_shift",
+        "shift_show_all",
+        "cancel_shift",
+        "dpg",
+        "msd",
+        "msc",
+        "manual_shift_cancel",
+        "plan_days",
+        "plan_day",
+        "plan_type",
+        "plan_shift",
+    }
+)
+ADMIN_PREFIXES = frozenset(
+    {
+        "/admin",
+        "/moves",
+        "/report",
+        "/export",
+        "/exp_shifts",
+        "/inventory",
+        "/exp_inventory",
+        "/upd",
+        "/upd_workers",
+        "/upd_pairs",
+        "/upd_surveys",
+        "/upd_shifts",
+        "moves_refresh",
+        "moves_photo",
+        "admin_back",
+    }
+)
+ADMIN_PREFIX_STARTS = ("admin_", "cabinet_", "instrument_")
+
+
+def classify(update: Update) -> int:
+    """Claims first, then everything users do in flows (surveys, transfers), then admin and history."""
+    prefix = update_prefix(update)
+    if prefix in CLAIM_PREFIXES:
+        return CLAIMS
+    if prefix and (prefix in ADMIN_PREFIXES or prefix.startswith(ADMIN_PREFIX_STARTS)):
+        return ADMIN
+    return SURVEYS
+
+
+class PriorityGate:
+    """At most ``concurrency`` holders; waiters are let in by priority, then arrival."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.active = 0
+        self._waiting: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    async def acquire(self, priority: int) -> None:
+        if self.active < self.concurrency and not self._waiting:
+            self.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as we were cancelled: pass the slot on.
+                self.release()
+            else:
+                self._waiting = [item for item in self._waiting if item[2] is not future]
+                heapq.heapify(self._waiting)
+            raise
+
+    def release(self) -> None:
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware(BaseMiddleware):
+    """Bounded, prioritised handling of updates with load shedding.
+
+    At most ``concurrency`` updates run handlers at once; the rest wait and
+    are admitted claims first. Once ``shed_at[priority]`` updates are already
+    waiting, new updates of that class are refused with a polite notice, so
+    admin and history traffic is shed long before shift claims are.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        shed_at: dict[int, int] | None = None,
+    ):
+        self.gate = PriorityGate(concurrency)
+        self.shed_at = shed_at or {CLAIMS: 300, SURVEYS: 150, ADMIN: 50}
+        metrics.register_gauge("admission.active", lambda: self.gate.active)
+        metrics.register_gauge("admission.waiting", lambda: self.gate.waiting)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        priority = classify(event)
+        name = PRIORITY_NAMES[priority]
+        if self.gate.waiting >= self.shed_at[priority]:
+            metrics.incr(f"admission.shed.{name}")
+            await self._refuse(event)
+            return None
+
+        queued_at = time.perf_counter()
+        await self.gate.acquire(priority)
+        metrics.observe(f"admission.wait_seconds.{name}", time.perf_counter() - queued_at)
+        try:
+            return await handler(event, data)
+        finally:
+            self.gate.release()
+
+    @staticmethod
+    async def _refuse(update: Update) -> None:
+        try:
+            if update.callback_query is not None:
+                await update.callback_query.answer(OVERLOADED_TEXT, show_alert=True)
+            elif update.message is not None:
+                await update.message.answer(OVERLOADED_TEXT)
+        except TelegramAPIError:
+            pass
@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update
+
+from app.metrics import metrics
+
+
+class TTLKeyStore:
+    """Bounded set of recently seen keys, each forgotten after its own ttl."""
+
+    def __init__(self, max_size: int = 50_000):
+        self.max_size = max_size
+        self._expires: OrderedDict[Hashable, float] = OrderedDict()
+
+    def add(self, key: Hashable, ttl: float) -> bool:
+        """Remembers ``key``; False if it was already remembered and still alive."""
+        now = time.monotonic()
+        expires = self._expires.get(key)
+        if expires is not None and expires > now:
+            return False
+        self._expires[key] = now + ttl
+        self._expires.move_to_end(key)
+        while len(self._expires) > self.max_size:
+            self._expires.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._expires.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+class IdempotencyMiddleware(BaseMiddleware):
+    """Drops updates that were already handled before they reach the handlers.
+
+    Redeliveries repeat the update_id (and a callback's id); a double tap is
+    a new callback with the same data on the same message, so that is keyed
+    too, for a shorter ``tap_window``. Keys of an update whose handler raised
+    are released so a genuine retry still goes through.
+    """
+
+    def __init__(
+        self,
+        store: TTLKeyStore | None = None,
+        ttl: float = 10 * 60,
+        tap_window: float = 2.0,
+    ):
+        self.store = store or TTLKeyStore()
+        self.ttl = ttl
+        self.tap_window = tap_window
+        metrics.register_gauge("idempotency.keys", lambda: len(self.store))
+
+    def _keys(self, update: Update) -> list[tuple[Hashable, float]]:
+        keys: list[tuple[Hashable, float]] = [(("update", update.update_id), self.ttl)]
+        callback = update.callback_query
+        if callback is not None:
+            keys.append((("callback", callback.id), self.ttl))
+            if callback.message is not None and callback.data:
+                tap = ("tap", callback.from_user.id, callback.message.message_id, callback.data)
+                keys.append((tap, self.tap_window))
+        return keys
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        added: list[Hashable] = []
+        for key, ttl in self._keys(event):
+            if not self.store.add(key, ttl):
+                metrics.incr(f"idempotency.dropped.{key[0]}")
+                await self._stop_spinner(event)
+                return None
+            added.append(key)
+
+        try:
+            return await handler(event, data)
+        except Exception:
+            for key in added:
+                self.store.discard(key)
+            raise
+
+    @staticmethod
+    async def _stop_spinner(update: Update) -> None:
+        if update.callback_query is None:
+            return
+        try:
+            await update.callback_query.answer()
+        except TelegramAPIError:
+            # Already answered by the original delivery.
+            pass
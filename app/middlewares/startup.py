@@ -0,0 +1,30 @@
+import time
+from logging import Logger
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.metrics import metrics
+
+
+class FirstUpdateMiddleware(BaseMiddleware):
+    """Logs the time from process start to the first handled update."""
+
+    def __init__(self, started_at: float, logger: Logger):
+        self.started_at = started_at
+        self.logger = logger
+        self._seen = False
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not self._seen:
+            self._seen = True
+            elapsed = time.perf_counter() - self.started_at
+            metrics.observe("startup.first_update_seconds", elapsed)
+            self.logger.info("Time to first update: %.2fs", elapsed)
+        return await handler(event, data)
@@ -0,0 +1,134 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update, User
+
+from app.metrics import metrics
+
+
+THROTTLED_TEXT = "Слишком часто, подождите пару секунд"
+
+# Per-user limits for expensive screens: prefix -> (tokens per second, burst).
+PREFIX_LIMITS: dict[str, tuple[float, int]] = {
+    "/moves": (0.5, 3),
+    "/inventory": (0.2, 2),
+    "/exp_inventory": (0.05, 1),
+    "moves_refresh": (0.5, 2),
+    "moves_photo": (1.0, 5),
+    "admin_shift_refresh": (0.5, 2),
+    "admin_shifts": (0.5, 3),
+    "admin_import": (0.2, 2),
+    "admin_import_apply": (0.05, 1),
+}
+
+# Callbacks that only re-render a screen: taps arriving while one is being
+# rendered for the same user are answered without rendering again.
+COALESCED_CALLBACKS = frozenset({"moves_refresh", "admin_shift_refresh", "plan_days"})
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+def update_prefix(update: Update) -> str | None:
+    if update.callback_query is not None and update.callback_query.data:
+        return update.callback_query.data.split(":", 1)[0]
+    if update.message is not None and update.message.text:
+        return update.message.text.split(maxsplit=1)[0].split("@", 1)[0] or None
+    return None
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Per-user token buckets, tighter ones per update prefix, and coalesced refreshes.
+
+    Every user gets ``user_rate`` updates per second with bursts of
+    ``user_burst``; prefixes listed in ``prefix_limits`` get their own bucket
+    per user on top. Throttled callbacks are answered with a short notice,
+    throttled messages are dropped.
+    """
+
+    def __init__(
+        self,
+        user_rate: float = 2.0,
+        user_burst: int = 10,
+        prefix_limits: dict[str, tuple[float, int]] | None = None,
+        coalesced: frozenset[str] = COALESCED_CALLBACKS,
+        max_buckets: int = 20_000,
+    ):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.prefix_limits = PREFIX_LIMITS if prefix_limits is None else prefix_limits
+        self.coalesced = coalesced
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+        self._rendering: set[tuple[int, str]] = set()
+
+    def _take(self, key: Hashable, rate: float, capacity: int) -> bool:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, capacity)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        if not isinstance(event, Update) or user is None:
+            return await handler(event, data)
+
+        prefix = update_prefix(event)
+        if not self._take(("user", user.id), self.user_rate, self.user_burst):
+            metrics.incr("throttle.user")
+            await self._reject(event, THROTTLED_TEXT)
+            return None
+        limit = self.prefix_limits.get(prefix) if prefix else None
+        if limit and not self._take(("prefix", user.id, prefix), *limit):
+            metrics.incr(f"throttle.prefix.{prefix}")
+            await self._reject(event, THROTTLED_TEXT)
+            return None
+
+        if event.callback_query is None or event.callback_query.data not in self.coalesced:
+            return await handler(event, data)
+
+        key = (user.id, event.callback_query.data)
+        if key in self._rendering:
+            metrics.incr("throttle.coalesced")
+            await self._reject(event, None)
+            return None
+        self._rendering.add(key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._rendering.discard(key)
+
+    @staticmethod
+    async def _reject(update: Update, text: str | None) -> None:
+        if update.callback_query is None:
+            return
+        try:
+            await update.callback_query.answer(text)
+        except TelegramAPIError:
+            pass